@@ -5,28 +5,26 @@ This file demonstrates how to use the new LIP risk-based quoting functionality
 in your market making strategy.
 """
 
-import os
 import logging
-from mm import LIPBot, KalshiTradingAPI
+from mm import LIPBot, KalshiTradingAPI, LIPConfig, OrderbookLevels
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("LIP_Example")
 
 
-def setup_lip_environment():
-    """Configure environment variables for LIP risk-based quoting"""
-    # Enable LIP risk-based quoting
-    os.environ["LIP_RISK_ENABLED"] = "1"
-    
-    # LIP parameters
-    os.environ["LIP_DISCOUNT_FACTOR"] = "0.95"  # Multiplier decay per tick
-    os.environ["LIP_RISK_THRESHOLD"] = "3.0"    # Max risk score before skipping
-    os.environ["LIP_RISK_ALPHA"] = "1.0"        # Quote distance scaling
-    
-    # Risk computation parameters
-    os.environ["LIP_TIME_RISK_K"] = "0.15"      # Time decay constant
-    os.environ["LIP_VOL_GAMMA"] = "2.0"         # Volatility scaling factor
+def setup_lip_environment() -> LIPConfig:
+    """Build the LIP risk-based quoting configuration passed to LIPBot"""
+    return LIPConfig(
+        enabled=True,           # Enable LIP risk-based quoting
+        # LIP parameters
+        discount_factor=0.95,   # Multiplier decay per tick
+        risk_threshold=3.0,     # Max risk score before skipping
+        alpha=1.0,              # Quote distance scaling
+        # Risk computation parameters
+        time_risk_k=0.15,       # Time decay constant
+        vol_gamma=2.0,          # Volatility scaling factor
+    )
 
 
 def example_basic_usage(bot, ticker, orderbook, target_size, inventory):
@@ -48,15 +46,16 @@ def example_basic_usage(bot, ticker, orderbook, target_size, inventory):
     
     # Check if market should be skipped
     if result['skip_reason']:
-        logger.info(f"❌ Skipping {ticker}: {result['skip_reason']}")
+        logger.info("❌ Skipping %s: %s", ticker, result['skip_reason'])
         return None
     
-    # Log results
-    logger.info(f"✅ {ticker} - Risk Score: {result['risk_score']:.2f}")
-    logger.info(f"   Bid: ${result['bid_price']:.2f} x {result['bid_size']}")
-    logger.info(f"   Ask: ${result['ask_price']:.2f} x {result['ask_size']}")
-    logger.info(f"   LIP Intensity (bid): {result['lip_intensity_bid']:.2f}")
-    logger.info(f"   LIP Intensity (ask): {result['lip_intensity_ask']:.2f}")
+    # Log results (skip assembling the block entirely when INFO is filtered)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("✅ %s - Risk Score: %.2f", ticker, result['risk_score'])
+        logger.info("   Bid: $%.2f x %s", result['bid_price'], result['bid_size'])
+        logger.info("   Ask: $%.2f x %s", result['ask_price'], result['ask_size'])
+        logger.info("   LIP Intensity (bid): %.2f", result['lip_intensity_bid'])
+        logger.info("   LIP Intensity (ask): %.2f", result['lip_intensity_ask'])
     
     return result
 
@@ -67,9 +66,9 @@ def example_qualifying_bands(bot, orderbook, target_size):
     """
     logger.info("\n=== Example 2: Qualifying Band Construction ===")
     
-    # Extract and sort orderbook levels
-    yes_bids = [(0.45, 100), (0.44, 150), (0.43, 200)]
-    yes_asks = [(0.55, 80), (0.56, 120), (0.57, 180)]
+    # Orderbook levels, best to worst, stored column-wise
+    yes_bids = OrderbookLevels.from_columns([0.45, 0.44, 0.43], [100, 150, 200])
+    yes_asks = OrderbookLevels.from_columns([0.55, 0.56, 0.57], [80, 120, 180])
     
     # Build qualifying bands
     bid_band = bot.build_qualifying_band(
@@ -88,16 +87,16 @@ def example_qualifying_bands(bot, orderbook, target_size):
     
     # Display bid band
     if bid_band:
-        logger.info(f"Bid qualifying band (target: {target_size}):")
+        logger.info("Bid qualifying band (target: %s):", target_size)
         for level in bid_band:
             logger.info(
-                f"  ${level['price']:.2f} x {level['size']:3d} "
-                f"(ticks={level['ticks_from_best']}, mult={level['multiplier']:.3f})"
+                "  $%.2f x %3d (ticks=%s, mult=%.3f)",
+                level['price'], level['size'], level['ticks_from_best'], level['multiplier']
             )
         
         # Compute intensity
         intensity = bot.compute_lip_intensity(bid_band, target_size)
-        logger.info(f"  → LIP Intensity: {intensity:.2f}")
+        logger.info("  → LIP Intensity: %.2f", intensity)
         
         if intensity < 0.3:
             logger.info("     📈 Sparse - Good opportunity to quote at top")
@@ -119,13 +118,13 @@ def example_risk_scoring(bot, ticker):
     time_risk = bot.compute_time_risk(ticker, k=0.15)
     vol_risk = bot.compute_volatility_risk(ticker, lookback_hours=48, ewma_alpha=0.3)
     
-    logger.info(f"{ticker} risk components:")
-    logger.info(f"  Time Risk: {time_risk:.3f} (higher = closer to expiry)")
-    logger.info(f"  Volatility: {vol_risk:.3f} (EWMA of logit returns)")
+    logger.info("%s risk components:", ticker)
+    logger.info("  Time Risk: %.3f (higher = closer to expiry)", time_risk)
+    logger.info("  Volatility: %.3f (EWMA of logit returns)", vol_risk)
     
     # Compute combined risk score
     risk_score = bot.compute_risk_score(ticker, vol_percentiles=None, gamma=2.0)
-    logger.info(f"  Combined Risk Score: {risk_score:.3f}")
+    logger.info("  Combined Risk Score: %.3f", risk_score)
     
     # Interpret risk score
     if risk_score < 1.0:
@@ -141,8 +140,8 @@ def example_risk_scoring(bot, ticker):
         risk_level = "VERY HIGH 🔴"
         action = "Consider skipping this market"
     
-    logger.info(f"  Risk Level: {risk_level}")
-    logger.info(f"  → {action}")
+    logger.info("  Risk Level: %s", risk_level)
+    logger.info("  → %s", action)
     
     return risk_score
 
@@ -168,19 +167,19 @@ def example_quote_level_selection(bot, bid_band, risk_score, inventory):
     )
     
     if chosen_level:
-        logger.info(f"Chosen quote level:")
-        logger.info(f"  Price: ${chosen_level['price']:.2f}")
-        logger.info(f"  Size: {chosen_level['size']}")
-        logger.info(f"  Ticks from best: {chosen_level['ticks_from_best']}")
-        logger.info(f"  LIP Multiplier: {chosen_level['multiplier']:.3f}")
+        logger.info("Chosen quote level:")
+        logger.info("  Price: $%.2f", chosen_level['price'])
+        logger.info("  Size: %s", chosen_level['size'])
+        logger.info("  Ticks from best: %s", chosen_level['ticks_from_best'])
+        logger.info("  LIP Multiplier: %.3f", chosen_level['multiplier'])
         
         # Explain why this level was chosen
         max_ticks = int(1.0 * risk_score)  # alpha * risk_score
-        logger.info(f"\nReasoning:")
-        logger.info(f"  Risk score: {risk_score:.2f}")
-        logger.info(f"  Max allowed ticks: {max_ticks}")
-        logger.info(f"  Inventory: {inventory} (long positions back off from bids)")
-        logger.info(f"  → Chose closest qualifying level within constraints")
+        logger.info("\nReasoning:")
+        logger.info("  Risk score: %.2f", risk_score)
+        logger.info("  Max allowed ticks: %s", max_ticks)
+        logger.info("  Inventory: %s (long positions back off from bids)", inventory)
+        logger.info("  → Chose closest qualifying level within constraints")
     
     return chosen_level
 
@@ -191,52 +190,60 @@ def example_market_selection(bot, candidate_markets):
     """
     logger.info("\n=== Example 5: Market Selection Strategy ===")
     
-    market_scores = []
-    
+    # Cheap risk check first: only markets under the threshold get a band built
+    tickers = []
+    bid_levels = []
+    target_sizes = []
+    candidate_risks = []
     for ticker, orderbook, target_size in candidate_markets:
         try:
-            # Extract orderbook levels
-            yes_bids = [(0.45, 100), (0.44, 150)]  # Simplified for example
-            
-            # Build qualifying band
-            bid_band = bot.build_qualifying_band(
-                orderbook_levels=yes_bids,
-                target_size=target_size,
-                is_bid_side=True,
-                discount_factor=0.95
-            )
-            
-            if not bid_band:
-                continue
-            
-            # Compute metrics
-            intensity = bot.compute_lip_intensity(bid_band, target_size)
             risk_score = bot.compute_risk_score(ticker)
-            
-            # Score: prefer moderate intensity, lower risk
-            if 0.3 <= intensity <= 3.0:
-                intensity_score = 1.0
-            elif intensity < 0.3:
-                intensity_score = intensity / 0.3
-            else:
-                intensity_score = 3.0 / intensity
-            
-            risk_score_norm = max(0.0, 1.0 - risk_score / 3.0)
-            score = intensity_score * 0.5 + risk_score_norm * 0.5
-            
-            market_scores.append((ticker, score, intensity, risk_score))
-            
         except Exception as e:
-            logger.warning(f"Failed to score {ticker}: {e}")
-    
-    # Sort by score
-    market_scores.sort(key=lambda x: x[1], reverse=True)
+            logger.warning("Failed to score %s: %s", ticker, e)
+            continue
+        if risk_score >= bot.lip_risk_threshold:
+            continue
+        tickers.append(ticker)
+        bid_levels.append(OrderbookLevels.from_columns([0.45, 0.44], [100, 150]))  # Simplified for example
+        target_sizes.append(target_size)
+        candidate_risks.append(risk_score)
+
+    bid_bands = bot.build_qualifying_bands_batch(
+        bid_levels, target_sizes, is_bid_side=True, discount_factor=0.95
+    )
+
+    # Compute metrics for markets with a qualifying band
+    scored_tickers = []
+    intensities = []
+    risks = []
+    for ticker, bid_band, target_size, risk_score in zip(tickers, bid_bands, target_sizes, candidate_risks):
+        if not bid_band:
+            continue
+        scored_tickers.append(ticker)
+        intensities.append(bot.compute_lip_intensity(bid_band, target_size))
+        risks.append(risk_score)
+
+    # Score: prefer moderate intensity, lower risk
+    intensity_scores = [
+        i / 0.3 if i < 0.3 else (1.0 if i <= 3.0 else 3.0 / i)
+        for i in intensities
+    ]
+    scores = [
+        0.5 * i_score + 0.5 * max(0.0, 1.0 - r / 3.0)
+        for i_score, r in zip(intensity_scores, risks)
+    ]
+
+    # Rank by score (stable, highest first)
+    order = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+    market_scores = [
+        (scored_tickers[j], scores[j], intensities[j], risks[j]) for j in order
+    ]
     
     logger.info("Market Rankings:")
     for i, (ticker, score, intensity, risk) in enumerate(market_scores[:5], 1):
         logger.info(
-            f"  {i}. {ticker}: score={score:.3f} "
-            f"(intensity={intensity:.2f}, risk={risk:.2f})"
+            "  %d. %s: score=%.3f (intensity=%.2f, risk=%.2f)",
+            i, ticker, score, intensity, risk
         )
     
     return market_scores
@@ -264,7 +271,7 @@ def example_integration_pattern(bot, ticker, orderbook, target_size, inventory):
         )
         
         if lip_result['skip_reason']:
-            logger.info(f"❌ Skipping: {lip_result['skip_reason']}")
+            logger.info("❌ Skipping: %s", lip_result['skip_reason'])
             return None
         
         # Extract quote parameters
@@ -273,7 +280,7 @@ def example_integration_pattern(bot, ticker, orderbook, target_size, inventory):
         bid_size = lip_result['bid_size']
         ask_size = lip_result['ask_size']
         
-        logger.info(f"✅ LIP quotes: bid ${bid_price:.2f} x {bid_size}, ask ${ask_price:.2f} x {ask_size}")
+        logger.info("✅ LIP quotes: bid $%.2f x %s, ask $%.2f x %s", bid_price, bid_size, ask_price, ask_size)
         
         # Place orders (pseudo-code)
         # if bid_price and bid_size > 0:
@@ -297,12 +304,12 @@ def main():
     logger.info("LIP Risk-Based Quoting - Usage Examples")
     logger.info("=" * 60)
     
-    # Setup environment
-    setup_lip_environment()
+    # Setup LIP configuration
+    lip_config = setup_lip_environment()
     
     # Note: You would initialize these with real API credentials
     # api = KalshiTradingAPI(email="...", password="...", base_url="...", logger=logger)
-    # bot = LIPBot(logger=logger, api=api, max_position=100)
+    # bot = LIPBot(logger=logger, api=api, max_position=100, lip_config=lip_config)
     
     logger.info("\n⚠️  These are conceptual examples showing the API usage.")
     logger.info("⚠️  Replace with real API initialization for production use.")
@@ -314,8 +321,8 @@ def main():
     
     # Example orderbook (simplified)
     orderbook = {
-        "var_true": [(0.45, 100), (0.44, 150), (0.43, 200)],
-        "var_false": [(0.55, 80), (0.56, 120), (0.57, 180)]
+        "var_true": OrderbookLevels.from_columns([0.45, 0.44, 0.43], [100, 150, 200]),
+        "var_false": OrderbookLevels.from_columns([0.55, 0.56, 0.57], [80, 120, 180])
     }
     
     logger.info("\nFor full integration, see:")
@@ -6,19 +6,27 @@ This script cancels all resting orders on Kalshi using the Kalshi Python SDK.
 It uses the same authentication method as mm.py.
 
 Usage:
-    python cancel_all_orders.py
+    python cancel_all_orders.py [--tickers TICKER1,TICKER2] [--page-size 200] [--yes]
 
 Environment Variables Required:
     - KALSHI_EMAIL: Your Kalshi account email
     - KALSHI_PASSWORD: Your Kalshi account password
     - KALSHI_API_KEY_ID: Your API key ID
     - KALSHI_PRIVATE_KEY_PATH: Path to your private key PEM file
+
+Optional Environment Variables:
+    - KALSHI_CANCEL_CONCURRENCY: Number of concurrent cancel requests (default: 16)
 """
 
 import os
 import sys
+import argparse
 import logging
-from typing import List, Dict
+import signal
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Optional
+from urllib3.util.retry import Retry
 from kalshi_python import Configuration, KalshiClient
 from dotenv import load_dotenv
 
@@ -32,8 +40,33 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Number of cancel requests kept in flight at once (stay under API rate limits);
+# KALSHI_CANCEL_CONCURRENCY overrides it, read after .env is loaded
+DEFAULT_CANCEL_CONCURRENCY = 16
+
+# Accepted confirmation answers and how long to wait for one before assuming "no"
+_AFFIRM = frozenset({"yes", "y"})
+CONFIRM_TIMEOUT_SECONDS = 30
+
+
+def get_cancel_concurrency() -> int:
+    """KALSHI_CANCEL_CONCURRENCY as a positive int; invalid values fall back to the default"""
+    raw = os.getenv("KALSHI_CANCEL_CONCURRENCY")
+    if raw is None or not raw.strip():
+        return DEFAULT_CANCEL_CONCURRENCY
+    try:
+        value = int(raw)
+    except ValueError:
+        value = 0
+    if value < 1:
+        logger.warning(
+            f"Ignoring invalid KALSHI_CANCEL_CONCURRENCY={raw!r}; using {DEFAULT_CANCEL_CONCURRENCY}"
+        )
+        return DEFAULT_CANCEL_CONCURRENCY
+    return value
 
-def initialize_client() -> KalshiClient:
+
+def initialize_client(concurrency: Optional[int] = None) -> KalshiClient:
     """Initialize and authenticate the Kalshi client"""
     logger.info("Initializing Kalshi client...")
     
@@ -45,35 +78,43 @@ def initialize_client() -> KalshiClient:
         "KALSHI_PRIVATE_KEY_PATH"
     ]
     
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    # Read each variable once so checks and configuration see the same values
+    env = {var: os.getenv(var) for var in required_vars}
+    missing_vars = [var for var, value in env.items() if not value]
     if missing_vars:
         logger.error(f"Missing required environment variables: {', '.join(missing_vars)}")
         sys.exit(1)
     
-    # Load private key
-    private_key_path = os.getenv("KALSHI_PRIVATE_KEY_PATH")
-    try:
-        with open(private_key_path, "r") as f:
-            private_key = f.read()
-    except FileNotFoundError:
-        logger.error(f"Private key file not found at: {private_key_path}")
-        sys.exit(1)
-    except Exception as e:
-        logger.error(f"Failed to read private key file: {e}")
-        sys.exit(1)
+    private_key_path = env["KALSHI_PRIVATE_KEY_PATH"]
     
     # Configure the client
     config = Configuration(
-        username=os.getenv("KALSHI_EMAIL"),
-        password=os.getenv("KALSHI_PASSWORD"),
-        access_token=os.getenv("KALSHI_API_KEY_ID"),
+        username=env["KALSHI_EMAIL"],
+        password=env["KALSHI_PASSWORD"],
+        access_token=env["KALSHI_API_KEY_ID"],
     )
-    config.api_key_id = os.getenv("KALSHI_API_KEY_ID")
-    config.private_key_pem = private_key
+    
+    # Size the SDK's urllib3 pool so every concurrent cancel reuses a keep-alive
+    # connection, and retry transient gateway errors
+    if concurrency is None:
+        concurrency = get_cancel_concurrency()
+    config.connection_pool_maxsize = max(concurrency, config.connection_pool_maxsize or 0)
+    config.retries = Retry(total=3, backoff_factor=0.1, status_forcelist=[502, 503, 504])
     
     # Create client
     client = KalshiClient(config)
     
+    # Load the private key once. Setting config.private_key_pem instead would make
+    # the SDK re-parse the PEM on every request (i.e. on every cancel).
+    try:
+        client.set_kalshi_auth(env["KALSHI_API_KEY_ID"], private_key_path)
+    except FileNotFoundError:
+        logger.error(f"Private key file not found at: {private_key_path}")
+        sys.exit(1)
+    except Exception as e:
+        logger.error(f"Failed to read private key file: {e}")
+        sys.exit(1)
+    
     # Verify connection by getting balance
     try:
         balance = client.get_balance()
@@ -85,123 +126,223 @@ def initialize_client() -> KalshiClient:
     return client
 
 
-def get_all_resting_orders(client: KalshiClient) -> List[Dict]:
+def _order_field(order, name: str, default=None):
+    """Read a field from an SDK order object or an order dict"""
+    if isinstance(order, dict):
+        return order.get(name, default)
+    return getattr(order, name, default)
+
+
+def iter_resting_orders(client: KalshiClient, tickers: Optional[List[str]] = None,
+                        page_size: int = 200) -> Iterator:
+    """Yield resting orders page by page, optionally filtered server-side by ticker.
+
+    A failed page fetch is logged with its ticker and cursor and re-raised, so callers
+    never mistake the orders yielded so far for the complete list.
+    """
+    for ticker in (tickers or [None]):
+        cursor = None
+        while True:
+            params = {"status": "resting", "limit": page_size}
+            if ticker:
+                params["ticker"] = ticker
+            if cursor:
+                params["cursor"] = cursor
+            try:
+                api_response = client.get_orders(**params)
+            except TypeError:
+                # SDK may require explicit None for ticker
+                try:
+                    api_response = client.get_orders(ticker=ticker, **{k: v for k, v in params.items() if k != "ticker"})
+                except Exception as e:
+                    logger.error(f"Failed to fetch orders (ticker={ticker}, cursor={cursor}): {e}")
+                    raise
+            except Exception as e:
+                logger.error(f"Failed to fetch orders (ticker={ticker}, cursor={cursor}): {e}")
+                raise
+            
+            # Extract orders from response
+            raw_orders = getattr(api_response, "orders", None)
+            if raw_orders is None:
+                raw_orders = api_response.get("orders", []) if isinstance(api_response, dict) else []
+            yield from raw_orders
+            
+            cursor = _order_field(api_response, "cursor")
+            if not cursor or not raw_orders:
+                break
+
+
+def get_all_resting_orders(client: KalshiClient, tickers: Optional[List[str]] = None,
+                           page_size: int = 200) -> List:
     """Get all resting orders from the portfolio"""
-    logger.info("Fetching all resting orders...")
+    if tickers:
+        logger.info(f"Fetching resting orders for {', '.join(tickers)}...")
+    else:
+        logger.info("Fetching all resting orders...")
     
-    try:
-        # Try without ticker parameter first (gets all orders)
-        api_response = client.get_orders(status="resting")
-    except TypeError:
-        # SDK may require explicit None for ticker
-        try:
-            api_response = client.get_orders(ticker=None, status="resting")
-        except Exception as e:
-            logger.error(f"Failed to fetch orders: {e}")
-            return []
-    except Exception as e:
-        logger.error(f"Failed to fetch orders: {e}")
-        return []
-    
-    # Extract orders from response
-    raw_orders = getattr(api_response, "orders", None)
-    if raw_orders is None:
-        raw_orders = api_response.get("orders", []) if isinstance(api_response, dict) else []
-    
-    # Convert to list of dicts for easier processing
-    orders = []
-    for order in raw_orders:
-        if isinstance(order, dict):
-            orders.append(order)
-        else:
-            # Convert object to dict
-            order_dict = {}
-            for attr in ["order_id", "ticker", "side", "action", "yes_price", "no_price", "remaining_count"]:
-                order_dict[attr] = getattr(order, attr, None)
-            orders.append(order_dict)
+    orders = list(iter_resting_orders(client, tickers=tickers, page_size=page_size))
     
     logger.info(f"Found {len(orders)} resting orders")
     return orders
 
 
-def cancel_all_orders(client: KalshiClient, orders: List[Dict]) -> Dict[str, int]:
-    """Cancel all orders and return success/failure counts"""
-    if not orders:
+def cancel_all_orders(client: KalshiClient, orders: Iterable, concurrency: Optional[int] = None) -> Dict[str, int]:
+    """Cancel all orders and return success/failure counts.
+
+    orders may be a list or a generator; cancels are dispatched as orders
+    are produced, so cancellation can start before pagination finishes.
+    If the generator fails part-way, the cancels already sent are still
+    counted and the result has "incomplete": 1 (orders may remain).
+    """
+    total = len(orders) if hasattr(orders, "__len__") else None
+    if total == 0:
         logger.info("No orders to cancel")
-        return {"success": 0, "failed": 0}
+        return {"success": 0, "failed": 0, "incomplete": 0}
     
-    logger.info(f"Canceling {len(orders)} orders...")
+    if total is not None:
+        logger.info(f"Canceling {total} orders...")
+    else:
+        logger.info("Canceling orders as they are fetched...")
     
     success_count = 0
     failed_count = 0
+    incomplete = 0
     
-    for i, order in enumerate(orders, 1):
-        order_id = order.get("order_id")
-        ticker = order.get("ticker", "UNKNOWN")
-        side = order.get("side", "UNKNOWN")
-        action = order.get("action", "UNKNOWN")
-        remaining = order.get("remaining_count", 0)
-        
-        logger.info(f"[{i}/{len(orders)}] Canceling order {order_id} - {ticker} {side} {action} (remaining: {remaining})")
-        
+    # Cancels are independent round-trips, so keep several in flight at once
+    if concurrency is None:
+        concurrency = get_cancel_concurrency()
+    max_workers = max(1, min(concurrency, total or concurrency))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
         try:
-            client.cancel_order(order_id)
-            logger.info(f"  ✅ Successfully canceled order {order_id}")
-            success_count += 1
+            for i, order in enumerate(orders, 1):
+                order_id = _order_field(order, "order_id")
+                ticker = _order_field(order, "ticker", "UNKNOWN")
+                side = _order_field(order, "side", "UNKNOWN")
+                action = _order_field(order, "action", "UNKNOWN")
+                remaining = _order_field(order, "remaining_count", 0)
+                progress = f"{i}/{total}" if total is not None else f"{i}"
+                logger.info(f"[{progress}] Canceling order {order_id} - {ticker} {side} {action} (remaining: {remaining})")
+                futures[executor.submit(client.cancel_order, order_id)] = order_id
         except Exception as e:
-            logger.error(f"  ❌ Failed to cancel order {order_id}: {e}")
-            failed_count += 1
+            # Listing stopped part-way: finish the cancels already sent, then report incomplete
+            logger.error(f"Order listing failed after {len(futures)} orders; remaining orders were not canceled: {e}")
+            incomplete = 1
+        
+        if not futures and not incomplete:
+            logger.info("No orders to cancel")
+        
+        for future in as_completed(futures):
+            order_id = futures[future]
+            try:
+                future.result()
+                logger.info(f"  ✅ Successfully canceled order {order_id}")
+                success_count += 1
+            except Exception as e:
+                logger.error(f"  ❌ Failed to cancel order {order_id}: {e}")
+                failed_count += 1
     
-    return {"success": success_count, "failed": failed_count}
+    return {"success": success_count, "failed": failed_count, "incomplete": incomplete}
+
+
+class _PromptTimeout(Exception):
+    pass
+
+
+def _prompt_with_timeout(prompt: str, timeout_seconds: int) -> str:
+    """input() that returns an empty answer (treated as "no") after timeout_seconds"""
+    if not hasattr(signal, "SIGALRM"):
+        # No alarm signal on this platform (e.g. Windows): plain blocking prompt
+        return input(prompt)
+    
+    def _on_alarm(signum, frame):
+        raise _PromptTimeout()
+    
+    previous_handler = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.alarm(timeout_seconds)
+    try:
+        return input(prompt)
+    except _PromptTimeout:
+        logger.info(f"\nNo answer within {timeout_seconds}s, defaulting to no.")
+        return ""
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Cancel resting Kalshi orders")
+    parser.add_argument("--tickers", type=str, default=None,
+                        help="Comma-separated market tickers to cancel (default: all markets)")
+    parser.add_argument("--page-size", type=int, default=200,
+                        help="Orders fetched per page (max 200)")
+    parser.add_argument("--yes", action="store_true",
+                        help="Skip the summary and confirmation prompt (non-interactive)")
+    return parser.parse_args(argv)
 
 
 def main():
     """Main function to cancel all orders"""
+    args = parse_args()
+    tickers = [t.strip() for t in args.tickers.split(",") if t.strip()] if args.tickers else None
+    page_size = max(1, min(200, args.page_size))
+    
     # Load environment variables from .env file
     load_dotenv()
+    concurrency = get_cancel_concurrency()
     
     logger.info("=" * 60)
     logger.info("Kalshi - Cancel All Orders Script")
     logger.info("=" * 60)
     
     # Initialize client
-    client = initialize_client()
-    
-    # Get all resting orders
-    orders = get_all_resting_orders(client)
-    
-    if not orders:
-        logger.info("No orders found to cancel. Exiting.")
-        return
-    
-    # Display orders summary
-    logger.info("\n" + "=" * 60)
-    logger.info("Orders Summary:")
-    logger.info("=" * 60)
-    
-    ticker_summary = {}
-    for order in orders:
-        ticker = order.get("ticker", "UNKNOWN")
-        ticker_summary[ticker] = ticker_summary.get(ticker, 0) + 1
+    client = initialize_client(concurrency)
     
-    for ticker, count in sorted(ticker_summary.items()):
-        logger.info(f"  {ticker}: {count} order(s)")
-    
-    logger.info("=" * 60)
-    
-    # Ask for confirmation
-    try:
-        response = input(f"\nAre you sure you want to cancel all {len(orders)} orders? (yes/no): ")
-        if response.lower() not in ["yes", "y"]:
-            logger.info("Cancellation aborted by user.")
+    if args.yes:
+        # Non-interactive: no summary or prompt, cancel while paginating
+        logger.info("--yes given: canceling without confirmation")
+        results = cancel_all_orders(
+            client, iter_resting_orders(client, tickers=tickers, page_size=page_size), concurrency
+        )
+    else:
+        # Get all resting orders; a partial listing is not worth confirming
+        try:
+            orders = get_all_resting_orders(client, tickers=tickers, page_size=page_size)
+        except Exception:
+            logger.error("Could not list every resting order; nothing was canceled.")
+            sys.exit(1)
+        
+        if not orders:
+            logger.info("No orders found to cancel. Exiting.")
             return
-    except KeyboardInterrupt:
-        logger.info("\nCancellation aborted by user.")
-        return
-    
-    # Cancel all orders
-    logger.info("")
-    results = cancel_all_orders(client, orders)
+        
+        # Display orders summary
+        logger.info("\n" + "=" * 60)
+        logger.info("Orders Summary:")
+        logger.info("=" * 60)
+        
+        ticker_summary = Counter(_order_field(order, "ticker", "UNKNOWN") for order in orders)
+        for ticker, count in sorted(ticker_summary.items()):
+            logger.info(f"  {ticker}: {count} order(s)")
+        
+        logger.info("=" * 60)
+        
+        # Ask for confirmation
+        try:
+            response = _prompt_with_timeout(
+                f"\nAre you sure you want to cancel all {len(orders)} orders? (yes/no): ",
+                CONFIRM_TIMEOUT_SECONDS,
+            )
+            if response.strip().lower() not in _AFFIRM:
+                logger.info("Cancellation aborted by user.")
+                return
+        except KeyboardInterrupt:
+            logger.info("\nCancellation aborted by user.")
+            return
+        
+        # Cancel all orders
+        logger.info("")
+        results = cancel_all_orders(client, orders, concurrency)
     
     # Display results
     logger.info("\n" + "=" * 60)
@@ -212,6 +353,9 @@ def main():
     logger.info(f"  Total: {results['success'] + results['failed']}")
     logger.info("=" * 60)
     
+    if results.get('incomplete'):
+        logger.warning("Order listing stopped early; resting orders may remain. Re-run to cancel the rest.")
+        sys.exit(1)
     if results['failed'] > 0:
         logger.warning("Some orders failed to cancel. Check the logs above for details.")
         sys.exit(1)
@@ -1,20 +1,27 @@
 import abc
+import atexit
+import bisect
+import heapq
+import itertools
+from array import array
+from functools import lru_cache, wraps
 from re import L, M
 import time
 from datetime import datetime
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Deque, Dict, List, Tuple, Optional, Union
 import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
 import uuid
 import math
 import os
-from decimal import Decimal, ROUND_HALF_UP
 import kalshi_python
 from kalshi_python import Configuration, KalshiClient
 from kalshi_python.models.create_order_request import CreateOrderRequest
 import json
-from collections import defaultdict
+from collections import defaultdict, deque
 import base64
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import padding
@@ -29,20 +36,253 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import asyncio
 import websockets
 import queue
+import random
 
-def to_tick(p: float) -> float:
-    # Clamp to valid cents 0.01..0.99 and use round-half-up to 2 decimals
-    d = Decimal(str(p))
-    # quantize to 2 decimals with HALF_UP
-    q = d.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-    # clamp after rounding
-    q = max(Decimal("0.01"), min(Decimal("0.99"), q))
-    return float(q)
+try:
+    import orjson  # optional: faster JSON decoding for websocket traffic
+except ImportError:
+    orjson = None
+
+try:
+    import ciso8601  # optional: C ISO-8601 parser, handles the 'Z' suffix natively
+except ImportError:
+    ciso8601 = None
+
+try:
+    import uvloop  # optional: libuv-based event loop for the websocket threads
+except ImportError:
+    uvloop = None
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    # Per-thread loop only; the process-wide event loop policy is left alone
+    return uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+
+_NET_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_NET_LOOP_LOCK = threading.Lock()
+
+def _get_net_loop() -> asyncio.AbstractEventLoop:
+    """Process-wide network loop shared by the websocket trackers.
+
+    Started on first use in one daemon thread running ``run_forever``; the
+    trackers submit their listeners with ``run_coroutine_threadsafe``.
+    """
+    global _NET_LOOP
+    with _NET_LOOP_LOCK:
+        if _NET_LOOP is None or _NET_LOOP.is_closed():
+            loop = _new_event_loop()
+
+            def run_loop():
+                asyncio.set_event_loop(loop)
+                loop.run_forever()
+
+            threading.Thread(target=run_loop, name="net-loop", daemon=True).start()
+            _NET_LOOP = loop
+        return _NET_LOOP
+
+async def _sleep_unless_stopped(stop_event: threading.Event, delay: float, poll_s: float = 0.1) -> bool:
+    """Sleep up to ``delay`` seconds, waking early once ``stop_event`` is set.
+
+    ``stop_event`` is a threading.Event shared with the bot thread, so it is
+    polled in short slices rather than awaited. Returns True if stopped.
+    """
+    deadline = time.monotonic() + delay
+    while not stop_event.is_set():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        await asyncio.sleep(min(poll_s, remaining))
+    return True
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+def _json_default(o):
+    if isinstance(o, datetime):
+        return o.isoformat()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+if orjson is not None:
+    _ORJSON_OPTS = orjson.OPT_NON_STR_KEYS
+    def _dumps(o) -> bytes:
+        return orjson.dumps(o, option=_ORJSON_OPTS)
+else:
+    def _dumps(o) -> bytes:
+        return json.dumps(o, default=_json_default).encode()
+
+def _dumps_pretty(o) -> bytes:
+    """Indented JSON for the inspection dumps (markets.json etc.); unknown types fall back to str"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(o, default=str, option=_ORJSON_OPTS | orjson.OPT_INDENT_2)
+        except TypeError:
+            # e.g. integers wider than 64 bits; let the stdlib encoder handle it
+            pass
+    return json.dumps(o, indent=2, default=str).encode()
+
+# Cap on per-bot fill history and pending markout checks (two per fill)
+_FILL_HISTORY_MAX = 2000
+_MARKOUT_HEAP_MAX = 2 * _FILL_HISTORY_MAX
+# Toxicity edge/width bonuses below this (dollars) are treated as zero
+_BONUS_EPS = 1e-6
+
+# Valid price range in cents
+_CENT_CLAMP = (1, 99)
+
+@lru_cache(maxsize=4096)
+def _to_cents_cached(key: int) -> int:
+    # key is the price in units of 1e-5; round half-up to whole cents, then clamp
+    lo, hi = _CENT_CLAMP
+    return max(lo, min(hi, (key + 500) // 1000))
 
 def to_cents(p: float) -> int:
-    # Ensure consistency with to_tick rounding
-    cents = Decimal(str(to_tick(p))) * Decimal(100)
-    return int(cents.quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+    # Snapping to 1e-5 absorbs float drift (0.235*1e5 == 23500.000000000004) and
+    # keeps the shared cache small; quoting re-prices at the same ticks constantly
+    return _to_cents_cached(round(p * 1e5))
+
+@lru_cache(maxsize=4096)
+def _to_tick_cached(key: int) -> float:
+    return _to_cents_cached(key) / 100.0
+
+def to_tick(p: float) -> float:
+    # Clamp to valid cents 0.01..0.99 and use round-half-up to 2 decimals; same
+    # 1e-5 key as to_cents, so a repeat price is one cache hit with no division
+    return _to_tick_cached(round(p * 1e5))
+
+# Whole-cent quote fields -> dollars, looked up instead of divided and rounded
+_C2D = {i: round(i / 100.0, 2) for i in range(101)}
+# Same, snapped to a quotable tick (0 stays 0.0 for "no quote")
+_C2TICK = {i: (to_tick(i / 100.0) if i else 0.0) for i in range(101)}
+
+def _cents_to_dollars(c) -> float:
+    d = _C2D.get(c)
+    return d if d is not None else round(float(c) / 100.0, 2)
+
+
+# Background jsonl writer batching limits
+_JSONL_BATCH_MAX = 1000
+_JSONL_BATCH_WAIT_S = 0.05
+
+class _JsonlSink:
+    """Process-wide jsonl writer: one queue and one daemon thread for every stream.
+
+    Callers enqueue (path, line) pairs; the writer collects up to _JSONL_BATCH_MAX
+    lines or _JSONL_BATCH_WAIT_S seconds worth, groups them by file and issues a
+    single write() per file per batch.
+    """
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+        self._files: Dict[str, object] = {}  # path -> binary file, touched by the writer thread only
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def put(self, path: str, line: bytes) -> None:
+        self._queue.put_nowait((path, line))
+        if self._thread is None:
+            self._start()
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._writer_loop, name="jsonl-sink", daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def _file_for(self, path: str):
+        f = self._files.get(path)
+        if f is None:
+            f = open(path, 'ab', buffering=1 << 16)
+            self._files[path] = f
+        return f
+
+    def _writer_loop(self) -> None:
+        q = self._queue
+        while True:
+            item = q.get()
+            deadline = time.monotonic() + _JSONL_BATCH_WAIT_S
+            batches: Dict[str, List[bytes]] = {}
+            n = 0
+            flushed: Optional[threading.Event] = None
+            while True:
+                if isinstance(item, threading.Event):
+                    flushed = item
+                    break
+                path, line = item
+                lines = batches.get(path)
+                if lines is None:
+                    batches[path] = [line]
+                else:
+                    lines.append(line)
+                n += 1
+                if n >= _JSONL_BATCH_MAX:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = q.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            # Push buffers out once a burst has drained so the files stay tail-able
+            drained = flushed is not None or q.empty()
+            for path, lines in batches.items():
+                try:
+                    self._file_for(path).write(b'\n'.join(lines) + b'\n')
+                except Exception:
+                    # Don't let logging failures break the bot
+                    pass
+            if drained:
+                for f in self._files.values():
+                    try:
+                        f.flush()
+                    except Exception:
+                        pass
+            if flushed is not None:
+                flushed.set()
+
+    def flush(self, timeout: float = 2.0) -> None:
+        """Block until every line enqueued so far has been written out"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put_nowait(done)
+        done.wait(timeout)
+
+
+_JSONL_SINK = _JsonlSink()
+
+
+class _JsonlStream:
+    """A tagged stream ('alerts', 'metrics', ...) bound to one file on the shared sink"""
+    __slots__ = ('stream', 'path')
+
+    def __init__(self, stream: str, path: str):
+        self.stream = stream
+        self.path = path
+
+    def put(self, line: bytes) -> None:
+        _JSONL_SINK.put(self.path, line)
+
+    def flush(self, timeout: float = 2.0) -> None:
+        _JSONL_SINK.flush(timeout)
+
+
+def _tail(items: Deque, n: int) -> List:
+    """Last n entries of a deque, oldest first, without walking the whole buffer"""
+    return list(itertools.islice(reversed(items), n))[::-1]
+
+
+# (epoch_ms, iso string) of the last formatted event timestamp; swapped as one tuple
+_iso_ms_cache: Tuple[int, str] = (0, "")
+
+def _iso_from_ts(ts: float) -> str:
+    """Local ISO-8601 string at millisecond precision, re-formatted only when the ms changes"""
+    global _iso_ms_cache
+    ms = int(ts * 1000)
+    cached_ms, iso = _iso_ms_cache
+    if ms != cached_ms:
+        iso = datetime.fromtimestamp(ms / 1000.0).isoformat(timespec='milliseconds')
+        _iso_ms_cache = (ms, iso)
+    return iso
 
 
 class AlertLevel(Enum):
@@ -60,25 +300,36 @@ class Alert:
     category: str
     message: str
     details: Dict = field(default_factory=dict)
+    level_value: str = field(init=False, repr=False, compare=False)
 
-    def to_json(self) -> str:
-        data = {
+    def __post_init__(self):
+        # Resolve the Enum value once rather than on every serialization
+        self.level_value = self.level.value
+
+    def to_dict(self) -> Dict:
+        return {
             'timestamp': self.timestamp,
-            'timestamp_iso': datetime.fromtimestamp(self.timestamp).isoformat(),
-            'level': self.level.value,
+            'timestamp_iso': _iso_from_ts(self.timestamp),
+            'level': self.level_value,
             'category': self.category,
             'message': self.message,
             'details': self.details
         }
-        return json.dumps(data)
+
+    def to_json_bytes(self) -> bytes:
+        return _dumps(self.to_dict())
+
+    def to_json(self) -> str:
+        return self.to_json_bytes().decode()
 
 
 class AlertManager:
     """Manages alerts and sends notifications"""
     def __init__(self, logger: logging.Logger):
         self.logger = logger
-        self.alerts: List[Alert] = []
+        self.alerts: Deque[Alert] = deque(maxlen=5000)
         self.alert_file = "alerts.jsonl"
+        self._alert_writer = _JsonlStream("alerts", self.alert_file)
         
     def send_alert(self, level: AlertLevel, category: str, message: str, details: Dict = None):
         """Send an alert and log it"""
@@ -93,8 +344,7 @@ class AlertManager:
         
         # Log to file
         try:
-            with open(self.alert_file, 'a') as f:
-                f.write(alert.to_json() + '\n')
+            self._alert_writer.put(alert.to_json_bytes())
         except Exception as e:
             self.logger.error(f"Failed to write alert to file: {e}")
         
@@ -128,15 +378,30 @@ class CircuitBreaker:
         self.alert_manager = alert_manager
         
         self.consecutive_errors = 0
-        self.is_open = True  # True = allow trading
+        # Set = allow trading; Event.is_set() is a lock-free read for the hot paths
+        self._open_event = threading.Event()
+        self._open_event.set()
         self.trip_reason: Optional[str] = None
         self.trip_time: Optional[float] = None
-        self.error_log: List[Dict] = []
+        self.error_log: Deque[Dict] = deque(maxlen=500)
+        # Guards the error log and open/tripped transitions only
         self.lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._open_event.is_set()
+
+    @is_open.setter
+    def is_open(self, value: bool) -> None:
+        if value:
+            self._open_event.set()
+        else:
+            self._open_event.clear()
         
     def record_success(self):
         """Record successful API call"""
-        with self.lock:
+        # Single attribute store is atomic under the GIL; skip it when already zero
+        if self.consecutive_errors:
             self.consecutive_errors = 0
             
     def record_error(self, error_type: str, error_msg: str):
@@ -155,26 +420,33 @@ class CircuitBreaker:
                 
     def check_pnl(self, current_pnl: float):
         """Check if PnL has dropped below threshold"""
+        if current_pnl >= self.pnl_threshold or not self._open_event.is_set():
+            return
         with self.lock:
-            if current_pnl < self.pnl_threshold and self.is_open:
+            if self.is_open:
                 self._trip(f"PnL below threshold: ${current_pnl:.2f} < ${self.pnl_threshold:.2f}")
                 
     def check_inventory_imbalance(self, inventory: int, max_position: int):
         """Check if inventory is too imbalanced"""
-        with self.lock:
-            if max_position > 0:
-                imbalance = abs(inventory) / max_position
-                self.logger.info(f"Inventory imbalance: {imbalance:.1%}, inventory={inventory}, max={max_position}")
-                if imbalance > self.max_inventory_imbalance and self.is_open:
-                    # todo not sure if it should just trip here
-                    # self._trip(f"Inventory imbalance too high: {imbalance:.1%} (inventory={inventory}, max={max_position})")
-                    pass
+        # Tripping on imbalance is disabled (see todo below), so this is diagnostics only:
+        # skip the division and formatting on the per-loop path unless DEBUG is on.
+        # Remove the logger check if the trip is re-enabled.
+        if max_position <= 0 or not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        imbalance = abs(inventory) / max_position
+        self.logger.debug(f"Inventory imbalance: {imbalance:.1%}, inventory={inventory}, max={max_position}")
+        if imbalance > self.max_inventory_imbalance and self.is_open:
+            # todo not sure if it should just trip here (take self.lock around _trip if so)
+            # self._trip(f"Inventory imbalance too high: {imbalance:.1%} (inventory={inventory}, max={max_position})")
+            pass
                     
     def _trip(self, reason: str):
         """Trip the circuit breaker (internal, assumes lock is held)"""
-        self.is_open = False
+        # Publish the reason before closing: lock-free readers that see the breaker
+        # closed must also see why
         self.trip_reason = reason
         self.trip_time = time.time()
+        self.is_open = False
         
         self.logger.critical(f"CIRCUIT BREAKER TRIPPED: {reason}")
         if self.alert_manager:
@@ -185,7 +457,7 @@ class CircuitBreaker:
                 {
                     'trip_time': self.trip_time,
                     'consecutive_errors': self.consecutive_errors,
-                    'recent_errors': self.error_log[-5:] if self.error_log else []
+                    'recent_errors': _tail(self.error_log, 5)
                 }
             )
             
@@ -193,10 +465,11 @@ class CircuitBreaker:
         """Manually reset the circuit breaker"""
         with self.lock:
             was_open = self.is_open
-            self.is_open = True
             self.consecutive_errors = 0
             self.trip_reason = None
             self.trip_time = None
+            # Re-open last so trading resumes only once the state is clean
+            self.is_open = True
             
             if not was_open:
                 self.logger.info("Circuit breaker manually reset")
@@ -209,9 +482,8 @@ class CircuitBreaker:
                     )
                     
     def is_trading_allowed(self) -> bool:
-        """Check if trading is currently allowed"""
-        with self.lock:
-            return self.is_open
+        """Check if trading is currently allowed (lock-free; safe without the GIL too)"""
+        return self._open_event.is_set()
             
     def get_status(self) -> Dict:
         """Get current circuit breaker status"""
@@ -221,47 +493,142 @@ class CircuitBreaker:
                 'consecutive_errors': self.consecutive_errors,
                 'trip_reason': self.trip_reason,
                 'trip_time': self.trip_time,
-                'recent_errors': self.error_log[-10:] if self.error_log else []
+                'recent_errors': _tail(self.error_log, 10)
             }
 
 
+@dataclass
+class LoopSnapshot:
+    """One quoting-loop iteration as recorded by MetricsTracker.record_loop"""
+    __slots__ = ('t_seconds', 'mid_price', 'inventory', 'reservation_price',
+                 'bid_price', 'ask_price', 'buy_size', 'sell_size')
+    t_seconds: float
+    mid_price: float
+    inventory: int
+    reservation_price: float
+    bid_price: float
+    ask_price: float
+    buy_size: int
+    sell_size: int
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    def __getitem__(self, key: str):
+        return getattr(self, key)
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+@dataclass
+class Action:
+    """An order-management decision; extra details stay in a dict since their keys vary by kind"""
+    __slots__ = ('ts', 'kind', 'details')
+    ts: float
+    kind: str
+    details: Dict
+
+    def get(self, key: str, default=None):
+        if key == 'ts':
+            return self.ts
+        if key == 'kind':
+            return self.kind
+        return self.details.get(key, default)
+
+    def __getitem__(self, key: str):
+        if key == 'ts':
+            return self.ts
+        if key == 'kind':
+            return self.kind
+        return self.details[key]
+
+    def to_dict(self) -> Dict:
+        return {'ts': self.ts, 'kind': self.kind, **self.details}
+
+
+@dataclass
+class Latency:
+    """A named latency sample in milliseconds"""
+    __slots__ = ('ts', 'name', 'ms')
+    ts: float
+    name: str
+    ms: float
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    def __getitem__(self, key: str):
+        return getattr(self, key)
+
+    def to_dict(self) -> Dict:
+        return {'ts': self.ts, 'name': self.name, 'ms': self.ms}
+
+
+# Periodic snapshot events that are skipped when unchanged since the last write for
+# the same ticker; order/fill events and latency samples are never deduplicated
+_DEDUP_EVENT_TYPES = frozenset({'loop_snapshot', 'pnl_snapshot'})
+
+
 class MetricsTracker:
     def __init__(self, strategy_name: str, market_ticker: Optional[str] = None):
         self.strategy_name = strategy_name
         self.market_ticker = market_ticker
         self.start_time = time.time()
-        self.loop_snapshots: List[Dict] = []
-        self.action_log: List[Dict] = []
-        self.latencies: List[Dict] = []
+        # Ring buffers: bounded memory on long runs, oldest entries evicted first
+        self.loop_snapshots: Deque[LoopSnapshot] = deque(maxlen=10000)
+        self.action_log: Deque[Action] = deque(maxlen=10000)
+        self.latencies: Deque[Latency] = deque(maxlen=5000)
         
         # Enhanced metrics tracking
-        self.api_errors: List[Dict] = []
-        self.fills: List[Dict] = []
-        self.inventory_changes: List[Dict] = []
-        self.pnl_snapshots: List[Dict] = []
+        self.api_errors: Deque[Dict] = deque(maxlen=10000)
+        self.fills: Deque[Dict] = deque(maxlen=10000)
+        self.inventory_changes: Deque[Dict] = deque(maxlen=10000)
+        self.pnl_snapshots: Deque[Dict] = deque(maxlen=2000)
         
         # Aggregate counters
         self.orders_sent = 0
         self.orders_acknowledged = 0
         self.orders_rejected = 0
         self.api_error_count = 0
+
+        # Running aggregates so summarize() never re-scans the history buffers
+        self._action_counts: Dict[str, int] = defaultdict(int)
+        self._loop_count = 0
+        self._fill_count = 0
+        self._realized_pnl_sum = 0.0
+        self._quote_latency_sum = 0.0
+        self._quote_latency_count = 0
+
+        # Last written fingerprint per (event_type, ticker) for the dedupable event types
+        self._last_logged: Dict[Tuple[str, Optional[str]], Tuple] = {}
+
         
         # Structured JSON log file
         self.json_log_file = f"{strategy_name.replace(':', '_').replace(' ', '_')}_trading.jsonl"
+        self._json_writer = _JsonlStream("metrics", self.json_log_file)
         
     def log_structured(self, event_type: str, data: Dict):
         """Write structured JSON log entry"""
+        if event_type in _DEDUP_EVENT_TYPES:
+            # Quiet markets repeat the same snapshot tick over tick; only write on change.
+            # The items themselves are kept and compared with == (hashes collide, e.g. -1/-2)
+            snapshot = tuple((k, v) for k, v in data.items() if k != 'timestamp')
+            key = (event_type, data.get('ticker'))
+            if self._last_logged.get(key) == snapshot:
+                return
+            self._last_logged[key] = snapshot
+        ts = time.time()
         entry = {
-            'timestamp': time.time(),
-            'timestamp_iso': datetime.now().isoformat(),
+            'timestamp': ts,
+            'timestamp_iso': _iso_from_ts(ts),
             'event_type': event_type,
             'strategy': self.strategy_name,
             'market': self.market_ticker,
             **data
         }
         try:
-            with open(self.json_log_file, 'a') as f:
-                f.write(json.dumps(entry) + '\n')
+            self._json_writer.put(_dumps(entry))
         except Exception as e:
             # Don't let logging failures break the bot
             pass
@@ -269,28 +636,28 @@ class MetricsTracker:
     def record_loop(self, t_seconds: float, mid_price: float, inventory: int,
                     reservation_price: float, bid_price: float, ask_price: float,
                     buy_size: int, sell_size: int) -> None:
-        self.loop_snapshots.append({
-            "t_seconds": round(t_seconds, 3),
-            "mid_price": round(mid_price, 4),
-            "inventory": int(inventory),
-            "reservation_price": round(reservation_price, 4),
-            "bid_price": round(bid_price, 4),
-            "ask_price": round(ask_price, 4),
-            "buy_size": int(buy_size),
-            "sell_size": int(sell_size),
-        })
+        self._loop_count += 1
+        self.loop_snapshots.append(LoopSnapshot(
+            round(t_seconds, 3),
+            round(mid_price, 4),
+            int(inventory),
+            round(reservation_price, 4),
+            round(bid_price, 4),
+            round(ask_price, 4),
+            int(buy_size),
+            int(sell_size),
+        ))
 
     def record_action(self, kind: str, details: Dict) -> None:
-        entry = {"ts": time.time(), "kind": kind}
-        entry.update(details or {})
-        self.action_log.append(entry)
+        self.action_log.append(Action(time.time(), kind, dict(details) if details else {}))
+        self._action_counts[kind] += 1
 
     def record_latency(self, name: str, seconds: float) -> None:
-        self.latencies.append({
-            "ts": time.time(),
-            "name": name,
-            "ms": round(seconds * 1000.0, 2)
-        })
+        ms = round(seconds * 1000.0, 2)
+        self.latencies.append(Latency(time.time(), name, ms))
+        if 'quote_update' in name:
+            self._quote_latency_sum += ms
+            self._quote_latency_count += 1
         
     def record_order_sent(self, ticker: str, side: str, action: str, price: float, size: int):
         """Record order sent to exchange"""
@@ -353,6 +720,7 @@ class MetricsTracker:
             'fee': fee
         }
         self.fills.append(fill_data)
+        self._fill_count += 1
         self.log_structured('fill', fill_data)
         
     def record_inventory_change(self, ticker: str, old_inventory: int, new_inventory: int, reason: str):
@@ -380,6 +748,7 @@ class MetricsTracker:
             'position_value': round(position_value, 2)
         }
         self.pnl_snapshots.append(pnl_data)
+        self._realized_pnl_sum += pnl_data['realized_pnl']
         self.log_structured('pnl_snapshot', pnl_data)
         
     def record_api_error(self, error_type: str, error_msg: str, endpoint: str = ''):
@@ -406,28 +775,29 @@ class MetricsTracker:
 
     def summarize(self) -> Dict:
         runtime_s = time.time() - self.start_time
-        orders_placed = sum(1 for a in self.action_log if a.get("kind") == "place_order")
-        orders_canceled = sum(1 for a in self.action_log if a.get("kind") == "cancel_order")
-        orders_kept = sum(1 for a in self.action_log if a.get("kind") == "keep_order")
-        orders_skipped = sum(1 for a in self.action_log if a.get("kind") == "skip_place")
-        last_inventory = self.loop_snapshots[-1]["inventory"] if self.loop_snapshots else 0
+        counts = self._action_counts
+        orders_placed = counts.get("place_order", 0)
+        orders_canceled = counts.get("cancel_order", 0)
+        orders_kept = counts.get("keep_order", 0)
+        orders_skipped = counts.get("skip_place", 0)
+        last_inventory = self.loop_snapshots[-1].inventory if self.loop_snapshots else 0
         
         # Calculate order success rate
         order_success_rate = (self.orders_acknowledged / self.orders_sent * 100) if self.orders_sent > 0 else 0
         
         # Calculate average quote latency
-        quote_latencies = [l['ms'] for l in self.latencies if 'quote_update' in l.get('name', '')]
-        avg_quote_latency = sum(quote_latencies) / len(quote_latencies) if quote_latencies else 0
+        n_quote = self._quote_latency_count
+        avg_quote_latency = self._quote_latency_sum / n_quote if n_quote else 0
         
         # Calculate total PnL
-        total_realized_pnl = sum(s['realized_pnl'] for s in self.pnl_snapshots)
+        total_realized_pnl = self._realized_pnl_sum
         latest_unrealized_pnl = self.pnl_snapshots[-1]['unrealized_pnl'] if self.pnl_snapshots else 0
         
         return {
             "strategy_name": self.strategy_name,
             "market_ticker": self.market_ticker,
             "runtime_seconds": round(runtime_s, 3),
-            "num_iterations": len(self.loop_snapshots),
+            "num_iterations": self._loop_count,
             "orders_placed": orders_placed,
             "orders_canceled": orders_canceled,
             "orders_kept": orders_kept,
@@ -439,7 +809,7 @@ class MetricsTracker:
             "orders_rejected": self.orders_rejected,
             "order_success_rate_pct": round(order_success_rate, 2),
             "api_errors": self.api_error_count,
-            "total_fills": len(self.fills),
+            "total_fills": self._fill_count,
             "avg_quote_latency_ms": round(avg_quote_latency, 2),
             "total_realized_pnl": round(total_realized_pnl, 2),
             "latest_unrealized_pnl": round(latest_unrealized_pnl, 2),
@@ -451,47 +821,93 @@ class MetricsTracker:
             summary = self.summarize()
             payload = {
                 "summary": summary,
-                "loop_snapshots": self.loop_snapshots,
-                "action_log": self.action_log,
-                "latencies": self.latencies,
+                "loop_snapshots": [s.to_dict() for s in self.loop_snapshots],
+                "action_log": [a.to_dict() for a in self.action_log],
+                "latencies": [l.to_dict() for l in self.latencies],
             }
             with open(f"{base_prefix}_metrics.json", "w") as f:
                 json.dump(payload, f, indent=2)
 
             # Loops CSV
             try:
+                rows = ["t_seconds,mid_price,inventory,reservation_price,bid_price,ask_price,buy_size,sell_size"]
+                rows.extend(
+                    f"{s.t_seconds},{s.mid_price},{s.inventory},{s.reservation_price},{s.bid_price},{s.ask_price},{s.buy_size},{s.sell_size}"
+                    for s in self.loop_snapshots
+                )
                 with open(f"{base_prefix}_loops.csv", "w") as f:
-                    f.write("t_seconds,mid_price,inventory,reservation_price,bid_price,ask_price,buy_size,sell_size\n")
-                    for s in self.loop_snapshots:
-                        f.write(
-                            f"{s['t_seconds']},{s['mid_price']},{s['inventory']},{s['reservation_price']},{s['bid_price']},{s['ask_price']},{s['buy_size']},{s['sell_size']}\n"
-                        )
+                    f.write("\n".join(rows) + "\n")
             except Exception:
                 pass
 
             # Actions CSV
             try:
+                rows = ["ts,kind,order_id,action,side,price,size,reason"]
+                rows.extend(
+                    f"{a.get('ts','')},{a.get('kind','')},{a.get('order_id','')},{a.get('action','')},{a.get('side','')},{a.get('price','')},{a.get('size','')},{a.get('reason','')}"
+                    for a in self.action_log
+                )
                 with open(f"{base_prefix}_actions.csv", "w") as f:
-                    f.write("ts,kind,order_id,action,side,price,size,reason\n")
-                    for a in self.action_log:
-                        f.write(
-                            f"{a.get('ts','')},{a.get('kind','')},{a.get('order_id','')},{a.get('action','')},{a.get('side','')},{a.get('price','')},{a.get('size','')},{a.get('reason','')}\n"
-                        )
+                    f.write("\n".join(rows) + "\n")
             except Exception:
                 pass
 
             # Latencies CSV
             try:
+                rows = ["ts,name,ms"]
+                rows.extend(f"{l.ts},{l.name},{l.ms}" for l in self.latencies)
                 with open(f"{base_prefix}_latencies.csv", "w") as f:
-                    f.write("ts,name,ms\n")
-                    for l in self.latencies:
-                        f.write(f"{l.get('ts','')},{l.get('name','')},{l.get('ms','')}\n")
+                    f.write("\n".join(rows) + "\n")
             except Exception:
                 pass
         except Exception:
             # Avoid raising during shutdown
             pass
 
+# Pre-serialized WebSocket commands; only the message id (and ticker) vary
+_FILL_SUBSCRIBE_TEMPLATE = '{"id":%d,"cmd":"subscribe","params":{"channels":["fill"]}}'
+_ORDERBOOK_CMD_TEMPLATE = '{"id":%d,"cmd":"%s","params":{"channels":["orderbook_delta"],"market_tickers":[%s]}}'
+
+
+@lru_cache(maxsize=1)
+def _load_private_key(private_key_path: str):
+    """Read and parse the PEM private key once per path; reconnects reuse the key object"""
+    with open(private_key_path, "rb") as f:
+        return serialization.load_pem_private_key(f.read(), password=None)
+
+
+# Signing parameters are immutable; build them once instead of per signed request
+_SHA256 = hashes.SHA256()
+_PSS_PADDING = padding.PSS(mgf=padding.MGF1(_SHA256), salt_length=padding.PSS.DIGEST_LENGTH)
+
+def _sign_message(private_key, message: bytes) -> str:
+    """RSA-PSS/SHA256 signature of ``message``, base64-encoded for the access headers"""
+    return base64.b64encode(private_key.sign(message, _PSS_PADDING, _SHA256)).decode('utf-8')
+
+
+def _fix_iso(date_str: str) -> str:
+    # 'Z' only ever appears as the trailing UTC marker; fromisoformat wants '+00:00'
+    return date_str[:-1] + '+00:00' if date_str[-1:] == 'Z' else date_str
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_to_timestamp(date_str: str) -> Optional[float]:
+    """Parse ISO date string to Unix timestamp (seconds since epoch)"""
+    # Cached: fill and market timestamps repeat heavily; bad inputs cache as None
+    if not date_str:
+        return None
+    if ciso8601 is not None:
+        try:
+            return ciso8601.parse_datetime(date_str).timestamp()
+        except (ValueError, TypeError):
+            return None
+    try:
+        dt = datetime.fromisoformat(_fix_iso(date_str))
+        return dt.timestamp()
+    except (ValueError, AttributeError):
+        return None
+
+
 class InsufficientBalanceError(Exception):
     """Raised when the exchange returns an insufficient balance error."""
     pass
@@ -514,23 +930,23 @@ class WebSocketFillTracker:
         self.metrics_tracker = metrics_tracker
         self.stop_event = stop_event or threading.Event()
         self.ws = None
-        self.ws_thread = None
+        self._ws_future = None
         self.message_id = 1
         self.is_running = False
         self.reconnect_delay = 1.0  # Start with 1 second
         self.max_reconnect_delay = 60.0  # Max 60 seconds
 
-    def _parse_date_to_timestamp(self, date_str: str) -> Optional[float]:
-        """Parse ISO date string to Unix timestamp (seconds since epoch)"""
-        if not date_str:
-            return None
-        try:
-            # Handle 'Z' timezone by converting to '+00:00' for compatibility
-            date_clean = date_str.replace('Z', '+00:00')
-            dt = datetime.fromisoformat(date_clean)
-            return dt.timestamp()
-        except (ValueError, AttributeError):
-            return None
+        # Single worker keeps fills in arrival order off the event loop; created in start()
+        self._fill_executor: Optional[ThreadPoolExecutor] = None
+
+        # msg_type -> handler(data); unknown types fall through to _on_unknown
+        self._msg_handlers = {
+            "subscribed": self._on_subscribed,
+            "fill": self._on_fill_msg,
+            "error": self._on_error,
+        }
+
+    _parse_date_to_timestamp = staticmethod(_parse_date_to_timestamp)
 
     def _create_auth_headers(self) -> Dict[str, str]:
         """Create authentication headers for WebSocket connection"""
@@ -542,25 +958,15 @@ class WebSocketFillTracker:
             return {}
         
         try:
-            # Load the private key
-            with open(private_key_path, "rb") as f:
-                private_key = serialization.load_pem_private_key(f.read(), password=None)
+            private_key = _load_private_key(private_key_path)
             
-            # Create signature
-            timestamp = str(int(time.time() * 1000))
+            # Create signature (fresh per connection; the timestamp is part of the message)
+            timestamp = str(time.time_ns() // 1_000_000)
             method = "GET"
             path = "/trade-api/ws/v2"
             message = f"{timestamp}{method}{path}".encode('utf-8')
             
-            signature_bytes = private_key.sign(
-                message,
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.DIGEST_LENGTH
-                ),
-                hashes.SHA256()
-            )
-            signature = base64.b64encode(signature_bytes).decode('utf-8')
+            signature = _sign_message(private_key, message)
             
             return {
                 'KALSHI-ACCESS-KEY': api_key_id,
@@ -581,7 +987,7 @@ class WebSocketFillTracker:
                 auth_headers = self._create_auth_headers()
                 if not auth_headers:
                     self.logger.error("Failed to create auth headers, waiting before retry...")
-                    await asyncio.sleep(self.reconnect_delay)
+                    await _sleep_unless_stopped(self.stop_event, self.reconnect_delay)
                     continue
                 
                 # Connect to WebSocket
@@ -621,43 +1027,40 @@ class WebSocketFillTracker:
     
     async def _subscribe_to_fills(self, websocket):
         """Subscribe to the fill channel"""
-        subscription = {
-            "id": self.message_id,
-            "cmd": "subscribe",
-            "params": {
-                "channels": ["fill"]
-            }
-        }
-        await websocket.send(json.dumps(subscription))
+        # Only the id varies; str (not bytes) keeps it a text frame
+        await websocket.send(_FILL_SUBSCRIBE_TEMPLATE % self.message_id)
         self.message_id += 1
         self.logger.info("Subscribed to fill updates")
     
     async def _process_message(self, message: str):
         """Process incoming WebSocket messages"""
         try:
-            data = json.loads(message)
-            msg_type = data.get("type")
-            
-            if msg_type == "subscribed":
-                self.logger.info(f"Subscription confirmed: {data}")
-                
-            elif msg_type == "fill":
-                # Process fill notification
-                fill_data = data.get("msg", {})
-                self._handle_fill(fill_data)
-                
-            elif msg_type == "error":
-                error_code = data.get("msg", {}).get("code")
-                error_msg = data.get("msg", {}).get("msg")
-                self.logger.error(f"WebSocket error {error_code}: {error_msg}")
-                
-            else:
-                self.logger.debug(f"Received message type: {msg_type}")
-                
+            data = _json_loads(message)
+            self._msg_handlers.get(data.get("type"), self._on_unknown)(data)
         except json.JSONDecodeError as e:
             self.logger.error(f"Failed to parse WebSocket message: {e}")
         except Exception as e:
             self.logger.error(f"Error processing WebSocket message: {e}")
+
+    def _on_subscribed(self, data: Dict):
+        self.logger.info(f"Subscription confirmed: {data}")
+
+    def _on_fill_msg(self, data: Dict):
+        # Hand the fill to the worker so the read loop goes straight back to draining frames
+        fill_data = data.get("msg", {})
+        executor = self._fill_executor
+        if executor is not None:
+            executor.submit(self._handle_fill, fill_data)
+        else:
+            self._handle_fill(fill_data)
+
+    def _on_error(self, data: Dict):
+        msg = data.get("msg", {})
+        self.logger.error(f"WebSocket error {msg.get('code')}: {msg.get('msg')}")
+
+    def _on_unknown(self, data: Dict):
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Received message type: {data.get('type')}")
     
     def _handle_fill(self, fill_data: Dict):
         """Handle a fill notification"""
@@ -674,12 +1077,18 @@ class WebSocketFillTracker:
             timestamp = fill_data.get("ts")
             post_position = fill_data.get("post_position")
             
-            self.logger.info(
-                f"FILL: {market_ticker} | {action.upper()} {count} @ ${yes_price_dollars} "
-                f"(price={yes_price}) | Side: {side} | Taker: {is_taker} | "
-                f"Post-position: {post_position} | Order: {order_id} | Trade: {trade_id}"
-            )
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(
+                    f"FILL: {market_ticker} | {action.upper()} {count} @ ${yes_price_dollars} "
+                    f"(price={yes_price}) | Side: {side} | Taker: {is_taker} | "
+                    f"Post-position: {post_position} | Order: {order_id} | Trade: {trade_id}"
+                )
             
+            # Our inventory just changed; don't serve the pre-fill positions snapshot
+            api = getattr(self.bot, 'api', None)
+            if api is not None and hasattr(api, 'invalidate_positions'):
+                api.invalidate_positions()
+
             # Record fill in metrics if available
             if self.metrics_tracker:
                 self.metrics_tracker.record_fill(
@@ -716,37 +1125,31 @@ class WebSocketFillTracker:
                 
                 # Update fill history for throttle tracking
                 if hasattr(self.bot, '_fills_hist'):
+                    # Bounded deque on the bot; append evicts the oldest entry
                     self.bot._fills_hist.append(current_time)
-                    # Cap list size to prevent unbounded growth
-                    self.bot._fills_hist = self.bot._fills_hist[-2000:]
                 
                 # Enqueue markout checks for short and long term
-                if hasattr(self.bot, '_markout_checks'):
-                    self.bot._markout_checks.append({
-                        "ticker": market_ticker,
-                        "side": side,            # 'yes' or 'no'
-                        "action": action,        # 'buy' or 'sell'
-                        "price": float(yes_price_dollars),   # dollars
-                        "count": count,          # number of contracts
-                        "t_entry": current_time,
-                        "t_check": [current_time + self.bot.mo_short, current_time + self.bot.mo_long],
-                        "checked": [False, False],
-                    })
-                    # Cap list size to prevent unbounded growth
-                    self.bot._markout_checks = self.bot._markout_checks[-2000:]
-                    
-                    self.logger.debug(
-                        f"Enqueued markout checks for {market_ticker} {action} {side} @ ${yes_price_dollars:.4f} "
-                        f"(short={self.bot.mo_short}s, long={self.bot.mo_long}s)"
+                if hasattr(self.bot, '_enqueue_markout_checks'):
+                    self.bot._enqueue_markout_checks(
+                        market_ticker, side, action, float(yes_price_dollars), count, current_time
                     )
+                    
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug(
+                            f"Enqueued markout checks for {market_ticker} {action} {side} @ ${float(yes_price_dollars):.4f} "
+                            f"(short={self.bot.mo_short}s, long={self.bot.mo_long}s)"
+                        )
                 
         except Exception as e:
             self.logger.error(f"Error handling fill: {e}")
     
     async def _handle_reconnect(self):
         """Handle reconnection with exponential backoff"""
-        self.logger.info(f"Reconnecting in {self.reconnect_delay:.1f} seconds...")
-        await asyncio.sleep(self.reconnect_delay)
+        # +/-25% jitter so bots dropped together don't reconnect in lockstep
+        delay = self.reconnect_delay * random.uniform(0.75, 1.25)
+        self.logger.info(f"Reconnecting in {delay:.1f} seconds...")
+        if await _sleep_unless_stopped(self.stop_event, delay):
+            return
         
         # Exponential backoff
         self.reconnect_delay = min(self.reconnect_delay * 2, self.max_reconnect_delay)
@@ -759,20 +1162,21 @@ class WebSocketFillTracker:
         
         self.is_running = True
         self.stop_event.clear()
+        self._fill_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='fill-handler')
         
-        def run_async_loop():
-            """Run the asyncio event loop in a separate thread"""
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                loop.run_until_complete(self._connect_and_listen())
-            finally:
-                loop.close()
-        
-        self.ws_thread = threading.Thread(target=run_async_loop, daemon=True)
-        self.ws_thread.start()
+        self._ws_future = asyncio.run_coroutine_threadsafe(self._connect_and_listen(), _get_net_loop())
         self.logger.info("WebSocket fill tracker started")
     
+    def _cancel_listener(self, timeout: float = 5.0):
+        """Wait briefly for the listener to finish on the shared loop, then cancel it"""
+        future, self._ws_future = self._ws_future, None
+        if future is None or future.done():
+            return
+        try:
+            future.result(timeout=timeout)
+        except Exception:
+            future.cancel()
+
     def stop(self):
         """Stop the WebSocket connection"""
         if not self.is_running:
@@ -782,9 +1186,13 @@ class WebSocketFillTracker:
         self.stop_event.set()
         self.is_running = False
         
-        # Wait for thread to finish (with timeout)
-        if self.ws_thread and self.ws_thread.is_alive():
-            self.ws_thread.join(timeout=5.0)
+        # Give the listener a moment to exit on its own, then cancel it
+        self._cancel_listener()
+
+        # Let fills already received finish processing
+        if self._fill_executor is not None:
+            self._fill_executor.shutdown(wait=True)
+            self._fill_executor = None
         
         self.logger.info("WebSocket fill tracker stopped")
 
@@ -806,7 +1214,9 @@ class WebSocketOrderbookTracker:
         self.stop_event = stop_event or threading.Event()
         self.cooldown_ms = cooldown_ms
         self.ws = None
-        self.ws_thread = None
+        self._ws_future = None
+        # Bot callbacks make blocking REST calls; run them off the shared network loop
+        self._update_executor: Optional[ThreadPoolExecutor] = None
         self.message_id = 1
         self.is_running = False
         self.reconnect_delay = 1.0  # Start with 1 second
@@ -821,6 +1231,14 @@ class WebSocketOrderbookTracker:
         
         # Track orderbook state (best bid/ask only)
         self.orderbooks = {}  # ticker -> {'best_bid': price, 'best_ask': price}
+
+        # msg_type -> handler(data); unknown types fall through to _on_unknown
+        self._msg_handlers = {
+            "subscribed": self._on_subscribed,
+            "orderbook_snapshot": self._on_snapshot_msg,
+            "orderbook_delta": self._on_delta_msg,
+            "error": self._on_error,
+        }
         
     def _create_auth_headers(self) -> Dict[str, str]:
         """Create authentication headers for WebSocket connection"""
@@ -832,25 +1250,15 @@ class WebSocketOrderbookTracker:
             return {}
         
         try:
-            # Load the private key
-            with open(private_key_path, "rb") as f:
-                private_key = serialization.load_pem_private_key(f.read(), password=None)
+            private_key = _load_private_key(private_key_path)
             
-            # Create signature
-            timestamp = str(int(time.time() * 1000))
+            # Create signature (fresh per connection; the timestamp is part of the message)
+            timestamp = str(time.time_ns() // 1_000_000)
             method = "GET"
             path = "/trade-api/ws/v2"
             message = f"{timestamp}{method}{path}".encode('utf-8')
             
-            signature_bytes = private_key.sign(
-                message,
-                padding.PSS(
-                    mgf=padding.MGF1(hashes.SHA256()),
-                    salt_length=padding.PSS.DIGEST_LENGTH
-                ),
-                hashes.SHA256()
-            )
-            signature = base64.b64encode(signature_bytes).decode('utf-8')
+            signature = _sign_message(private_key, message)
             
             return {
                 'KALSHI-ACCESS-KEY': api_key_id,
@@ -871,7 +1279,7 @@ class WebSocketOrderbookTracker:
                 auth_headers = self._create_auth_headers()
                 if not auth_headers:
                     self.logger.error("Failed to create auth headers, waiting before retry...")
-                    await asyncio.sleep(self.reconnect_delay)
+                    await _sleep_unless_stopped(self.stop_event, self.reconnect_delay)
                     continue
                 
                 # Connect to WebSocket
@@ -915,68 +1323,51 @@ class WebSocketOrderbookTracker:
     
     async def _subscribe_to_ticker(self, websocket, ticker: str):
         """Subscribe to orderbook updates for a specific ticker"""
-        subscription = {
-            "id": self.message_id,
-            "cmd": "subscribe",
-            "params": {
-                "channels": ["orderbook_delta"],
-                "market_tickers": [ticker]
-            }
-        }
-        await websocket.send(json.dumps(subscription))
+        await websocket.send(_ORDERBOOK_CMD_TEMPLATE % (self.message_id, "subscribe", json.dumps(ticker)))
         self.message_id += 1
         self.logger.info(f"Subscribed to orderbook updates for {ticker}")
     
     async def _unsubscribe_from_ticker(self, websocket, ticker: str):
         """Unsubscribe from orderbook updates for a specific ticker"""
-        unsubscription = {
-            "id": self.message_id,
-            "cmd": "unsubscribe",
-            "params": {
-                "channels": ["orderbook_delta"],
-                "market_tickers": [ticker]
-            }
-        }
-        await websocket.send(json.dumps(unsubscription))
+        await websocket.send(_ORDERBOOK_CMD_TEMPLATE % (self.message_id, "unsubscribe", json.dumps(ticker)))
         self.message_id += 1
         self.logger.info(f"Unsubscribed from orderbook updates for {ticker}")
     
     async def _process_message(self, message: str):
         """Process incoming WebSocket messages"""
         try:
-            data = json.loads(message)
-            msg_type = data.get("type")
-            
-            if msg_type == "subscribed":
-                self.logger.info(f"Orderbook subscription confirmed: {data}")
-                
-            elif msg_type == "orderbook_snapshot":
-                # Process full orderbook snapshot
-                msg_data = data.get("msg", {})
-                self._handle_orderbook_snapshot(msg_data)
-                
-            elif msg_type == "orderbook_delta":
-                # Process orderbook delta (incremental update)
-                msg_data = data.get("msg", {})
-                self._handle_orderbook_delta(msg_data)
-                
-            elif msg_type == "error":
-                error_code = data.get("msg", {}).get("code")
-                error_msg = data.get("msg", {}).get("msg")
-                self.logger.error(f"Orderbook WebSocket error {error_code}: {error_msg}")
-                
-            else:
-                self.logger.debug(f"Received orderbook message type: {msg_type}")
-                
+            data = _json_loads(message)
+            self._msg_handlers.get(data.get("type"), self._on_unknown)(data)
         except json.JSONDecodeError as e:
             self.logger.error(f"Failed to parse orderbook WebSocket message: {e}")
         except Exception as e:
             self.logger.error(f"Error processing orderbook WebSocket message: {e}")
+
+    def _on_subscribed(self, data: Dict):
+        self.logger.info(f"Orderbook subscription confirmed: {data}")
+
+    def _on_snapshot_msg(self, data: Dict):
+        # Process full orderbook snapshot
+        self._handle_orderbook_snapshot(data.get("msg", {}))
+
+    def _on_delta_msg(self, data: Dict):
+        # Process orderbook delta (incremental update)
+        self._handle_orderbook_delta(data.get("msg", {}))
+
+    def _on_error(self, data: Dict):
+        msg = data.get("msg", {})
+        self.logger.error(f"Orderbook WebSocket error {msg.get('code')}: {msg.get('msg')}")
+
+    def _on_unknown(self, data: Dict):
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Received orderbook message type: {data.get('type')}")
     
     def _handle_orderbook_snapshot(self, msg_data: Dict):
         """Handle a full orderbook snapshot"""
         try:
-            self.logger.info(f"Orderbook snapshot: {msg_data}")
+            # The full snapshot repr is large; only build it when INFO is actually emitted
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(f"Orderbook snapshot: {msg_data}")
             ticker = msg_data.get("market_ticker")
             if not ticker:
                 return
@@ -1008,7 +1399,12 @@ class WebSocketOrderbookTracker:
                 'best_ask': best_ask
             }
             
-            self.logger.debug(f"Orderbook snapshot for {ticker}: bid={best_bid}, ask={best_ask}")
+            # A fresh snapshot invalidates cached risk scores for this market
+            if self.bot and hasattr(self.bot, 'invalidate_risk_cache'):
+                self.bot.invalidate_risk_cache(ticker)
+            
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"Orderbook snapshot for {ticker}: bid={best_bid}, ask={best_ask}")
             
             # Trigger callback if both bid and ask are available
             if best_bid is not None and best_ask is not None:
@@ -1062,15 +1458,26 @@ class WebSocketOrderbookTracker:
     def _trigger_update_callback(self, ticker: str, best_bid: float, best_ask: float):
         """Trigger the bot's callback for orderbook updates"""
         if self.bot and hasattr(self.bot, '_handle_orderbook_update'):
-            try:
-                self.bot._handle_orderbook_update(ticker, best_bid, best_ask)
-            except Exception as e:
-                self.logger.error(f"Error in bot._handle_orderbook_update for {ticker}: {e}")
+            # Hand off to the worker so neither tracker's read loop waits on REST calls
+            executor = self._update_executor
+            if executor is not None:
+                executor.submit(self._run_update_callback, ticker, best_bid, best_ask)
+            else:
+                self._run_update_callback(ticker, best_bid, best_ask)
+
+    def _run_update_callback(self, ticker: str, best_bid: float, best_ask: float):
+        try:
+            self.bot._handle_orderbook_update(ticker, best_bid, best_ask)
+        except Exception as e:
+            self.logger.error(f"Error in bot._handle_orderbook_update for {ticker}: {e}")
     
     async def _handle_reconnect(self):
         """Handle reconnection with exponential backoff"""
-        self.logger.info(f"Reconnecting orderbook WebSocket in {self.reconnect_delay:.1f} seconds...")
-        await asyncio.sleep(self.reconnect_delay)
+        # +/-25% jitter so bots dropped together don't reconnect in lockstep
+        delay = self.reconnect_delay * random.uniform(0.75, 1.25)
+        self.logger.info(f"Reconnecting orderbook WebSocket in {delay:.1f} seconds...")
+        if await _sleep_unless_stopped(self.stop_event, delay):
+            return
         
         # Exponential backoff
         self.reconnect_delay = min(self.reconnect_delay * 2, self.max_reconnect_delay)
@@ -1144,21 +1551,22 @@ class WebSocketOrderbookTracker:
         
         self.is_running = True
         self.stop_event.clear()
+        self._update_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='orderbook-update')
         
-        def run_async_loop():
-            """Run the asyncio event loop in a separate thread"""
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            self._event_loop = loop  # Store for later use
-            try:
-                loop.run_until_complete(self._connect_and_listen())
-            finally:
-                loop.close()
-        
-        self.ws_thread = threading.Thread(target=run_async_loop, daemon=True)
-        self.ws_thread.start()
+        self._event_loop = _get_net_loop()  # Store for later use
+        self._ws_future = asyncio.run_coroutine_threadsafe(self._connect_and_listen(), self._event_loop)
         self.logger.info("Orderbook WebSocket tracker started")
     
+    def _cancel_listener(self, timeout: float = 5.0):
+        """Wait briefly for the listener to finish on the shared loop, then cancel it"""
+        future, self._ws_future = self._ws_future, None
+        if future is None or future.done():
+            return
+        try:
+            future.result(timeout=timeout)
+        except Exception:
+            future.cancel()
+
     def stop(self):
         """Stop the WebSocket connection"""
         if not self.is_running:
@@ -1168,9 +1576,13 @@ class WebSocketOrderbookTracker:
         self.stop_event.set()
         self.is_running = False
         
-        # Wait for thread to finish (with timeout)
-        if self.ws_thread and self.ws_thread.is_alive():
-            self.ws_thread.join(timeout=5.0)
+        # Give the listener a moment to exit on its own, then cancel it
+        self._cancel_listener()
+
+        # Let updates already handed off finish
+        if self._update_executor is not None:
+            self._update_executor.shutdown(wait=True)
+            self._update_executor = None
         
         self.logger.info("Orderbook WebSocket tracker stopped")
 
@@ -1200,6 +1612,244 @@ class AbstractTradingAPI(abc.ABC):
     def get_orders(self, ticker: str) -> List[Dict]:
         pass
 
+def _to_float(x) -> Optional[float]:
+    """float(x), or None when x is not numeric; plain numbers skip the exception path"""
+    if isinstance(x, float):
+        return x
+    if isinstance(x, int):
+        return float(x)
+    if x is None:
+        return None
+    try:
+        return float(x)
+    except (TypeError, ValueError):
+        return None
+
+def _to_int(x) -> Optional[int]:
+    """int(x) (truncating floats), or None when x is not a finite number"""
+    if isinstance(x, int):
+        return int(x)
+    if isinstance(x, float):
+        return int(x) if math.isfinite(x) else None
+    if x is None:
+        return None
+    try:
+        return int(x)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+def _norm_level_pair(level) -> Optional[Tuple[float, int]]:
+    # Shape A: pair-like [price_cents, count]
+    if len(level) < 2:
+        return None
+    price_c = _to_float(level[0])
+    count = _to_int(level[1])
+    if price_c is None or count is None:
+        return None
+    return (_cents_to_dollars(price_c), count)
+
+def _norm_level_dollars(price, count) -> Optional[Tuple[float, int]]:
+    # price may be integer cents (1..99) or already dollars
+    price_f = _to_float(price)
+    count_i = _to_int(count)
+    if price_f is None or count_i is None:
+        return None
+    return (_cents_to_dollars(price_f) if price_f > 1.0 else round(price_f, 2), count_i)
+
+def _norm_level_dict(level) -> Optional[Tuple[float, int]]:
+    # Shape B: dict with price/count
+    return _norm_level_dollars(level.get("price"), level.get("count"))
+
+def _norm_level_attr(level) -> Optional[Tuple[float, int]]:
+    # Shape C: SDK model with attributes
+    return _norm_level_dollars(getattr(level, "price", None), getattr(level, "count", None))
+
+def _order_price(val) -> Optional[float]:
+    # Order prices may be integer cents (1..99) or already dollars
+    f = _to_float(val)
+    if f is None:
+        return None
+    return _cents_to_dollars(f) if f > 1.0 else round(f, 2)
+
+def _int_or(val, default: int) -> int:
+    v = _to_int(val)
+    return default if v is None else v
+
+def _order_source(item) -> Dict:
+    """Order record as a dict; SDK models are converted via to_dict/model_dump"""
+    if isinstance(item, dict):
+        return item
+    src: Dict = {}
+    to_dict_fn = getattr(item, "to_dict", None)
+    if callable(to_dict_fn):
+        try:
+            src = to_dict_fn() or {}
+        except Exception:
+            src = {}
+    if not src:
+        model_dump_fn = getattr(item, "model_dump", None)
+        if callable(model_dump_fn):
+            try:
+                src = model_dump_fn(by_alias=True, exclude_none=True) or {}
+            except Exception:
+                src = {}
+    return src
+
+def _order_sources(raw_orders) -> List[Dict]:
+    """Convert a list of order records to dicts, choosing the converter once.
+
+    Responses are homogeneous, so to_dict/model_dump are probed on the first
+    record only; anything the chosen converter can't handle takes the full
+    _order_source cascade.
+    """
+    if not raw_orders:
+        return []
+    first = raw_orders[0]
+    if isinstance(first, dict):
+        return [item if isinstance(item, dict) else _order_source(item) for item in raw_orders]
+    if callable(getattr(first, "to_dict", None)):
+        extract = lambda item: item.to_dict()
+    elif callable(getattr(first, "model_dump", None)):
+        extract = lambda item: item.model_dump(by_alias=True, exclude_none=True)
+    else:
+        return [_order_source(item) for item in raw_orders]
+    sources: List[Dict] = []
+    for item in raw_orders:
+        try:
+            src = extract(item)
+        except Exception:
+            src = None
+        sources.append(src if src and isinstance(src, dict) else _order_source(item))
+    return sources
+
+def _normalize_order(src: Dict, default_ticker: Optional[str] = None) -> Dict:
+    """Map one order record onto the schema get_orders/get_all_orders return"""
+    get = src.get
+    count_val = _int_or(get("count"), 0)
+    remaining_val = _int_or(get("remaining_count"), 0)
+    initial_val = get("initial_count")
+    initial_val = _int_or(initial_val if initial_val is not None else count_val, 0)
+    filled_default = max(0, initial_val - remaining_val)
+    fill_count_val = get("fill_count")
+    fill_count_val = filled_default if fill_count_val is None else _int_or(fill_count_val, filled_default)
+    # Integer cents are the normal wire format: table lookup, no float/round work
+    yes_px = get("yes_price")
+    yes_px = _C2D[yes_px] if type(yes_px) is int and 1 < yes_px <= 100 else _order_price(yes_px)
+    no_px = get("no_price")
+    no_px = _C2D[no_px] if type(no_px) is int and 1 < no_px <= 100 else _order_price(no_px)
+    return {
+        "order_id": get("order_id"),
+        "client_order_id": get("client_order_id"),
+        "ticker": get("ticker", default_ticker),
+        "side": get("side"),
+        "action": get("action"),
+        "type": get("type"),
+        "status": get("status"),
+        "yes_price": yes_px,
+        "no_price": no_px,
+        "count": count_val,
+        "fill_count": fill_count_val,
+        "remaining_count": remaining_val,
+        "initial_count": initial_val,
+        "taker_fees": _int_or(get("taker_fees"), 0),
+        "maker_fees": _int_or(get("maker_fees"), 0),
+        "expiration_time": get("expiration_time"),
+        "created_time": get("created_time"),
+        "updated_time": get("updated_time"),
+    }
+
+def _normalize_orderbook_side(side_val) -> List[Tuple[float, int]]:
+    """Convert one orderbook side to [(price, count)].
+
+    Every level in a payload has the same shape, so the converter is picked once
+    from the first level instead of re-probing types per level.
+    """
+    if not side_val:
+        return []
+    first = side_val[0]
+    if isinstance(first, (list, tuple)):
+        fn = _norm_level_pair
+    elif isinstance(first, dict):
+        fn = _norm_level_dict
+    else:
+        fn = _norm_level_attr
+    return [pc for pc in map(fn, side_val) if pc is not None]
+
+
+def _write_json_in_background(path: str, obj, logger: logging.Logger, what: str) -> None:
+    """Serialize and write an inspection dump on a daemon thread so callers return immediately.
+
+    Writes go to a per-thread temp file and are renamed into place, so overlapping
+    dumps of the same path never interleave. Lists are streamed one element at a
+    time so a large dump never exists as a second full copy in memory.
+    """
+    def _write():
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                if isinstance(obj, list):
+                    f.write(b"[")
+                    sep = b"\n"
+                    for item in obj:
+                        f.write(sep)
+                        f.write(_dumps_pretty(item))
+                        sep = b",\n"
+                    f.write(b"\n]" if obj else b"]")
+                else:
+                    f.write(_dumps_pretty(obj))
+            os.replace(tmp_path, path)
+            logger.info(f"Wrote {what} to {path}")
+        except Exception as write_error:
+            logger.error(f"Failed to write {path}: {write_error}")
+
+    threading.Thread(target=_write, name=f"dump:{path}", daemon=True).start()
+
+
+# Host and path for the signed (API-key) portfolio endpoints
+_SIGNED_BASE_URL = "https://api.elections.kalshi.com"
+_POSITIONS_PATH = "/trade-api/v2/portfolio/positions"
+# Largest page the positions endpoint accepts; snapshots follow the cursor past it
+_POSITIONS_PAGE_LIMIT = 1000
+
+# REST tuning defaults. Each can be overridden by the env var named next to it; the
+# overrides are read in KalshiTradingAPI.__init__ (after the runner's load_dotenv()),
+# not at import, and malformed values fall back to the default with a warning.
+
+# How long one positions snapshot serves get_position/get_all_positions (KALSHI_POSITIONS_TTL_S)
+POSITIONS_CACHE_TTL_S = 0.25
+
+# Large paginated listings are requested compressed
+_GZIP_HEADERS = {"Accept-Encoding": "gzip"}
+
+# Requested page size for /incentive_programs; the server may serve fewer per page,
+# the effective count is logged with the page total (KALSHI_LIQ_PAGE_LIMIT)
+LIQ_PROGRAMS_PAGE_LIMIT = 100000
+
+# Max concurrent REST calls when fanning out per-market fetches (KALSHI_REST_FANOUT_WORKERS)
+REST_FANOUT_WORKERS = 8
+
+# True sends a random UUID4 per order instead of the session prefix + counter (KALSHI_UUID_ORDER_IDS=1)
+UUID_CLIENT_ORDER_IDS = False
+
+# Max order ids per batch-cancel request (KALSHI_BATCH_CANCEL_MAX)
+BATCH_CANCEL_MAX = 20
+
+
+def _env_number(name: str, default, cast, logger: logging.Logger, allow_zero: bool = False):
+    """cast(os.environ[name]) if set and positive (or zero), else default (warning on a malformed value)"""
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        value = cast(raw)
+    except ValueError:
+        value = None
+    if value is None or value < 0 or (value == 0 and not allow_zero):
+        logger.warning(f"Ignoring invalid {name}={raw!r}; using {default}")
+        return default
+    return value
+
+
 class KalshiTradingAPI(AbstractTradingAPI):
     def __init__(
         self,
@@ -1214,6 +1864,40 @@ class KalshiTradingAPI(AbstractTradingAPI):
         self.member_id = None
         self.logger = logger
         self.base_url = base_url
+        # Env overrides are read here, once .env has been loaded, rather than at import
+        self._rest_fanout_workers = _env_number("KALSHI_REST_FANOUT_WORKERS", REST_FANOUT_WORKERS, int, logger)
+        self._liq_page_limit = _env_number("KALSHI_LIQ_PAGE_LIMIT", LIQ_PROGRAMS_PAGE_LIMIT, int, logger)
+        self._batch_cancel_max = _env_number("KALSHI_BATCH_CANCEL_MAX", BATCH_CANCEL_MAX, int, logger)
+        self._uuid_client_order_ids = os.getenv("KALSHI_UUID_ORDER_IDS", "1" if UUID_CLIENT_ORDER_IDS else "0") == "1"
+        # Shared keep-alive pool for every direct REST call; retries stay with the callers.
+        # Sized so every fan-out worker keeps its own warm connection per host.
+        self._http = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16, pool_maxsize=max(64, self._rest_fanout_workers), max_retries=Retry(total=0)
+        )
+        self._http.mount("https://", adapter)
+        # Short-lived snapshot of /portfolio/positions shared by every per-ticker lookup
+        self._positions_cache: Optional[Dict[str, int]] = None
+        self._positions_cache_ts = 0.0
+        self._positions_gen = 0  # bumped by invalidate_positions; fetches started before a bump aren't cached
+        self._positions_ttl = _env_number(
+            "KALSHI_POSITIONS_TTL_S", POSITIONS_CACHE_TTL_S, float, logger, allow_zero=True
+        )
+        self._positions_lock = threading.Lock()
+        # Worker pool for fanning out independent REST calls; created on first use
+        self._rest_pool: Optional[ThreadPoolExecutor] = None
+        self._rest_pool_lock = threading.Lock()
+        # client_order_id only has to be unique: random per-session prefix + counter
+        self._coid_prefix = uuid.uuid4().hex[:12]
+        self._coid_seq = itertools.count()
+        # Credentials for the signed REST endpoints never change within a session
+        self._api_key_id = os.getenv("KALSHI_API_KEY_ID")
+        self._private_key_path = os.getenv("KALSHI_PRIVATE_KEY_PATH")
+        self._sig_base_url = _SIGNED_BASE_URL
+        self._sig_headers_template: Optional[Dict[str, str]] = (
+            {'KALSHI-ACCESS-KEY': self._api_key_id}
+            if self._api_key_id and self._private_key_path else None
+        )
         self.login()
 
     def login(self):
@@ -1237,6 +1921,10 @@ class KalshiTradingAPI(AbstractTradingAPI):
             self.client.logout()
             self.client = None
             self.logger.info("Successfully logged out")
+        if self._rest_pool is not None:
+            self._rest_pool.shutdown(wait=False)
+            self._rest_pool = None
+        self._http.close()
 
     def get_headers(self):
         return {
@@ -1244,17 +1932,7 @@ class KalshiTradingAPI(AbstractTradingAPI):
             "Content-Type": "application/json",
         }
 
-    def _parse_date_to_timestamp(self, date_str: str) -> Optional[float]:
-        """Parse ISO date string to Unix timestamp (seconds since epoch)"""
-        if not date_str:
-            return None
-        try:
-            # Handle 'Z' timezone by converting to '+00:00' for compatibility
-            date_clean = date_str.replace('Z', '+00:00')
-            dt = datetime.fromisoformat(date_clean)
-            return dt.timestamp()
-        except (ValueError, AttributeError):
-            return None
+    _parse_date_to_timestamp = staticmethod(_parse_date_to_timestamp)
 
     def make_request(
         self, method: str, path: str, params: Dict = None, data: Dict = None
@@ -1263,218 +1941,153 @@ class KalshiTradingAPI(AbstractTradingAPI):
         headers = self.get_headers()
 
         try:
-            response = requests.request(
+            response = self._http.request(
                 method, url, headers=headers, params=params, json=data
             )
-            self.logger.debug(f"Request URL: {response.url}")
-            self.logger.debug(f"Request headers: {response.request.headers}")
-            self.logger.debug(f"Request params: {params}")
-            self.logger.debug(f"Request data: {data}")
-            self.logger.debug(f"Response status code: {response.status_code}")
-            self.logger.debug(f"Response content: {response.text}")
+            # Guarded: response.text decodes the whole body just to log it
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"Request URL: {response.url}")
+                self.logger.debug(f"Request headers: {response.request.headers}")
+                self.logger.debug(f"Request params: {params}")
+                self.logger.debug(f"Request data: {data}")
+                self.logger.debug(f"Response status code: {response.status_code}")
+                self.logger.debug(f"Response content: {response.text}")
             response.raise_for_status()
-            return response.json()
+            return _json_loads(response.content)
         except requests.exceptions.RequestException as e:
             self.logger.error(f"Request failed: {e}")
             if hasattr(e, "response") and e.response is not None:
                 self.logger.error(f"Response content: {e.response.text}")
             raise
 
-    def get_position(self, ticker: str) -> int:
-        try:
-            api_key_id = os.getenv("KALSHI_API_KEY_ID")
-            private_key_path = os.getenv("KALSHI_PRIVATE_KEY_PATH")
-            base_url = "https://api.elections.kalshi.com"
-
-            if not api_key_id or not private_key_path:
-                self.logger.error("Missing KALSHI_API_KEY_ID or KALSHI_PRIVATE_KEY_PATH")
-                return 0
-
-            # Load the private key from file (PEM)
-            with open(private_key_path, "rb") as f:
-                private_key = serialization.load_pem_private_key(f.read(), password=None)
-
-            def create_signature(private_key_obj, timestamp, method, path):
-                # Strip query parameters before signing
-                path_without_query = path.split('?')[0]
-                message = f"{timestamp}{method}{path_without_query}".encode('utf-8')
-                signature_bytes = private_key_obj.sign(
-                    message,
-                    padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH),
-                    hashes.SHA256()
-                )
-                return base64.b64encode(signature_bytes).decode('utf-8')
-
-            timestamp = str(int(datetime.now().timestamp() * 1000))
-            method = "GET"
-            path = "/trade-api/v2/portfolio/positions"
-
-            signature = create_signature(private_key, timestamp, method, path)
-
-            headers = {
-                'KALSHI-ACCESS-KEY': api_key_id,
-                'KALSHI-ACCESS-SIGNATURE': signature,
-                'KALSHI-ACCESS-TIMESTAMP': timestamp
-            }
-
-            # Pass ticker as a query parameter; do NOT include it in the signature
-            params = {"ticker": ticker} if ticker else None
-            response = requests.get(base_url + path, headers=headers, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json() or {}
-
-            # Normalize market_positions into a list of dict-like records
-            market_positions = None
-            if isinstance(data, dict):
-                market_positions = data.get('market_positions')
-            if market_positions is None:
-                market_positions = getattr(data, 'market_positions', None)
-
-            # Coerce to list
-            if market_positions is None:
-                market_positions_list = []
-            elif isinstance(market_positions, list):
-                market_positions_list = market_positions
-            elif isinstance(market_positions, dict):
-                market_positions_list = [market_positions]
-            else:
-                # Attempt model -> dict
-                to_dict_fn = getattr(market_positions, 'to_dict', None)
-                if callable(to_dict_fn):
-                    try:
-                        as_dict = to_dict_fn() or {}
-                        inner = as_dict.get('market_positions')
-                        if isinstance(inner, list):
-                            market_positions_list = inner
-                        elif isinstance(inner, dict):
-                            market_positions_list = [inner]
-                        else:
-                            market_positions_list = []
-                    except Exception:
-                        market_positions_list = []
-                else:
-                    market_positions_list = []
+    def _signed_get(self, path: str, params: Dict = None) -> Optional[requests.Response]:
+        """GET an authenticated REST path with a fresh RSA-PSS signature.
 
-            # Find the matching ticker and return its integer position
-            for item in market_positions_list:
-                if isinstance(item, dict):
-                    tkr = item.get('ticker')
-                    if tkr == ticker:
-                        try:
-                            return int(item.get('position', 0))
-                        except Exception:
-                            return 0
-                else:
-                    tkr = getattr(item, 'ticker', None)
-                    if tkr == ticker:
-                        try:
-                            return int(getattr(item, 'position', 0))
-                        except Exception:
-                            return 0
+        Returns None (after logging) when the API key env vars are missing; raises on
+        HTTP errors like requests does.
+        """
+        if self._sig_headers_template is None:
+            self.logger.error("Missing KALSHI_API_KEY_ID or KALSHI_PRIVATE_KEY_PATH")
+            return None
 
-            # If not found, default to 0
-            return 0
-                    
-        except Exception as e:
-            self.logger.error(f"Failed to get positions: {e}")
+        private_key = _load_private_key(self._private_key_path)
+        timestamp = str(time.time_ns() // 1_000_000)
+        # Query parameters are never part of the signed message
+        message = f"{timestamp}GET{path.split('?')[0]}".encode('utf-8')
+        headers = {
+            **self._sig_headers_template,
+            'KALSHI-ACCESS-SIGNATURE': _sign_message(private_key, message),
+            'KALSHI-ACCESS-TIMESTAMP': timestamp
+        }
+        response = self._http.get(self._sig_base_url + path, headers=headers, params=params, timeout=10)
+        response.raise_for_status()
+        return response
+
+    @staticmethod
+    def _market_positions_list(data) -> List:
+        """Normalize a positions response into a list of dict-like records"""
+        market_positions = None
+        if isinstance(data, dict):
+            market_positions = data.get('market_positions')
+        if market_positions is None:
+            market_positions = getattr(data, 'market_positions', None)
+
+        # Coerce to list
+        if market_positions is None:
+            return []
+        if isinstance(market_positions, list):
+            return market_positions
+        if isinstance(market_positions, dict):
+            return [market_positions]
+        # Attempt model -> dict
+        to_dict_fn = getattr(market_positions, 'to_dict', None)
+        if callable(to_dict_fn):
             try:
-                self.logger.error(getattr(getattr(e, 'response', None), 'text', ''))
+                as_dict = to_dict_fn() or {}
+                inner = as_dict.get('market_positions')
+                if isinstance(inner, list):
+                    return inner
+                if isinstance(inner, dict):
+                    return [inner]
             except Exception:
                 pass
-            return 0
-
-    def get_all_positions(self) -> Dict[str, int]:
-        """Get all positions across all tickers. Returns a dict mapping ticker -> position."""
-        try:
-            api_key_id = os.getenv("KALSHI_API_KEY_ID")
-            private_key_path = os.getenv("KALSHI_PRIVATE_KEY_PATH")
-            base_url = "https://api.elections.kalshi.com"
-
-            if not api_key_id or not private_key_path:
-                self.logger.error("Missing KALSHI_API_KEY_ID or KALSHI_PRIVATE_KEY_PATH")
-                return {}
-
-            # Load the private key from file (PEM)
-            with open(private_key_path, "rb") as f:
-                private_key = serialization.load_pem_private_key(f.read(), password=None)
-
-            def create_signature(private_key_obj, timestamp, method, path):
-                # Strip query parameters before signing
-                path_without_query = path.split('?')[0]
-                message = f"{timestamp}{method}{path_without_query}".encode('utf-8')
-                signature_bytes = private_key_obj.sign(
-                    message,
-                    padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=padding.PSS.DIGEST_LENGTH),
-                    hashes.SHA256()
-                )
-                return base64.b64encode(signature_bytes).decode('utf-8')
+        return []
 
-            timestamp = str(int(datetime.now().timestamp() * 1000))
-            method = "GET"
-            path = "/trade-api/v2/portfolio/positions"
+    @staticmethod
+    def _index_positions(items: List) -> Dict[str, int]:
+        """Build the ticker -> position dict in one pass; unparseable positions count as 0"""
+        positions_dict: Dict[str, int] = {}
+        for item in items:
+            if isinstance(item, dict):
+                tkr = item.get('ticker')
+                pos = item.get('position', 0)
+            else:
+                tkr = getattr(item, 'ticker', None)
+                pos = getattr(item, 'position', 0)
+            if tkr:
+                pos_i = _to_int(pos)
+                positions_dict[tkr] = pos_i if pos_i is not None else 0
+        return positions_dict
 
-            signature = create_signature(private_key, timestamp, method, path)
+    def get_position(self, ticker: str) -> int:
+        # Serve tickers from one full (all pages) positions snapshot
+        return self.get_all_positions().get(ticker, 0)
 
-            headers = {
-                'KALSHI-ACCESS-KEY': api_key_id,
-                'KALSHI-ACCESS-SIGNATURE': signature,
-                'KALSHI-ACCESS-TIMESTAMP': timestamp
-            }
+    def invalidate_positions(self) -> None:
+        """Drop the cached positions snapshot (e.g. after a fill)"""
+        self._positions_gen += 1
+        self._positions_cache_ts = 0.0
 
-            # No ticker parameter - get all positions
-            response = requests.get(base_url + path, headers=headers, timeout=10)
-            response.raise_for_status()
-            data = response.json() or {}
-
-            # Normalize market_positions into a list of dict-like records
-            market_positions = None
-            if isinstance(data, dict):
-                market_positions = data.get('market_positions')
-            if market_positions is None:
-                market_positions = getattr(data, 'market_positions', None)
-
-            # Coerce to list
-            if market_positions is None:
-                market_positions_list = []
-            elif isinstance(market_positions, list):
-                market_positions_list = market_positions
-            elif isinstance(market_positions, dict):
-                market_positions_list = [market_positions]
-            else:
-                # Attempt model -> dict
-                to_dict_fn = getattr(market_positions, 'to_dict', None)
-                if callable(to_dict_fn):
-                    try:
-                        as_dict = to_dict_fn() or {}
-                        inner = as_dict.get('market_positions')
-                        if isinstance(inner, list):
-                            market_positions_list = inner
-                        elif isinstance(inner, dict):
-                            market_positions_list = [inner]
-                        else:
-                            market_positions_list = []
-                    except Exception:
-                        market_positions_list = []
-                else:
-                    market_positions_list = []
+    def get_all_positions(self) -> Dict[str, int]:
+        """Get all positions across all tickers. Returns a dict mapping ticker -> position.
 
-            # Build dict mapping ticker -> position
-            positions_dict = {}
-            for item in market_positions_list:
-                if isinstance(item, dict):
-                    tkr = item.get('ticker')
-                    pos = item.get('position', 0)
-                else:
-                    tkr = getattr(item, 'ticker', None)
-                    pos = getattr(item, 'position', 0)
-                
-                if tkr:
-                    try:
-                        positions_dict[tkr] = int(pos)
-                    except Exception:
-                        positions_dict[tkr] = 0
+        Results are reused for _positions_ttl seconds; concurrent callers share one fetch.
+        Failed fetches return {} and are not cached.
+        """
+        cached = self._positions_cache
+        if cached is not None and time.monotonic() - self._positions_cache_ts < self._positions_ttl:
+            return cached
+        with self._positions_lock:
+            # Another thread may have refreshed while we waited
+            cached = self._positions_cache
+            if cached is not None and time.monotonic() - self._positions_cache_ts < self._positions_ttl:
+                return cached
+            gen = self._positions_gen
+            fetched = self._fetch_all_positions()
+            if fetched is None:
+                return {}
+            if gen != self._positions_gen:
+                # Invalidated mid-fetch (a fill landed): the snapshot may predate it
+                return fetched
+            self._positions_cache = fetched
+            self._positions_cache_ts = time.monotonic()
+            return fetched
+
+    def _fetch_all_positions(self) -> Optional[Dict[str, int]]:
+        try:
+            # No ticker parameter - get all positions, following the cursor across pages
+            items: List = []
+            params = {"limit": _POSITIONS_PAGE_LIMIT}
+            cursor: Optional[str] = None
+            while True:
+                if cursor:
+                    params["cursor"] = cursor
+                response = self._signed_get(_POSITIONS_PATH, params=params)
+                if response is None:
+                    return None
+                data = _json_loads(response.content) or {}
+                page_items = self._market_positions_list(data)
+                items.extend(page_items)
+
+                next_cursor = data.get("cursor") if isinstance(data, dict) else None
+                if not next_cursor:
+                    break
+                if next_cursor == cursor or not page_items:
+                    self.logger.warning(f"Stopping positions pagination: no progress at cursor {cursor}")
+                    break
+                cursor = next_cursor
 
-            return positions_dict
+            return self._index_positions(items)
                     
         except Exception as e:
             self.logger.error(f"Failed to get all positions: {e}")
@@ -1482,15 +2095,16 @@ class KalshiTradingAPI(AbstractTradingAPI):
                 self.logger.error(getattr(getattr(e, 'response', None), 'text', ''))
             except Exception:
                 pass
-            return {}
+            return None
 
     def get_price(self, ticker: str) -> Dict[str, float]:
         api_response = self.client.get_market(ticker)
         market_obj = getattr(api_response, "market", None) or {}
-        yes_bid = float(market_obj.get("yes_bid") if isinstance(market_obj, dict) else getattr(market_obj, "yes_bid", 0)) / 100
-        yes_ask = float(market_obj.get("yes_ask") if isinstance(market_obj, dict) else getattr(market_obj, "yes_ask", 0)) / 100
-        no_bid = float(market_obj.get("no_bid") if isinstance(market_obj, dict) else getattr(market_obj, "no_bid", 0)) / 100
-        no_ask = float(market_obj.get("no_ask") if isinstance(market_obj, dict) else getattr(market_obj, "no_ask", 0)) / 100
+        get = market_obj.get if isinstance(market_obj, dict) else (lambda k: getattr(market_obj, k, 0))
+        yes_bid = _cents_to_dollars(get("yes_bid") or 0)
+        yes_ask = _cents_to_dollars(get("yes_ask") or 0)
+        no_bid = _cents_to_dollars(get("no_bid") or 0)
+        no_ask = _cents_to_dollars(get("no_ask") or 0)
         
         yes_mid_price = round((yes_bid + yes_ask) / 2, 2)
         no_mid_price = round((no_bid + no_ask) / 2, 2)
@@ -1513,74 +2127,30 @@ class KalshiTradingAPI(AbstractTradingAPI):
     def get_touch(self, ticker: str):
         m = self.client.get_market(ticker).market
         def g(obj, k, default=0):
-            return (obj[k] if isinstance(obj, dict) else getattr(obj, k, default)) / 100.0
-        yes_bid, yes_ask = g(m, "yes_bid"), g(m, "yes_ask")
-        no_bid,  no_ask  = g(m, "no_bid"),  g(m, "no_ask")
-        return {"yes": (to_tick(yes_bid) if yes_bid else 0.0,
-                        to_tick(yes_ask) if yes_ask else 0.0),
-                "no":  (to_tick(no_bid)  if no_bid  else 0.0,
-                        to_tick(no_ask)  if no_ask  else 0.0)}
+            c = obj[k] if isinstance(obj, dict) else getattr(obj, k, default)
+            t = _C2TICK.get(c)
+            if t is not None:
+                return t
+            return to_tick(c / 100.0) if c else 0.0
+        return {"yes": (g(m, "yes_bid"), g(m, "yes_ask")),
+                "no":  (g(m, "no_bid"),  g(m, "no_ask"))}
 
     def get_orderbook(self, market_ticker: str) -> Dict:
         # Normalize to dict: {"var_true": [(price, count), ...], "var_false": [(price, count), ...]}
         result: Dict = {"var_true": [], "var_false": []}
 
-        # Helper to convert a side list to [(price, count)] supporting multiple shapes
-        def normalize_side(side_val):
-            out = []
-            for level in (side_val or []):
-                price = None
-                count = None
-                # Shape A: pair-like [price_cents, count]
-                if isinstance(level, (list, tuple)) and len(level) >= 2:
-                    try:
-                        price_cents = float(level[0])
-                        count = int(level[1])
-                        price = price_cents / 100.0
-                    except Exception:
-                        price, count = None, None
-                # Shape B: dict with price/count (price may be cents or dollars)
-                elif isinstance(level, dict):
-                    price = level.get("price")
-                    count = level.get("count")
-                    try:
-                        # If price looks like integer cents (1..99), convert; if already dollars, keep
-                        if price is not None:
-                            price_f = float(price)
-                            price = price_f / 100.0 if price_f > 1.0 else price_f
-                        if count is not None:
-                            count = int(count)
-                    except Exception:
-                        price, count = None, None
-                # Shape C: SDK model with attributes
-                else:
-                    price = getattr(level, "price", None)
-                    count = getattr(level, "count", None)
-                    try:
-                        if price is not None:
-                            price_f = float(price)
-                            price = price_f / 100.0 if price_f > 1.0 else price_f
-                        if count is not None:
-                            count = int(count)
-                    except Exception:
-                        price, count = None, None
-
-                if price is None or count is None:
-                    continue
-                try:
-                    out.append((round(float(price), 2), int(count)))
-                except Exception:
-                    continue
-            return out
+        # Lists of levels -> [(price, count)]; see _normalize_orderbook_side
+        normalize_side = _normalize_orderbook_side
 
         # Prefer direct REST call (public endpoint); fall back to SDK on failure
         try:
             base = self.base_url or "https://api.elections.kalshi.com/trade-api/v2"
             url = f"{base.rstrip('/')}/markets/{market_ticker}/orderbook"
-            resp = requests.get(url, params={"depth": 100}, timeout=5)
-            self.logger.debug(f"GET {resp.url} -> {resp.status_code}")
+            resp = self._http.get(url, params={"depth": 100}, timeout=5)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"GET {resp.url} -> {resp.status_code}")
             resp.raise_for_status()
-            data = resp.json() or {}
+            data = _json_loads(resp.content) or {}
             ob = data.get("orderbook") or {}
             # Known public shape uses 'yes' and 'no'
             yes_side = ob.get("yes") or ob.get("var_true") or ob.get("true")
@@ -1617,6 +2187,35 @@ class KalshiTradingAPI(AbstractTradingAPI):
             self.logger.error(f"Failed to retrieve orderbook via SDK: {sdk_err}")
             return result
 
+    def _get_rest_pool(self) -> ThreadPoolExecutor:
+        if self._rest_pool is None:
+            with self._rest_pool_lock:
+                if self._rest_pool is None:
+                    self._rest_pool = ThreadPoolExecutor(
+                        max_workers=self._rest_fanout_workers, thread_name_prefix="kalshi-rest"
+                    )
+        return self._rest_pool
+
+    def get_orderbooks(self, market_tickers: List[str]) -> Dict[str, Dict]:
+        """Fetch several orderbooks concurrently; returns ticker -> normalized orderbook.
+
+        Each fetch is a plain get_orderbook() on the shared keep-alive session, so the
+        round trips overlap instead of running back to back.
+        """
+        tickers = list(dict.fromkeys(market_tickers))
+        if len(tickers) <= 1:
+            return {t: self.get_orderbook(t) for t in tickers}
+        pool = self._get_rest_pool()
+        futures = {t: pool.submit(self.get_orderbook, t) for t in tickers}
+        out: Dict[str, Dict] = {}
+        for t, fut in futures.items():
+            try:
+                out[t] = fut.result()
+            except Exception as e:
+                self.logger.warning(f"Failed to get orderbook for {t}: {e}")
+                out[t] = {"var_true": [], "var_false": []}
+        return out
+
     def get_markets(self) -> List[Dict]:
         self.logger.info("Retrieving markets...")
         try:
@@ -1638,13 +2237,8 @@ class KalshiTradingAPI(AbstractTradingAPI):
                 cursor = getattr(api_response, "cursor", None)
                 if not cursor:
                     break
-            # Persist markets to a JSON file for offline inspection
-            try:
-                with open("markets.json", "w") as f:
-                    json.dump(markets, f, indent=2, default=str)
-                self.logger.info(f"Wrote {len(markets)} markets to markets.json")
-            except Exception as write_error:
-                self.logger.error(f"Failed to write markets.json: {write_error}")
+            # Persist markets to a JSON file for offline inspection (off the caller's path)
+            _write_json_in_background("markets.json", list(markets), self.logger, f"{len(markets)} markets")
             return markets
         except Exception as e:
             self.logger.error(f"Failed to retrieve markets: {e}")
@@ -1714,11 +2308,7 @@ class KalshiTradingAPI(AbstractTradingAPI):
                 normalized.append(candidate)
 
             self.logger.info(f"Retrieved {len(normalized)} markets for event {event_ticker}")
-            try:
-                with open("markets.json", "w") as f:
-                    json.dump(normalized, f, indent=2, default=str)
-            except Exception:
-                pass
+            _write_json_in_background("markets.json", list(normalized), self.logger, f"{len(normalized)} markets")
             return normalized
         except Exception as e:
             self.logger.error(f"Failed to retrieve markets for event {event_ticker}: {e}")
@@ -1739,12 +2329,7 @@ class KalshiTradingAPI(AbstractTradingAPI):
             for item in current_series:
                 self.logger.info(f"Series: {item}")
 
-            try:
-                with open("series.json", "w") as f:
-                    json.dump(current_series, f, indent=2, default=str)
-                self.logger.info(f"Wrote {len(current_series)} series to series.json")
-            except Exception as write_error:
-                self.logger.error(f"Failed to write series.json: {write_error}")
+            _write_json_in_background("series.json", list(current_series), self.logger, f"{len(current_series)} series")
 
             self.logger.info(f"Retrieved {len(current_series)} total series")
             return current_series
@@ -1752,6 +2337,11 @@ class KalshiTradingAPI(AbstractTradingAPI):
             self.logger.error(f"Failed to retrieve series: {e}")
             return []
 
+    def _next_client_order_id(self) -> str:
+        if self._uuid_client_order_ids:
+            return uuid.uuid4().hex
+        return f"{self._coid_prefix}{next(self._coid_seq):016x}"
+
     def place_order(self, ticker: str, action: str, side: str, price: float, quantity: int, expiration_ts: int = None) -> str:
         self.logger.info(f"Placing {action} order for {side} side at price ${price:.2f} with quantity {quantity}...")
         path = "/portfolio/orders"
@@ -1761,7 +2351,7 @@ class KalshiTradingAPI(AbstractTradingAPI):
             "type": "limit",
             "side": side,  # 'yes' or 'no'
             "count": quantity,
-            "client_order_id": str(uuid.uuid4()),
+            "client_order_id": self._next_client_order_id(),
         }
 
         price_to_send = max(1, min(99, int(to_cents(price)))) # Convert dollars to cents
@@ -1814,24 +2404,57 @@ class KalshiTradingAPI(AbstractTradingAPI):
             self.logger.error(f"Failed to cancel order {order_id}: {e}")
             return False
 
+    def cancel_orders(self, order_ids: List[str]) -> Dict[str, bool]:
+        """Cancel several orders; returns order_id -> canceled.
+
+        Ids go out in batch-cancel requests of _batch_cancel_max; a batch the exchange
+        rejects as a whole is retried as concurrent single cancel_order() calls.
+        """
+        ids = list(dict.fromkeys(str(i) for i in order_ids if i))
+        out: Dict[str, bool] = {}
+        step = self._batch_cancel_max
+        for start in range(0, len(ids), step):
+            batch = ids[start:start + step]
+            try:
+                response = self.client.batch_cancel_orders(order_ids=batch)
+            except Exception as e:
+                self.logger.warning(f"Batch cancel of {len(batch)} orders failed, falling back to single cancels: {e}")
+                if len(batch) == 1:
+                    out[batch[0]] = self.cancel_order(batch[0])
+                    continue
+                pool = self._get_rest_pool()
+                futures = {oid: pool.submit(self.cancel_order, oid) for oid in batch}
+                for oid, fut in futures.items():
+                    out[oid] = bool(fut.result())
+                continue
+            for oid in batch:
+                out[oid] = True
+            for item in getattr(response, "responses", None) or []:
+                oid = getattr(item, "order_id", None)
+                err = getattr(item, "error", None)
+                if oid is not None and err:
+                    self.logger.error(f"Failed to cancel order {oid}: {err}")
+                    out[str(oid)] = False
+            self.logger.info(f"Batch-canceled {sum(out[oid] for oid in batch)}/{len(batch)} orders")
+        return out
+
     def get_liq_markets(self) -> List[Dict]:
         self.logger.info("Retrieving liquid markets with pagination...")
-        url = "https://api.elections.kalshi.com/trade-api/v2/incentive_programs"
+        url = f"{self._sig_base_url}/trade-api/v2/incentive_programs"
         cursor: Optional[str] = None
         all_items: List[Dict] = []
+        params = {"type": "liquidity", "status": "active", "limit": self._liq_page_limit}
+        pages = 0
 
         while True:
-            params = {}
-            params["type"] = "liquidity"
-            params["status"] = "active"
-            params["limit"] = 100000
             if cursor:
                 params["cursor"] = cursor
-       
+            pages += 1
 
-            response = requests.get(url, params=params)
+            # Pages ride the shared keep-alive session; ask for a compressed body explicitly
+            response = self._http.get(url, params=params, headers=_GZIP_HEADERS, timeout=30)
             response.raise_for_status()
-            data = response.json() or {}
+            data = _json_loads(response.content) or {}
 
             page_items = data.get("incentive_programs")
             if isinstance(page_items, list):
@@ -1841,100 +2464,20 @@ class KalshiTradingAPI(AbstractTradingAPI):
             next_cursor = data.get("next_cursor")
             if not next_cursor:
                 break
+            if next_cursor == cursor or not page_items:
+                # A repeated cursor or an empty page would otherwise spin on the same request
+                self.logger.warning(f"Stopping incentive program pagination: no progress at cursor {cursor}")
+                break
             cursor = next_cursor
-        self.logger.info(f"Retrieved {len(all_items)} liquid markets in total")
+        self.logger.info(f"Retrieved {len(all_items)} liquid markets in total ({pages} pages, page limit {self._liq_page_limit})")
         return all_items
 
     def get_orders(self, ticker: str) -> List[Dict]:
         api_response = self.client.get_orders(ticker=ticker, status="resting")
-        raw_orders = getattr(api_response, "orders", None)
-        if raw_orders is None:
-            raw_orders = api_response.get("orders", []) if isinstance(api_response, dict) else []
-
-        def _get(obj, key, default=None):
-            if isinstance(obj, dict):
-                return obj.get(key, default)
-            return getattr(obj, key, default)
-
-        def _price_to_float(val) -> Optional[float]:
-            if val is None:
-                return None
-            try:
-                f = float(val)
-                # if value looks like cents (>= 1), convert to dollars 0.01..0.99
-                return round(f / 100.0, 2) if f > 1.0 else round(f, 2)
-            except Exception:
-                return None
-
-        def _to_int(val, default: int = 0) -> int:
-            try:
-                if val is None:
-                    return default
-                return int(val)
-            except Exception:
-                return default
-
-        normalized_orders: List[Dict] = []
-        for item in (raw_orders or []):
-            # Normalize source to a dict first
-            src: Dict = {}
-            if isinstance(item, dict):
-                src = item
-            else:
-                to_dict_fn = getattr(item, "to_dict", None)
-                if callable(to_dict_fn):
-                    try:
-                        src = to_dict_fn() or {}
-                    except Exception:
-                        src = {}
-                if not src:
-                    model_dump_fn = getattr(item, "model_dump", None)
-                    if callable(model_dump_fn):
-                        try:
-                            src = model_dump_fn(by_alias=True, exclude_none=True) or {}
-                        except Exception:
-                            src = {}
-
-            # Build normalized order matching required schema
-            yes_px_float = _price_to_float(_get(src, "yes_price"))
-            no_px_float = _price_to_float(_get(src, "no_price"))
-            count_val = _to_int(_get(src, "count"), 0)
-            remaining_val = _to_int(_get(src, "remaining_count"), 0)
-            initial_val = _get(src, "initial_count")
-            initial_val = _to_int(initial_val if initial_val is not None else count_val, 0)
-            fill_count_val = _get(src, "fill_count")
-            if fill_count_val is None:
-                fill_count_val = max(0, initial_val - remaining_val)
-            else:
-                fill_count_val = _to_int(fill_count_val, max(0, initial_val - remaining_val))
-
-            taker_fees_val = _to_int(_get(src, "taker_fees"), 0)
-            maker_fees_val = _to_int(_get(src, "maker_fees"), 0)
-
-            normalized = {
-                "order_id": _get(src, "order_id"),
-                "client_order_id": _get(src, "client_order_id"),
-                "ticker": _get(src, "ticker", ticker),
-                "side": _get(src, "side"),
-                "action": _get(src, "action"),
-                "type": _get(src, "type"),
-                "status": _get(src, "status"),
-                "yes_price": yes_px_float,
-                "no_price": no_px_float,
-                "count": count_val,
-                "fill_count": fill_count_val,
-                "remaining_count": remaining_val,
-                "initial_count": initial_val,
-                "taker_fees": taker_fees_val,
-                "maker_fees": maker_fees_val,
-                "expiration_time": _get(src, "expiration_time"),
-                "created_time": _get(src, "created_time"),
-                "updated_time": _get(src, "updated_time"),
-            }
-
-            normalized_orders.append(normalized)
-
-        return normalized_orders
+        raw_orders = getattr(api_response, "orders", None)
+        if raw_orders is None:
+            raw_orders = api_response.get("orders", []) if isinstance(api_response, dict) else []
+        return [_normalize_order(src, ticker) for src in _order_sources(raw_orders)]
 
     def get_all_orders(self) -> List[Dict]:
         """Retrieve all resting orders across all tickers and normalize shape."""
@@ -1949,86 +2492,7 @@ class KalshiTradingAPI(AbstractTradingAPI):
         if raw_orders is None:
             raw_orders = api_response.get("orders", []) if isinstance(api_response, dict) else []
 
-        def _get(obj, key, default=None):
-            if isinstance(obj, dict):
-                return obj.get(key, default)
-            return getattr(obj, key, default)
-
-        def _price_to_float(val) -> Optional[float]:
-            if val is None:
-                return None
-            try:
-                f = float(val)
-                return round(f / 100.0, 2) if f > 1.0 else round(f, 2)
-            except Exception:
-                return None
-
-        def _to_int(val, default: int = 0) -> int:
-            try:
-                if val is None:
-                    return default
-                return int(val)
-            except Exception:
-                return default
-
-        normalized_orders: List[Dict] = []
-        for item in (raw_orders or []):
-            src: Dict = {}
-            if isinstance(item, dict):
-                src = item
-            else:
-                to_dict_fn = getattr(item, "to_dict", None)
-                if callable(to_dict_fn):
-                    try:
-                        src = to_dict_fn() or {}
-                    except Exception:
-                        src = {}
-                if not src:
-                    model_dump_fn = getattr(item, "model_dump", None)
-                    if callable(model_dump_fn):
-                        try:
-                            src = model_dump_fn(by_alias=True, exclude_none=True) or {}
-                        except Exception:
-                            src = {}
-
-            yes_px_float = _price_to_float(_get(src, "yes_price"))
-            no_px_float = _price_to_float(_get(src, "no_price"))
-            count_val = _to_int(_get(src, "count"), 0)
-            remaining_val = _to_int(_get(src, "remaining_count"), 0)
-            initial_val = _get(src, "initial_count")
-            initial_val = _to_int(initial_val if initial_val is not None else count_val, 0)
-            fill_count_val = _get(src, "fill_count")
-            if fill_count_val is None:
-                fill_count_val = max(0, initial_val - remaining_val)
-            else:
-                fill_count_val = _to_int(fill_count_val, max(0, initial_val - remaining_val))
-
-            taker_fees_val = _to_int(_get(src, "taker_fees"), 0)
-            maker_fees_val = _to_int(_get(src, "maker_fees"), 0)
-
-            normalized = {
-                "order_id": _get(src, "order_id"),
-                "client_order_id": _get(src, "client_order_id"),
-                "ticker": _get(src, "ticker"),
-                "side": _get(src, "side"),
-                "action": _get(src, "action"),
-                "type": _get(src, "type"),
-                "status": _get(src, "status"),
-                "yes_price": yes_px_float,
-                "no_price": no_px_float,
-                "count": count_val,
-                "fill_count": fill_count_val,
-                "remaining_count": remaining_val,
-                "initial_count": initial_val,
-                "taker_fees": taker_fees_val,
-                "maker_fees": maker_fees_val,
-                "expiration_time": _get(src, "expiration_time"),
-                "created_time": _get(src, "created_time"),
-                "updated_time": _get(src, "updated_time"),
-            }
-
-            normalized_orders.append(normalized)
-
+        normalized_orders = [_normalize_order(src) for src in _order_sources(raw_orders)]
         self.logger.info(f"Retrieved {len(normalized_orders)} total resting orders")
         return normalized_orders
 
@@ -2044,11 +2508,40 @@ class KalshiTradingAPI(AbstractTradingAPI):
         drop_missing_side = 0
         drop_resolved = 0
 
-        def analyze_side(side: List[Tuple[float, int]], target: int, book_side: str, ticker: str = ""):
+        def scan_side(side: List[Tuple[float, int]], book_side: str):
+            """
+            One pass over a side's (price, size) levels.
+            book_side: "bid" if this side is bids (best = highest), else "ask" (best = lowest)
+
+            Returns:
+            best_price      (None if no level has size > 0)
+            best_size       (total size resting at best_price)
+            side_min        (lowest price on the side, any size)
+            side_max        (highest price on the side, any size)
+            """
+            is_bid = (book_side == "bid")
+            best_price = None
+            best_size = 0
+            side_min = side_max = None
+            for price, size in side:
+                if side_min is None:
+                    side_min = side_max = price
+                elif price < side_min:
+                    side_min = price
+                elif price > side_max:
+                    side_max = price
+                if size <= 0:
+                    continue
+                if best_price is None or (price > best_price if is_bid else price < best_price):
+                    best_price, best_size = price, size
+                elif price == best_price:
+                    best_size += size
+            return best_price, best_size, side_min, side_max
+
+        def analyze_side(best_price: Optional[float], best_size: int, target: int):
             """
-            side: list of (price, size) levels for the side you're *hitting*
+            best_price/best_size: best level of the side you're *hitting* (see scan_side)
             target: desired quantity to take
-            book_side: "bid" if this side is bids (so sort high→low), else "ask" (low→high)
 
             Returns:
             best_price
@@ -2056,24 +2549,9 @@ class KalshiTradingAPI(AbstractTradingAPI):
             best_size       (size of the best price level)
             coverage        (min(best_size, target) / target)
             """
-            if not side or target <= 0:
-                return (None, 0, 0, 0.0)
-
-            # Aggregate sizes per price
-            levels = defaultdict(int)
-            for price, size in side:
-                if size > 0:
-                    levels[price] += size
-
-            if not levels:
+            if best_price is None or target <= 0:
                 return (None, 0, 0, 0.0)
 
-            # Sort: bids high→low, asks low→high
-            reverse = (book_side == "bid")
-            ordered = sorted(levels.items(), key=lambda x: x[0], reverse=reverse)
-
-            best_price, best_size = ordered[0]
-
             if best_size >= target:
                 amount_needed = 0
                 coverage = 1.0
@@ -2084,138 +2562,137 @@ class KalshiTradingAPI(AbstractTradingAPI):
             return best_price, amount_needed, best_size, coverage
 
         mkts_checked: int = 0
+        # One clock reading filters and scores the whole batch
+        now_ts = time.time()
+        # Per-market drop lines are only formatted when INFO is actually emitted
+        log_info = self.logger.isEnabledFor(logging.INFO)
+        ends_cutoff_ts = now_ts + 3 * 86400
+        date_ok: List[Tuple[Dict, str, Optional[float]]] = []
         for market in liq_markets:
             mkts_checked += 1
             ticker = market.get("market_ticker")
             if not ticker:
-                self.logger.info(f"No ticker for market: {market}")
+                if log_info:
+                    self.logger.info(f"No ticker for market: {market}")
                 drop_no_ticker += 1
                 continue
 
             # Filter out markets that end before 24 hours from now
+            # Dates parse once each through the shared cached parser and are reused below
             end_date = market.get("end_date", "")
+            end_ts: Optional[float] = None
             if end_date:
-                try:
-                    # Parse ISO date string and convert to timestamp
-                    # Handle 'Z' timezone by converting to '+00:00' for compatibility
-                    end_date_clean = end_date.replace('Z', '+00:00')
-                    end_dt = datetime.fromisoformat(end_date_clean)
-                    end_ts = end_dt.timestamp()
-                    # Check if market ends before 24 hours from now
-                    if end_ts < time.time() + 3 * 86400:  # 86400 seconds = 24 hours
+                end_ts = _parse_date_to_timestamp(end_date) if isinstance(end_date, str) else None
+                if end_ts is None:
+                    self.logger.warning(f"Failed to parse end_date '{end_date}' for {ticker}")
+                    continue
+                # Check if market ends before 24 hours from now
+                if end_ts < ends_cutoff_ts:
+                    if log_info:
                         self.logger.info(f"{ticker}: market ends before 24 hours; skipping")
-                        drop_ends_too_soon += 1
-                        continue
-                except (ValueError, AttributeError) as e:
-                    self.logger.warning(f"Failed to parse end_date '{end_date}' for {ticker}: {e}")
+                    drop_ends_too_soon += 1
                     continue
 
             # Filter out markets where time between start and end is less than 28 hours
             start_date = market.get("start_date", "")
             if start_date and end_date:
-                try:
-                    # Parse ISO date strings and convert to timestamps
-                    start_date_clean = start_date.replace('Z', '+00:00')
-                    end_date_clean = end_date.replace('Z', '+00:00')
-                    start_dt = datetime.fromisoformat(start_date_clean)
-                    end_dt = datetime.fromisoformat(end_date_clean)
-                    start_ts = start_dt.timestamp()
-                    end_ts_check = end_dt.timestamp()
-                    # Check if duration is less than 28 hours
-                    duration_hours = (end_ts_check - start_ts) / 3600.0
-                    if duration_hours < 28:
+                start_ts = _parse_date_to_timestamp(start_date) if isinstance(start_date, str) else None
+                if start_ts is None:
+                    self.logger.warning(f"Failed to parse dates for {ticker}: start='{start_date}', end='{end_date}'")
+                    continue
+                # Check if duration is less than 28 hours
+                duration_hours = (end_ts - start_ts) / 3600.0
+                if duration_hours < 28:
+                    if log_info:
                         self.logger.info(f"{ticker}: market duration {duration_hours:.1f} hours < 28 hours; skipping")
-                        drop_too_short_duration += 1
-                        continue
-                except (ValueError, AttributeError) as e:
-                    self.logger.warning(f"Failed to parse dates for {ticker}: start='{start_date}', end='{end_date}': {e}")
+                    drop_too_short_duration += 1
                     continue
-            orderbook = self.get_orderbook(ticker)
+
+            # When the listing carries quotes (cents), drop resolved markets before any fetch;
+            # the no mid mirrors the yes mid, so one range check covers both sides
+            listed_bid = _to_float(market.get("yes_bid"))
+            listed_ask = _to_float(market.get("yes_ask"))
+            if listed_bid is not None and listed_ask is not None and not 10.0 < (listed_bid + listed_ask) / 2 < 90.0:
+                drop_resolved += 1
+                continue
+            date_ok.append((market, ticker, end_ts))
+
+        # Orderbooks for every date-qualified market, fetched concurrently
+        orderbooks = self.get_orderbooks([ticker for _, ticker, _ in date_ok])
+        for market, ticker, end_ts in date_ok:
+            orderbook = orderbooks.get(ticker) or {}
             var_true = orderbook.get("var_true", [])
             var_false = orderbook.get("var_false", [])
 
             if not var_true and not var_false:
-                self.logger.info(f"{ticker}: empty orderbook (both sides empty); skipping")
+                if log_info:
+                    self.logger.info(f"{ticker}: empty orderbook (both sides empty); skipping")
                 drop_empty_orderbook += 1
                 continue
 
             # Skip if missing orders on either side
             if not var_true or not var_false:
                 missing_side = "YES" if not var_true else "NO"
-                self.logger.info(f"{ticker}: missing orders on {missing_side} side; skipping")
+                if log_info:
+                    self.logger.info(f"{ticker}: missing orders on {missing_side} side; skipping")
                 drop_missing_side += 1
                 continue
 
-            # Skip if top of orderbook is at 99c or 1c on either side
-            skip_market = False
-            price = self.get_price(ticker)
-            yes_mid = price.get("yes")
-            no_mid = price.get("no")
-            if yes_mid >= 0.90 or yes_mid <= 0.10:
-                skip_market = True
-            
-            if no_mid >= 0.90 or no_mid <= 0.10:
-                skip_market = True
-                
-            if skip_market:
+            # One scan per side feeds the resolved check, the spread and the best-level stats
+            yes_best_px, yes_best_sz, yes_min, yes_max = scan_side(var_true, "bid")
+            no_best_px, no_best_sz, _, no_max = scan_side(var_false, "ask")
+
+            # Skip if top of orderbook is at 99c or 1c on either side. Both sides are bids,
+            # so the mids come from the book in hand (yes ask = 1 - best no bid) instead of
+            # a second get_price() round trip.
+            yes_mid = round((yes_max + 1.0 - no_max) / 2, 2)
+            no_mid = round((no_max + 1.0 - yes_max) / 2, 2)
+            if yes_mid >= 0.90 or yes_mid <= 0.10 or no_mid >= 0.90 or no_mid <= 0.10:
                 drop_resolved += 1
                 continue
 
             target_size = int(market.get("target_size", 300))
-            # Compute spread if both sides exist
-            spread_val: Optional[float] = None
-            if var_true and var_false:
-                try:
-                    # Best ask for YES is the minimum price on var_true; best bid for NO is the maximum on var_false
-                    best_yes_tmp = min(p for p, _ in var_true)
-                    best_no_tmp = max(p for p, _ in var_false)
-                    spread_val = round(best_no_tmp - best_yes_tmp, 4)
-                except Exception:
-                    spread_val = None
-
-            # YES side entry
-            if var_true:
-                (best_yes, amount_needed_yes, best_size_yes, cov_yes) = analyze_side(var_true, target_size, "bid", ticker)
-                if amount_needed_yes > 0:
-                    entry_yes: Dict = {
-                        "ticker": ticker,
-                        "side": "yes",
-                        "target_size": target_size,
-                        "best_price": best_yes,
-                        "amount_needed": amount_needed_yes,
-                        "best_size": best_size_yes,
-                        "coverage": round(cov_yes, 3),
-                        "spread": spread_val if spread_val is not None else 0.0,
-                        "valid_for_entry": amount_needed_yes > 0,
-                        "discount_factor_bps": market.get("discount_factor_bps", 0),
-                        "period_reward": market.get("period_reward", 0),
-                        "start_date": market.get("start_date", 0),
-                        "end_date": self._parse_date_to_timestamp(market.get("end_date", "")),
-                    }
-                    entry_yes["score"] = score_side("yes", entry_yes)
-                    valid_markets.append(entry_yes)
-
-            # NO side entry
-            if var_false:
-                (best_no, amount_needed_no, best_size_no, cov_no) = analyze_side(var_false, target_size, "ask", ticker)
-                if amount_needed_no > 0:
-                    entry_no: Dict = {
-                        "ticker": ticker,
-                        "side": "no",
-                        "target_size": target_size,
-                        "best_price": best_no,
-                        "amount_needed": amount_needed_no,
-                        "best_size": best_size_no,
-                        "coverage": round(cov_no, 3),
-                        "spread": spread_val if spread_val is not None else 0.0,
-                        "valid_for_entry": amount_needed_no > 0,
-                        "discount_factor_bps": market.get("discount_factor_bps", 0),
-                        "period_reward": market.get("period_reward", 0),
-                        "start_date": market.get("start_date", 0),
-                        "end_date": self._parse_date_to_timestamp(market.get("end_date", "")),
-                    }
-                    entry_no["score"] = score_side("no", entry_no)
-                    valid_markets.append(entry_no)
+            # Best ask for YES is the minimum price on var_true; best bid for NO is the maximum on var_false
+            spread_val: Optional[float] = round(no_max - yes_min, 4)
+
+            # Scoring inputs shared by both sides, read off the market once; each side is
+            # scored from these locals and only surviving sides become dicts
+            spread = spread_val if spread_val is not None else 0.0
+            discount_factor_bps = market.get("discount_factor_bps", 0)
+            period_reward = market.get("period_reward", 0)
+            start_date = market.get("start_date", 0)
+            df_bps = float(discount_factor_bps)
+            df = _clip01(df_bps / 10000.0) if df_bps else 0.5
+            reward_pool = float(period_reward)
+            target_f = float(max(1, target_size))
+            end_ts_f = end_ts if end_ts else 0.0
+
+            for side, side_best_px, side_best_sz in (
+                ("yes", yes_best_px, yes_best_sz),
+                ("no", no_best_px, no_best_sz),
+            ):
+                best_price, amount_needed, best_size, cov = analyze_side(side_best_px, side_best_sz, target_size)
+                if amount_needed <= 0:
+                    continue
+                coverage = round(cov, 3)
+                valid_markets.append({
+                    "ticker": ticker,
+                    "side": side,
+                    "target_size": target_size,
+                    "best_price": best_price,
+                    "amount_needed": amount_needed,
+                    "best_size": best_size,
+                    "coverage": coverage,
+                    "spread": spread,
+                    "valid_for_entry": True,
+                    "discount_factor_bps": discount_factor_bps,
+                    "period_reward": period_reward,
+                    "start_date": start_date,
+                    "end_date": end_ts,
+                    "score": _score_side_kernel(
+                        coverage, spread, target_f, df, reward_pool, float(best_size), end_ts_f, now_ts
+                    ),
+                })
 
         self.logger.info(f"Markets checked: {mkts_checked}")
         self.logger.info(f"Market filtering summary:")
@@ -2290,11 +2767,11 @@ class KalshiTradingAPI(AbstractTradingAPI):
             self.logger.info(f"Fetching candlesticks: {url}")
             self.logger.info(f"Params: {params}")
             
-            response = requests.get(url, headers=auth_headers, params=params)
+            response = self._http.get(url, headers=auth_headers, params=params)
             response.raise_for_status()
             
             # Parse response
-            data = response.json()
+            data = _json_loads(response.content)
             candlesticks = []
             
             if 'candlesticks' in data:
@@ -2352,12 +2829,57 @@ def _gauss(x: float, mu: float, sigma: float) -> float:
 def _clip01(x: float) -> float:
     return max(0.0, min(1.0, x))
 
-def score_side(side: str, entry: Dict) -> int:
+def _score_side_kernel(
+    coverage: float, spread: float, target: float, df: float,
+    reward_pool: float, best_cap: float, end_ts: float, now_ts: float
+) -> int:
+    """Numeric core of score_side on plain floats (end_ts <= 0 means unknown)"""
+    # Monotonic component scores in 0..1. _clip01 is inlined as a chained compare
+    # (NaN still clips to 1.0, as with max/min); the call overhead dominated here.
+    cov_score = coverage if 0.0 <= coverage <= 1.0 else (0.0 if coverage < 0.0 else 1.0)  # higher coverage is better
+    spread_score = spread / 0.20  # reward wider spreads up to ~20c
+    spread_score = spread_score if 0.0 <= spread_score <= 1.0 else (0.0 if spread_score < 0.0 else 1.0)
+    cap_norm = best_cap / target  # more liquidity at best is better
+    cap_norm = cap_norm if 0.0 <= cap_norm <= 1.0 else (0.0 if cap_norm < 0.0 else 1.0)
+    df_score = (df if 0.0 <= df <= 1.0 else (0.0 if df < 0.0 else 1.0)) ** 1.15  # prefer higher discount factor
+    # The blend is a product: any zero component zeroes the score, skip the exp/pow work
+    if cov_score == 0.0 or spread_score == 0.0 or cap_norm == 0.0 or df_score == 0.0:
+        return 0
+    rew_score = 1.0 - math.exp(-reward_pool / 120.0)  # larger reward pools are better
+    rew_score = rew_score if 0.0 <= rew_score <= 1.0 else (0.0 if rew_score < 0.0 else 1.0)
+
+    # Time-to-end factor (higher when end_date is later)
+    time_score = 1.0
+    if end_ts > 0:
+        if end_ts > 1e12:
+            end_ts = end_ts / 1000.0
+        days_remaining = max(0.0, (end_ts - now_ts) / 86400.0)
+        tau_days = 30.0
+        # Increase with more days remaining; near 0 for soon, approaches 1 for far
+        # days_remaining >= 0, so this is already in [0, 1)
+        time_score = 1.0 - math.exp(-days_remaining / tau_days)
+
+    # Weighted multiplicative blend (keeps 0..1 and monotonic)
+    # Give time-to-end a bit more weight than others (coverage, df and reward weigh 1.0)
+    w_spread, w_cap, w_time = 0.9, 1.2, 1.5
+    comp = (
+        cov_score
+        * df_score
+        * (spread_score ** w_spread)
+        * (cap_norm ** w_cap)
+        * rew_score
+        * (time_score ** w_time)
+    )
+
+    return int(round(1000 * (comp if comp <= 1.0 else 1.0)))
+
+def score_side(side: str, entry: Dict, now_ts: Optional[float] = None) -> int:
     """
     Score a single side of a market as its own entity.
     Expects keys on entry: coverage, spread, target_size, best_size,
     discount_factor_bps or discount_factor, and period_reward or reward_pool.
     Also favors programs that end later via an exponential time-to-end factor.
+    Pass now_ts when scoring a batch so every side shares one clock reading.
     Returns an integer score (0..1000).
     """
 
@@ -2375,41 +2897,16 @@ def score_side(side: str, entry: Dict) -> int:
     reward_pool = float(entry.get("period_reward", entry.get("reward_pool", 50.0)))
     best_cap = float(entry.get("best_size", 0.0))
 
-    # Time-to-end factor (higher when end_date is later)
-    end_raw = entry.get("end_date", None)
-    time_score = 1.0
-    try:
-        end_ts = float(end_raw) if end_raw is not None else None
-    except Exception:
-        end_ts = None
-    if end_ts and end_ts > 0:
-        if end_ts > 1e12:
-            end_ts = end_ts / 1000.0
-        days_remaining = max(0.0, (end_ts - time.time()) / 86400.0)
-        tau_days = 30.0
-        # Increase with more days remaining; near 0 for soon, approaches 1 for far
-        time_score = _clip01(1.0 - math.exp(-days_remaining / tau_days))
-
-    # Monotonic component scores in 0..1
-    cov_score = _clip01(coverage)  # higher coverage is better
-    df_score = _clip01(df) ** 1.15  # prefer higher discount factor
-    spread_score = _clip01(spread / 0.20)  # reward wider spreads up to ~20c
-    cap_norm = _clip01(best_cap / target)  # more liquidity at best is better
-    rew_score = _clip01(1.0 - math.exp(-reward_pool / 120.0))  # larger reward pools are better
+    end_ts = _to_float(entry.get("end_date", None))
 
-    # Weighted multiplicative blend (keeps 0..1 and monotonic)
-    # Give time-to-end a bit more weight than others
-    w_cov, w_df, w_spread, w_cap, w_rew, w_time = 1.0, 1.0, 0.9, 1.2, 1.0, 1.5
-    comp = (
-        (cov_score ** w_cov)
-        * (df_score ** w_df)
-        * (spread_score ** w_spread)
-        * (cap_norm ** w_cap)
-        * (rew_score ** w_rew)
-        * (time_score ** w_time)
+    return _score_side_kernel(
+        coverage, spread, float(target), df, reward_pool, best_cap,
+        end_ts if end_ts else 0.0,
+        time.time() if now_ts is None else now_ts,
     )
 
-    return int(round(1000 * _clip01(comp)))
+# buy <-> sell when mirroring between the YES and NO books (anything else maps to buy)
+_FLIP_ACTION = {"buy": "sell", "sell": "buy"}
 
 def yes_equiv_from(side: str, action: str, price: float) -> Tuple[str, float]:
     """
@@ -2418,17 +2915,208 @@ def yes_equiv_from(side: str, action: str, price: float) -> Tuple[str, float]:
     - sell NO @ p -> buy  YES @ (1-p)
     - YES stays the same
     """
-    price = to_tick(price)
+    # Work in whole cents: the complement of a valid tick is 100 - cents, read from _C2D
+    cents = to_cents(price)
     if side == "yes":
-        return action, price
+        return action, _C2D[cents]
     # side == "no"
-    y_price = to_tick(1.0 - price)
-    y_action = "sell" if action == "buy" else "buy"
-    return y_action, y_price
+    return _FLIP_ACTION.get(action, "buy"), _C2D[100 - cents]
 
 def no_from_yes(action_y: str, price_y: float) -> Tuple[str, float]:
     """If you ever need to send to NO side explicitly."""
-    return ("sell" if action_y == "buy" else "buy", to_tick(1.0 - price_y))
+    return _FLIP_ACTION.get(action_y, "buy"), to_tick(1.0 - price_y)
+
+_MULT_TABLE_SIZE = 128  # discount powers precomputed per discount factor
+
+@dataclass
+class OrderbookLevels:
+    """
+    One side of an orderbook stored column-wise: prices in an array('d') and
+    sizes in an array('q'), ordered best to worst. Compact (16 bytes/level)
+    and consumed directly by the band kernel without per-level tuples.
+    Iterating yields (price, size) pairs, so it can stand in for a list of tuples.
+    """
+    __slots__ = ('prices', 'sizes')
+    prices: array
+    sizes: array
+
+    @classmethod
+    def from_columns(cls, prices: List[float], sizes: List[int]) -> "OrderbookLevels":
+        return cls(array('d', prices), array('q', (int(sz) for sz in sizes)))
+
+    @classmethod
+    def from_pairs(cls, levels: List[Tuple[float, int]]) -> "OrderbookLevels":
+        return cls.from_columns([p for p, _ in levels], [sz for _, sz in levels])
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def __iter__(self):
+        return zip(self.prices, self.sizes)
+
+@dataclass
+class QualifyingBand:
+    """
+    One side's LIP qualifying band as parallel (struct-of-arrays) lists.
+    Index i describes one level: prices[i], sizes[i], ticks[i] (ticks from
+    best) and mults[i] (DF**ticks). Iterating or indexing yields the legacy
+    level dicts {'price', 'size', 'ticks_from_best', 'multiplier'}.
+    """
+    __slots__ = ('prices', 'sizes', 'ticks', 'mults')
+    prices: List[float]
+    sizes: List[int]
+    ticks: List[int]
+    mults: List[float]
+
+    @classmethod
+    def from_levels(cls, levels: List[Dict]) -> "QualifyingBand":
+        """Build a band from a list of level dicts (ordered by ticks from best)."""
+        levels = sorted(levels, key=lambda level: level['ticks_from_best'])
+        return cls(
+            [level['price'] for level in levels],
+            [level['size'] for level in levels],
+            [level['ticks_from_best'] for level in levels],
+            [level['multiplier'] for level in levels],
+        )
+
+    def level(self, i: int) -> Dict:
+        return {
+            'price': self.prices[i],
+            'size': self.sizes[i],
+            'ticks_from_best': self.ticks[i],
+            'multiplier': self.mults[i],
+        }
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def __getitem__(self, i: int) -> Dict:
+        return self.level(i)
+
+    def __iter__(self):
+        for i in range(len(self.prices)):
+            yield self.level(i)
+
+def _build_qualifying_band_kernel(
+    prices: List[float],
+    sizes: List[int],
+    target_size: int,
+    mult_table: Tuple[float, ...]
+) -> Tuple[List[float], List[int], List[int], List[float], int]:
+    """
+    Numeric core of LIPBot.build_qualifying_band on parallel price/size lists.
+    Walks levels best to worst, skipping empty ones, until cumulative size
+    reaches target_size. mult_table[i] holds discount**i, so multipliers are
+    a table lookup. Returns (prices, sizes, ticks, multipliers, cum_size).
+    """
+    prices_out: List[float] = []
+    sizes_out: List[int] = []
+    ticks_out: List[int] = []
+    mults_out: List[float] = []
+    cum_size = 0
+    n_mults = len(mult_table)
+    for i in range(len(prices)):
+        size = sizes[i]
+        if size > 0:
+            prices_out.append(prices[i])
+            sizes_out.append(size)
+            ticks_out.append(i)
+            # Books have at most 99 price levels, so the pow fallback is only a safety net
+            mults_out.append(mult_table[i] if i < n_mults else mult_table[1] ** i)
+            cum_size += size
+            if cum_size >= target_size:
+                break
+    return prices_out, sizes_out, ticks_out, mults_out, cum_size
+
+@lru_cache(maxsize=8)
+def _discount_powers(discount_factor: float) -> Tuple[float, ...]:
+    """Immutable (DF**0, DF**1, ...) table, shared across bots and threads."""
+    return tuple(discount_factor ** i for i in range(_MULT_TABLE_SIZE))
+
+@lru_cache(maxsize=8)
+def _make_band_builder(discount_factor: float):
+    """
+    Band builder specialised to one discount factor. Discount factors come
+    from a handful of program values, so the power table is bound into the
+    closure once per value instead of being looked up on every call.
+    """
+    mult_table = _discount_powers(discount_factor)
+
+    def _builder(prices, sizes, target_size: int):
+        return _build_qualifying_band_kernel(prices, sizes, target_size, mult_table)
+
+    return _builder
+
+def _compute_lip_intensity_kernel(sizes: List[int], ticks: List[int], target_size: int) -> float:
+    """Size resting at the best tick (ticks == 0) divided by target_size."""
+    for i in range(len(ticks)):
+        if ticks[i] == 0:
+            return sizes[i] / target_size
+    return 0.0
+
+def _ttl_cache(ttl_s: float):
+    """
+    Per-instance TTL memoization for LIPBot methods keyed by (ticker, args).
+    Entries are stored on the instance in self._risk_cache as
+    (value, computed_at, generation); bumping self._risk_gen[ticker]
+    (see LIPBot.invalidate_risk_cache) makes cached values stale early.
+    """
+    def decorator(fn):
+        name = fn.__name__
+
+        @wraps(fn)
+        def wrapper(self, ticker, *args, **kwargs):
+            store = self.__dict__.get("_risk_cache")
+            if store is None:
+                return fn(self, ticker, *args, **kwargs)
+            key = (name, ticker, args, tuple(sorted(kwargs.items())))
+            try:
+                hit = store.get(key)
+            except TypeError:
+                # Unhashable arguments (e.g. an explicit percentiles dict): skip caching
+                return fn(self, ticker, *args, **kwargs)
+            now = time.monotonic()
+            gen = self._risk_gen.get(ticker, 0)
+            if hit is not None and now - hit[1] < ttl_s and hit[2] == gen:
+                return hit[0]
+            value = fn(self, ticker, *args, **kwargs)
+            store[key] = (value, now, gen)
+            return value
+
+        return wrapper
+    return decorator
+
+@dataclass(frozen=True)
+class LIPConfig:
+    """LIP risk-based quoting parameters, resolved once and shared read-only."""
+    enabled: bool = True
+    discount_factor: float = 0.95
+    risk_threshold: float = 3.0
+    alpha: float = 1.0
+    time_risk_k: float = 0.04
+    vol_gamma: float = 2.0
+    medium_risk_threshold: float = 1.5
+    high_risk_threshold: float = 2.5
+    reserve_frac: float = 0.9
+    market_frac: float = 0.25
+    fee_per_contract: float = 0.0
+
+    @classmethod
+    def from_env(cls) -> "LIPConfig":
+        """Build a config from LIP_* environment variables (defaults match the dataclass)."""
+        return cls(
+            enabled=bool(int(os.getenv("LIP_RISK_ENABLED", "1"))),
+            discount_factor=float(os.getenv("LIP_DISCOUNT_FACTOR", "0.95")),
+            risk_threshold=float(os.getenv("LIP_RISK_THRESHOLD", "3.0")),
+            alpha=float(os.getenv("LIP_RISK_ALPHA", "1.0")),
+            time_risk_k=float(os.getenv("LIP_TIME_RISK_K", "0.04")),
+            vol_gamma=float(os.getenv("LIP_VOL_GAMMA", "2.0")),
+            medium_risk_threshold=float(os.getenv("LIP_MEDIUM_RISK_THRESHOLD", "1.5")),
+            high_risk_threshold=float(os.getenv("LIP_HIGH_RISK_THRESHOLD", "2.5")),
+            reserve_frac=float(os.getenv("LIP_RESERVE_FRAC", "0.9")),
+            market_frac=float(os.getenv("LIP_MARKET_FRAC", "0.25")),
+            fee_per_contract=float(os.getenv("LIP_FEE_PER_CONTRACT", "0.00")),
+        )
 
 class LIPBot:
     def __init__(
@@ -2452,6 +3140,7 @@ class LIPBot:
         max_markets_with_orders: int = 20,
         discovery_interval_seconds: int = 10,
         orderbook_update_cooldown_ms: int = 500,
+        lip_config: Optional[LIPConfig] = None,
     ):
         self.api = api
         self.logger = logger
@@ -2465,6 +3154,7 @@ class LIPBot:
         self.my_positions = set(my_positions) if my_positions else set()  # Set of tickers that are personal positions
         self.inventory_buy_threshold = float(inventory_buy_threshold)  # Stop buying when inventory > threshold * max_position
         self.max_workers = max(1, int(max_workers))  # Number of parallel threads for order management
+        self._market_pool: Optional[ThreadPoolExecutor] = None  # created on first use, reused across run() loops
         self._market_end_ts = _market_end_ts or {}
         
         # New config parameters for websocket orderbook and discovery
@@ -2501,11 +3191,11 @@ class LIPBot:
         self._position_lock = threading.Lock()
 
         
-        # improvement gating state (thread-safe with locks)
+        # improvement gating state, keyed (ticker, side). Each ticker is handled by one
+        # market task at a time, so workers only touch disjoint keys and need no lock
         self._last_external_touch: Dict[Tuple[str, str], Tuple[Optional[float], Optional[float]]] = {}
         self._improved_on_touch: Dict[Tuple[str, str], bool] = {}
         self._last_improve_ts: Dict[Tuple[str, str], float] = {}
-        self._state_lock = threading.Lock()  # Lock for thread-safe access to shared state
         
         # Send startup alert
         self.alert_manager.send_alert(AlertLevel.INFO, "bot_lifecycle", "Market maker bot starting up", {})
@@ -2524,8 +3214,11 @@ class LIPBot:
         self.width_bump = 0.01          # add 1¢ width when toxic
 
         # queue of delayed checks from fills
-        self._markout_checks = []  # list of dicts
-        self._fills_hist = []  # list of fill timestamps for throttle data
+        # min-heap of (t_due, seq, horizon_idx, fill) markout checks; fill thread pushes, main loop pops
+        self._markout_heap: List[Tuple[float, int, int, Dict]] = []
+        self._markout_seq = itertools.count()
+        self._markout_lock = threading.Lock()
+        self._fills_hist: Deque[float] = deque(maxlen=_FILL_HISTORY_MAX)  # fill timestamps for throttle data
 
         self._target_sizes: Dict[str, int] = {}
         self._last_target_refresh_ts = 0.0
@@ -2536,6 +3229,17 @@ class LIPBot:
         self._vol_percentiles: Dict[str, float] = {}  # ticker -> percentile [0, 1]
         self._last_vol_refresh_ts = 0.0
         self._vol_refresh_interval = float(os.getenv("LIP_VOL_REFRESH_INTERVAL", "300.0"))  # 5 minutes
+
+        # Incremental EWMA volatility fed by websocket mids (see update_volatility)
+        self._vol_state: Dict[str, Tuple[float, float, int, float]] = {}  # ticker -> (sigma, last_logit, n_obs, last_ts)
+        self.vol_ewma_alpha = 0.3
+        self._vol_sample_interval = 60.0  # seconds; matches the 1-minute candles used for seeding
+        # State not updated for this long is re-seeded from candles (e.g. ticker unsubscribed while flat)
+        self._vol_stale_after = 3 * self._vol_sample_interval
+
+        # Short-lived memo for time/vol/risk scores (see _ttl_cache)
+        self._risk_cache: Dict[tuple, tuple] = {}
+        self._risk_gen: Dict[str, int] = {}  # ticker -> generation, bumped on new orderbook snapshot
         
         # WebSocket fill tracker (will be started when run() is called)
         self.ws_fill_tracker: Optional[WebSocketFillTracker] = None
@@ -2553,13 +3257,14 @@ class LIPBot:
         # How many candidates to scan per cycle before giving up (safety cap)
         self.discovery_scan_cap = int(os.getenv("LIP_DISCOVERY_SCAN_CAP", "100"))
 
-        # LIP risk-based quoting parameters
-        self.lip_enabled = bool(int(os.getenv("LIP_RISK_ENABLED", "1")))  # Enable LIP risk-adjusted quoting
-        self.lip_discount_factor = float(os.getenv("LIP_DISCOUNT_FACTOR", "0.95"))  # LIP DF for multipliers
-        self.lip_risk_threshold = float(os.getenv("LIP_RISK_THRESHOLD", "3.0"))  # Max risk score
-        self.lip_risk_alpha = float(os.getenv("LIP_RISK_ALPHA", "1.0"))  # Quote distance scaling
-        self.lip_time_risk_k = float(os.getenv("LIP_TIME_RISK_K", "0.04"))  # Time decay constant for hyperbolic formula
-        self.lip_vol_gamma = float(os.getenv("LIP_VOL_GAMMA", "2.0"))  # Volatility scaling factor
+        # LIP risk-based quoting parameters (resolved once; env is not re-read in hot paths)
+        self.lip_config = lip_config if lip_config is not None else LIPConfig.from_env()
+        self.lip_enabled = self.lip_config.enabled  # Enable LIP risk-adjusted quoting
+        self.lip_discount_factor = self.lip_config.discount_factor  # LIP DF for multipliers
+        self.lip_risk_threshold = self.lip_config.risk_threshold  # Max risk score
+        self.lip_risk_alpha = self.lip_config.alpha  # Quote distance scaling
+        self.lip_time_risk_k = self.lip_config.time_risk_k  # Time decay constant for hyperbolic formula
+        self.lip_vol_gamma = self.lip_config.vol_gamma  # Volatility scaling factor
         
         self.logger.info(f"LIP risk-based quoting: {'ENABLED' if self.lip_enabled else 'DISABLED'}")
         if self.lip_enabled:
@@ -2699,10 +3404,10 @@ class LIPBot:
                     try:
                         # Handle ISO 8601 string timestamps (e.g., '2025-12-15T04:59:00Z')
                         if isinstance(end_raw, str):
-                            # Replace 'Z' with '+00:00' for fromisoformat compatibility
-                            timestamp_str = end_raw.replace('Z', '+00:00')
-                            dt = datetime.fromisoformat(timestamp_str)
-                            end_ts = dt.timestamp()
+                            # Shared cached parser (ciso8601 or fromisoformat); None means unparseable
+                            end_ts = _parse_date_to_timestamp(end_raw)
+                            if end_ts is None:
+                                raise ValueError(f"Invalid isoformat string: {end_raw!r}")
                         else:
                             # Fallback for numeric timestamps
                             end_ts = float(end_raw)
@@ -2754,6 +3459,7 @@ class LIPBot:
         
         # Store raw volatilities in cache
         self._vol_cache = vol_map
+        self.invalidate_risk_cache()
         
         # Convert to percentile ranks
         if len(vol_map) > 1:
@@ -2793,6 +3499,41 @@ class LIPBot:
                 percentile = self._vol_percentiles.get(ticker, 0.5)
                 self.logger.info(f"  {ticker}: σ={vol:.4f} (p{percentile*100:.0f})")
 
+    def update_volatility(self, ticker: str, price: float, now: Optional[float] = None):
+        """
+        Fold a new mid price into the ticker's EWMA of absolute logit returns.
+        Uses the same recursion as compute_volatility_risk, sampled at most
+        once per _vol_sample_interval so tick-level noise is not mixed into a
+        per-minute volatility scale.
+        """
+        now = time.time() if now is None else now
+        p = max(0.01, min(0.99, float(price)))
+        logit_p = math.log(p / (1.0 - p))
+        state = self._vol_state.get(ticker)
+        if state is None:
+            self._vol_state[ticker] = (0.0, logit_p, 1, now)
+            return
+        sigma, last_logit, n_obs, last_ts = state
+        if now - last_ts < self._vol_sample_interval:
+            return
+        if now - last_ts > self._vol_stale_after:
+            # One return across a long gap is not a per-minute return: restart from this
+            # mid so compute_volatility_risk re-seeds from candles instead
+            self._vol_state[ticker] = (0.0, logit_p, 1, now)
+            return
+        r = abs(logit_p - last_logit)
+        alpha = self.vol_ewma_alpha
+        # First return initialises sigma, matching the batch computation
+        sigma = r if n_obs == 1 else alpha * r + (1.0 - alpha) * sigma
+        self._vol_state[ticker] = (sigma, logit_p, n_obs + 1, now)
+
+    def invalidate_risk_cache(self, ticker: Optional[str] = None):
+        """Mark cached risk values stale for one ticker (or all tickers if None)."""
+        if ticker is None:
+            self._risk_cache.clear()
+            return
+        self._risk_gen[ticker] = self._risk_gen.get(ticker, 0) + 1
+
     def get_volatility_percentile(self, ticker: str) -> Optional[float]:
         """
         Get cached volatility percentile for a ticker.
@@ -2818,9 +3559,17 @@ class LIPBot:
             self._width_bonus[ticker] = max(self._width_bonus.get(ticker, 0.0), self.width_bump)
             self.logger.info(f"{ticker}: markout EMA {ema:.4f} ≤ {self.mo_bad_threshold:.4f} → bump edge+width")
         else:
-            # gentle decay back to zero
-            self._edge_bonus[ticker] = max(0.0, self._edge_bonus.get(ticker, 0.0) * 0.5)
-            self._width_bonus[ticker] = max(0.0, self._width_bonus.get(ticker, 0.0) * 0.5)
+            # gentle decay back to zero; negligible bonuses are dropped (readers default
+            # to 0.0) so quiet tickers cost no dict writes and the maps stay bounded
+            for bonus in (self._edge_bonus, self._width_bonus):
+                b = bonus.get(ticker)
+                if b is None:
+                    continue
+                b *= 0.5
+                if b < _BONUS_EPS:
+                    del bonus[ticker]
+                else:
+                    bonus[ticker] = b
 
     def _hours_to_expiry(self, ticker: str) -> Optional[float]:
         end_ts = self._market_end_ts.get(ticker)
@@ -2829,59 +3578,56 @@ class LIPBot:
         now = time.time()
         return max(0.0, (end_ts - now) / 3600.0)
 
+    def _mult_table(self, discount_factor: float) -> Tuple[float, ...]:
+        """Cached (DF**0, DF**1, ...) lookup table for a discount factor."""
+        return _discount_powers(discount_factor)
+
     def build_qualifying_band(
         self,
-        orderbook_levels: List[Tuple[float, int]],
+        orderbook_levels: Union[OrderbookLevels, List[Tuple[float, int]]],
         target_size: int,
         is_bid_side: bool,
         discount_factor: float = 0.95
-    ) -> Optional[List[Dict]]:
+    ) -> Optional[QualifyingBand]:
         """
         Build the LIP qualifying band for one side of the market.
         
         Args:
-            orderbook_levels: List of (price, size) tuples sorted from best to worst
+            orderbook_levels: OrderbookLevels or list of (price, size) tuples, best to worst
             target_size: The LIP target size requirement
             is_bid_side: True for bids (descending prices), False for asks (ascending)
             discount_factor: The LIP discount factor (e.g., 0.95)
         
         Returns:
-            List of qualifying level dicts with keys:
-                - price: the price level
-                - size: the size at that level
-                - ticks_from_best: 0 for best, 1 for second best, etc.
-                - multiplier: DF^ticks_from_best
+            QualifyingBand with parallel lists:
+                - prices: the price levels
+                - sizes: the size at each level
+                - ticks: ticks from best (0 for best, 1 for second best, etc.)
+                - mults: DF^ticks
+            Iterating the band yields level dicts with keys price, size,
+            ticks_from_best and multiplier.
             Returns None if the book is too thin to reach target_size.
         """
         if not orderbook_levels or target_size <= 0:
             return None
         
-        qual_levels = []
-        cum_size = 0
+        if isinstance(orderbook_levels, OrderbookLevels):
+            # Columnar input is passed to the kernel as-is
+            prices, sizes = orderbook_levels.prices, orderbook_levels.sizes
+        else:
+            prices = [price for price, _ in orderbook_levels]
+            sizes = [size for _, size in orderbook_levels]
+        prices_out, sizes_out, ticks_out, mults_out, cum_size = _make_band_builder(discount_factor)(
+            prices, sizes, target_size
+        )
         
-        for i, (price, size) in enumerate(orderbook_levels):
-            if size <= 0:
-                continue
-            
-            ticks_from_best = i
-            multiplier = discount_factor ** ticks_from_best
-            
-            qual_levels.append({
-                'price': price,
-                'size': size,
-                'ticks_from_best': ticks_from_best,
-                'multiplier': multiplier
-            })
-            
-            cum_size += size
-            
-            # If we've reached target_size, we're done
-            if cum_size >= target_size:
-                self.logger.debug(
-                    f"Qualifying band complete: {len(qual_levels)} levels, "
-                    f"cumulative size {cum_size} >= target {target_size}"
-                )
-                return qual_levels
+        # If we've reached target_size, we're done
+        if cum_size >= target_size:
+            self.logger.debug(
+                f"Qualifying band complete: {len(prices_out)} levels, "
+                f"cumulative size {cum_size} >= target {target_size}"
+            )
+            return QualifyingBand(prices_out, sizes_out, ticks_out, mults_out)
         
         # If we get here, the book was too thin
         self.logger.debug(
@@ -2889,9 +3635,34 @@ class LIPBot:
         )
         return None
 
+    def build_qualifying_bands_batch(
+        self,
+        orderbook_levels_list: List[List[Tuple[float, int]]],
+        target_sizes: List[int],
+        is_bid_side: bool,
+        discount_factor: float = 0.95
+    ) -> List[Optional[QualifyingBand]]:
+        """
+        Build qualifying bands for many markets in one call.
+
+        Args:
+            orderbook_levels_list: One list of (price, size) levels per market
+            target_sizes: LIP target size per market (parallel to orderbook_levels_list)
+            is_bid_side: True for bids, False for asks
+            discount_factor: The LIP discount factor (e.g., 0.95)
+
+        Returns:
+            List of bands (or None for thin books), parallel to the inputs.
+        """
+        build = self.build_qualifying_band
+        return [
+            build(levels, target_size, is_bid_side, discount_factor)
+            for levels, target_size in zip(orderbook_levels_list, target_sizes)
+        ]
+
     def compute_lip_intensity(
         self,
-        qualifying_band: List[Dict],
+        qualifying_band: QualifyingBand,
         target_size: int
     ) -> float:
         """
@@ -2908,16 +3679,13 @@ class LIPBot:
         if not qualifying_band or target_size <= 0:
             return 0.0
         
-        # Find size at best (ticks_from_best == 0)
-        size_at_best = 0
-        for level in qualifying_band:
-            if level['ticks_from_best'] == 0:
-                size_at_best = level['size']
-                break
+        if not isinstance(qualifying_band, QualifyingBand):
+            qualifying_band = QualifyingBand.from_levels(qualifying_band)
         
-        coverage_top = size_at_best / target_size
-        return coverage_top
+        # Size at best (ticks_from_best == 0) over target
+        return _compute_lip_intensity_kernel(qualifying_band.sizes, qualifying_band.ticks, target_size)
 
+    @_ttl_cache(5.0)
     def compute_time_risk(
         self,
         ticker: str,
@@ -2960,6 +3728,7 @@ class LIPBot:
         
         return time_risk
 
+    @_ttl_cache(30.0)
     def compute_volatility_risk(
         self,
         ticker: str,
@@ -2968,6 +3737,9 @@ class LIPBot:
     ) -> float:
         """
         Compute volatility risk from candlestick data using logit returns.
+        Once seeded (or fed by update_volatility), the per-ticker EWMA state
+        is returned directly instead of refetching the lookback window, as
+        long as it was updated within _vol_stale_after seconds.
         
         Args:
             ticker: Market ticker
@@ -2978,6 +3750,12 @@ class LIPBot:
             Volatility estimate (sigma) in logit space.
             Returns a default value if candlestick data is insufficient.
         """
+        # O(1) path: incremental state maintained by update_volatility
+        state = self._vol_state.get(ticker)
+        if (state is not None and state[2] >= 3 and ewma_alpha == self.vol_ewma_alpha
+                and time.time() - state[3] <= self._vol_stale_after):
+            return state[0]
+        
         try:
             now = int(time.time())
             start_ts = now - (lookback_hours * 3600)
@@ -3027,12 +3805,17 @@ class LIPBot:
             for r in returns[1:]:
                 sigma = ewma_alpha * abs(r) + (1.0 - ewma_alpha) * sigma
             
+            # Seed the incremental state so later mids are folded in without refetching
+            if ewma_alpha == self.vol_ewma_alpha:
+                self._vol_state[ticker] = (sigma, logit_prices[-1], len(logit_prices), time.time())
+            
             return sigma
             
         except Exception as e:
             self.logger.warning(f"Failed to compute volatility risk for {ticker}: {e}")
             return 0.1  # default
 
+    @_ttl_cache(30.0)
     def compute_risk_score(
         self,
         ticker: str,
@@ -3099,7 +3882,7 @@ class LIPBot:
 
     def determine_quote_level(
         self,
-        qualifying_band: List[Dict],
+        qualifying_band: QualifyingBand,
         risk_score: float,
         alpha: float = 1.0,
         inventory: int = 0,
@@ -3123,13 +3906,15 @@ class LIPBot:
             is_bid: True if quoting on bid side, False for ask side
         
         Returns:
-            The selected level dict from qualifying_band, or None if no level is suitable.
+            The selected level dict (price, size, ticks_from_best, multiplier),
+            or None if no level is suitable.
         """
         if not qualifying_band:
             return None
+        if not isinstance(qualifying_band, QualifyingBand):
+            qualifying_band = QualifyingBand.from_levels(qualifying_band)
         
-        # Get risk thresholds from environment
-        medium_risk_threshold = float(os.getenv("LIP_MEDIUM_RISK_THRESHOLD", "1.5"))
+        medium_risk_threshold = self.lip_config.medium_risk_threshold
         
         # Determine base target based on risk bucket
         if risk_score < medium_risk_threshold:
@@ -3150,74 +3935,93 @@ class LIPBot:
             # Short inventory: less aggressive on asks
             target_ticks = int(target_ticks + inventory_factor * 2)
         
-        # Clamp to valid range
-        max_qual_ticks = max(level['ticks_from_best'] for level in qualifying_band)
-        target_ticks = min(target_ticks, max_qual_ticks)
+        # Clamp to valid range (band ticks are ascending)
+        ticks = qualifying_band.ticks
+        target_ticks = min(target_ticks, ticks[-1])
         
-        # Choose the level closest to our target
-        chosen_level = min(
-            qualifying_band, 
-            key=lambda x: abs(x['ticks_from_best'] - target_ticks)
-        )
+        # Choose the level closest to our target; ties go to the level nearer the touch
+        chosen = bisect.bisect_left(ticks, target_ticks)
+        if chosen > 0 and target_ticks - ticks[chosen - 1] <= ticks[chosen] - target_ticks:
+            chosen -= 1
         
-        return chosen_level
+        return qualifying_band.level(chosen)
+
+    def _enqueue_markout_checks(self, ticker: str, side: str, action: str, price: float,
+                                count: int, t_entry: float) -> None:
+        """Schedule the short- and long-horizon markout checks for a fill."""
+        fill = {
+            "ticker": ticker,
+            "side": side,            # 'yes' or 'no'
+            "action": action,        # 'buy' or 'sell'
+            "price": price,          # dollars
+            "count": count,          # number of contracts
+            "t_entry": t_entry,
+        }
+        with self._markout_lock:
+            heap = self._markout_heap
+            for idx, horizon in enumerate((self.mo_short, self.mo_long)):
+                item = (t_entry + horizon, next(self._markout_seq), idx, fill)
+                if len(heap) < _MARKOUT_HEAP_MAX:
+                    heapq.heappush(heap, item)
+                else:
+                    # At capacity: drop whichever check is due soonest (the oldest fill)
+                    heapq.heappushpop(heap, item)
 
     def _drain_markout_checks(self):
         """Run due markout checks enqueued by fills (short + long horizons)."""
         now = time.time()
-        if not self._markout_checks:
+        heap = self._markout_heap
+        if not heap or heap[0][0] > now:
             return
 
-        # process in-place; keep pending checks
-        remaining = []
-        for item in self._markout_checks:
-            tkr = item["ticker"]
-            side = item["side"]        # 'yes'/'no'
-            action = item["action"]    # 'buy'/'sell'
-            px_dollars = float(item["price"])
-            t_check_list = item["t_check"]
-            checked = item["checked"]
-
-            # yes-equivalent mapping to align markout sign
-            act_y, px_y = yes_equiv_from(side, action, px_dollars)
-
-            # evaluate any due checkpoints
-            for idx, t_due in enumerate(t_check_list):
-                if checked[idx] or now < t_due:
-                    continue
+        due = []
+        with self._markout_lock:
+            while heap and heap[0][0] <= now:
+                due.append(heapq.heappop(heap))
 
-                mid_y = self._current_yes_mid(tkr)
-                if mid_y is None:
-                    # if we can't get a mid now, retry later
-                    continue
+        retry = []
+        # One touch fetch per ticker per drain; a missing mid (None) is cached too
+        mids: Dict[str, Optional[float]] = {}
+        for item in due:
+            _, _, idx, fill = item
+            tkr = fill["ticker"]
 
-                # markout: positive if trade would be profitable in YES-terms
-                # buy YES → profit if mid - entry; sell YES → profit if entry - mid
-                sign = +1.0 if act_y == "buy" else -1.0
-                realized = sign * (mid_y - px_y)
+            if tkr in mids:
+                mid_y = mids[tkr]
+            else:
+                mid_y = mids[tkr] = self._current_yes_mid(tkr)
+            if mid_y is None:
+                # if we can't get a mid now, retry later
+                retry.append(item)
+                continue
 
-                # update EMA + bumps
-                self._update_markout_ema(tkr, realized)
+            # yes-equivalent mapping to align markout sign
+            act_y, px_y = yes_equiv_from(fill["side"], fill["action"], float(fill["price"]))
 
-                # metrics (optional)
-                if self.metrics:
-                    self.metrics.log_structured("markout_check", {
-                        "ticker": tkr,
-                        "horizon": "short" if idx == 0 else "long",
-                        "act_y": act_y,
-                        "entry_y": round(px_y, 2),
-                        "mid_y": round(mid_y, 2),
-                        "markout": round(realized, 4),
-                        "ema": round(self._markout_ema.get(tkr, 0.0), 4)
-                    })
+            # markout: positive if trade would be profitable in YES-terms
+            # buy YES → profit if mid - entry; sell YES → profit if entry - mid
+            sign = +1.0 if act_y == "buy" else -1.0
+            realized = sign * (mid_y - px_y)
 
-                checked[idx] = True
+            # update EMA + bumps
+            self._update_markout_ema(tkr, realized)
 
-            # keep the item if there are still pending checkpoints
-            if not all(checked):
-                remaining.append(item)
+            # metrics (optional)
+            if self.metrics:
+                self.metrics.log_structured("markout_check", {
+                    "ticker": tkr,
+                    "horizon": "short" if idx == 0 else "long",
+                    "act_y": act_y,
+                    "entry_y": round(px_y, 2),
+                    "mid_y": round(mid_y, 2),
+                    "markout": round(realized, 4),
+                    "ema": round(self._markout_ema.get(tkr, 0.0), 4)
+                })
 
-        self._markout_checks = remaining
+        if retry:
+            with self._markout_lock:
+                for item in retry:
+                    heapq.heappush(heap, item)
 
     def _run_market_discovery(self):
         """
@@ -3295,17 +4099,81 @@ class LIPBot:
         
         self.logger.info("Market discovery thread stopped")
 
+    def _cancel_all(self, orders: Union[List[Dict], Callable[[], List[Dict]]], on_canceled=None,
+                    context: str = "cancel") -> int:
+        """Cancel orders in one batched call where the API supports it; returns the count canceled.
+
+        orders may be a list or a zero-arg getter (e.g. a get_orders closure). Nothing
+        raises: a failing getter or cancel counts as 0 canceled and is logged under
+        context, so callers can go on to set cooldown/untrack state.
+        on_canceled(order) runs for each order the exchange confirmed canceled. APIs
+        without cancel_orders() get one cancel_order() per order instead.
+        """
+        try:
+            if callable(orders):
+                orders = orders()
+            orders = [o for o in orders or [] if o.get("order_id")]
+        except Exception as e:
+            self.logger.warning(f"{context}: failed to fetch orders to cancel: {e}")
+            return 0
+        if not orders:
+            return 0
+        batch = getattr(self.api, "cancel_orders", None)
+        if batch is not None:
+            try:
+                results = batch([o["order_id"] for o in orders])
+            except Exception as e:
+                self.logger.warning(f"{context}: batch cancel failed: {e}")
+                return 0
+            canceled = [o for o in orders if results.get(str(o["order_id"]))]
+        else:
+            canceled = []
+            for o in orders:
+                try:
+                    if self.api.cancel_order(o["order_id"]) is not False:
+                        canceled.append(o)
+                except Exception as e:
+                    self.logger.warning(f"{context}: failed to cancel order {o['order_id']}: {e}")
+        if len(canceled) < len(orders):
+            self.logger.warning(f"{context}: {len(orders) - len(canceled)} of {len(orders)} cancels failed")
+        if on_canceled is not None:
+            for o in canceled:
+                try:
+                    on_canceled(o)
+                except Exception as e:
+                    self.logger.warning(f"{context}: on_canceled failed for {o['order_id']}: {e}")
+        return len(canceled)
+
     def _process_single_market(self, ticker: str, orders_by_ticker: Dict[str, List[Dict]]) -> None:
         """
         Process order management for a single market.
         This method is designed to be thread-safe and can be called in parallel.
         """
+        # Resting orders for this ticker, fetched at most once until a cancel invalidates them
+        orders_cache: Optional[List[Dict]] = None
+
+        def _orders() -> List[Dict]:
+            nonlocal orders_cache
+            if orders_cache is None:
+                orders_cache = self.api.get_orders(ticker) or []
+            return orders_cache
+
+        def _orders_changed() -> None:
+            nonlocal orders_cache
+            orders_cache = None
+
         try:
+            now = time.time()
             toxic_until = self._toxic_until.get(ticker)
-            if toxic_until and time.time() < toxic_until:
-                self.logger.info(f"{ticker}: in toxicity cooldown until {time.ctime(toxic_until)}, skipping.")
+            if toxic_until and now < toxic_until:
+                self.logger.info("%s: in toxicity cooldown until %s, skipping.", ticker, time.ctime(toxic_until))
                 return {"ticker": ticker, "untrack": False}
 
+            # Toxicity state only changes on the main loop's markout drain, so read it once
+            ema = self._markout_ema.get(ticker, 0.0)
+            edge_bonus = self._edge_bonus.get(ticker, 0.0)
+            width_bonus = self._width_bonus.get(ticker, 0.0)
+
             # Get touch data for the market
             try:
                 touch = self.api.get_touch(ticker)
@@ -3325,16 +4193,16 @@ class LIPBot:
                 if inventory > 0:
                     # Subscribe if we have inventory
                     try:
-                        self.logger.info(f"Adding {ticker} to orderbook tracker")
+                        self.logger.info("Adding %s to orderbook tracker", ticker)
                         self.ws_orderbook_tracker.add_market(ticker)
                     except Exception as e:
-                        self.logger.debug(f"Failed to add {ticker} to orderbook tracker: {e}")
+                        self.logger.debug("Failed to add %s to orderbook tracker: %s", ticker, e)
                 else:
                     # Unsubscribe if inventory is 0
                     try:
                         self.ws_orderbook_tracker.remove_market(ticker)
                     except Exception as e:
-                        self.logger.debug(f"Failed to remove {ticker} from orderbook tracker: {e}")
+                        self.logger.debug("Failed to remove %s from orderbook tracker: %s", ticker, e)
 
             hrs = self._hours_to_expiry(ticker)
             soft = 48
@@ -3346,7 +4214,7 @@ class LIPBot:
                     expiry_mode = "hard"
                 elif hrs <= soft:
                     expiry_mode = "soft"
-            self.logger.debug(f"{ticker}: hours_to_expiry={hrs}, expiry_mode={expiry_mode}")
+            self.logger.debug("%s: hours_to_expiry=%s, expiry_mode=%s", ticker, hrs, expiry_mode)
 
             # Only manage YES side - cancel any NO side orders first
             side = "yes"
@@ -3354,14 +4222,12 @@ class LIPBot:
             
             # Cancel all NO side orders (they're redundant with YES orders)
             no_orders = [o for o in orders_by_ticker.get(ticker, []) if o.get('side') == 'no']
-            for o in no_orders:
-                try:
-                    self.api.cancel_order(o["order_id"])
-                    self.logger.info(f"Canceling redundant NO order for {ticker} (we only manage YES side)")
+            if no_orders:
+                def _no_canceled(o):
+                    self.logger.info("Canceling redundant NO order for %s (we only manage YES side)", ticker)
                     if self.metrics:
                         self.metrics.record_order_canceled(o["order_id"], ticker, "no", 0, o.get('remaining_count', 0))
-                except Exception as e:
-                    self.logger.error(f"Failed to cancel NO order: {e}")
+                self._cancel_all(no_orders, _no_canceled, context=f"{ticker}: NO-side cleanup")
             
             side_touch = touch.get(side)
             if not side_touch:
@@ -3369,14 +4235,12 @@ class LIPBot:
             mkt_bid, mkt_ask = side_touch
             spread = max(0.0, (mkt_ask - mkt_bid))
 
-            now = time.time()
-
             if hrs is not None and hrs <= 1.0 and inventory != 0:
                 # Cross the spread to get out instead of waiting to be lifted
                 cashout_action = "sell" if inventory > 0 else "buy"
                 cashout_price = mkt_bid if inventory > 0 else mkt_ask
                 size = abs(inventory)
-                self.logger.info(f"{ticker}: {hrs:.1f}h to expiry, force-flatten {size} @ {cashout_price:.2f}")
+                self.logger.info("%s: %.1fh to expiry, force-flatten %s @ %.2f", ticker, hrs, size, cashout_price)
                 try:
                     self.api.place_order(ticker, cashout_action, side, cashout_price, size, None)
                 except Exception as e:
@@ -3386,12 +4250,8 @@ class LIPBot:
 
             if self._cooldown_until.get(ticker, 0) > now:
                 # In cooldown: cancel all orders for this ticker and skip
-                try:
-                    for o in self.api.get_orders(ticker) or []:
-                        self.api.cancel_order(o["order_id"])
-                except Exception:
-                    pass
-                self.logger.info(f"{ticker}: in cooldown, skipping quoting")
+                self._cancel_all(_orders, context=f"{ticker}: cooldown")
+                self.logger.info("%s: in cooldown, skipping quoting", ticker)
                 return
                 
             orderbook = {}
@@ -3402,43 +4262,24 @@ class LIPBot:
                 orderbook = {}
             
             if orderbook and self.thin_book(orderbook, min_lvl_size=200, levels=2):
-                self.logger.info(f"{ticker}: thin book detected → shrink size / widen or skip")
+                self.logger.info("%s: thin book detected → shrink size / widen or skip", ticker)
                 return
             
             prev_touch = self._last_touch.get(ticker)
             is_fast = self.fast_move(prev_touch, (mkt_bid, mkt_ask))
             
             target = self._target_sizes.get(ticker, 0)
-            self.logger.info(f"Target size for {ticker}: {target}")
+            self.logger.info("Target size for %s: %s", ticker, target)
             block_bid_for_lip = False
 
-            if target and target > 0:
-                # In your normalization: YES bids = var_true, YES asks = 1 - var_false
-                yes_bids = [(to_tick(p), sz) for (p, sz) in (orderbook.get("var_true") or [])]
-                yes_asks = [(to_tick(1.0 - p), sz) for (p, sz) in (orderbook.get("var_false") or [])]
-
-                best_bid_size = self._best_level_size(yes_bids, bid_side=True)
-                best_ask_size = self._best_level_size(yes_asks, bid_side=False)
-
-                if best_bid_size >= target:
-                    block_bid_for_lip = True
-                    for o in self.api.get_orders(ticker) or []:
-                        if o.get("side") == "yes" and o.get("action") == "buy":
-                            self.api.cancel_order(o["order_id"])
-                    if inventory == 0:
-                        return {"ticker": ticker, "untrack": True}
-                    else:
-                        return {"ticker": ticker, "untrack": False}
+            if self._lip_target_met(ticker, orderbook, target, _orders):
+                return {"ticker": ticker, "untrack": inventory == 0}
 
             if is_fast:
                 # pull quotes and set cooldown
-                try:
-                    for o in self.api.get_orders(ticker) or []:
-                        self.api.cancel_order(o["order_id"])
-                except Exception:
-                    pass
+                self._cancel_all(_orders, context=f"{ticker}: fast move")
                 self._cooldown_until[ticker] = now + self.cooldown_secs
-                self.logger.info(f"{ticker}: fast={is_fast} → cooldown {self.cooldown_secs}s")
+                self.logger.info("%s: fast=%s → cooldown %ss", ticker, is_fast, self.cooldown_secs)
                 # update trackers and skip this cycle
                 self._last_touch[ticker] = (mkt_bid, mkt_ask)
                 return
@@ -3448,7 +4289,7 @@ class LIPBot:
             # Check if market is resolved and cash out if needed
             if self.check_and_cashout_resolved_market(ticker, side, mkt_bid, mkt_ask, inventory):
                 # Market is resolved and we attempted to cash out - skip normal order management
-                self.logger.info(f"Skipping normal order management for resolved market {ticker}")
+                self.logger.info("Skipping normal order management for resolved market %s", ticker)
                 return
             
             # Determine if best touch is ours (exclude our quotes for external-change detection)
@@ -3474,24 +4315,22 @@ class LIPBot:
             ext_ask = None if (our_best_sell is not None and to_tick(mkt_ask) == our_best_sell) else to_tick(mkt_ask)
             key = (ticker, side)
             
-            # Thread-safe access to shared state
-            with self._state_lock:
-                last_ext = self._last_external_touch.get(key)
-                external_changed = (last_ext != (ext_bid, ext_ask))
-                if external_changed:
-                    self._improved_on_touch[key] = False
-                now_ts = time.time()
-                cooldown_ok = (self.improve_cooldown_seconds <= 0) or (now_ts - self._last_improve_ts.get(key, 0.0) >= self.improve_cooldown_seconds)
-                allow_improvement = True
-                if self.improve_once_per_touch:
-                    allow_improvement = (not self._improved_on_touch.get(key, False)) and cooldown_ok
+            # Per-key state: only this task touches `key`, so single-item dict ops suffice
+            last_ext = self._last_external_touch.get(key)
+            external_changed = (last_ext != (ext_bid, ext_ask))
+            if external_changed:
+                self._improved_on_touch[key] = False
+            cooldown_ok = (self.improve_cooldown_seconds <= 0) or (now - self._last_improve_ts.get(key, 0.0) >= self.improve_cooldown_seconds)
+            allow_improvement = True
+            if self.improve_once_per_touch:
+                allow_improvement = (not self._improved_on_touch.get(key, False)) and cooldown_ok
 
             fair = self.compute_fair(orderbook)
             if fair is None:
                 self.logger.warning(f"Failed to compute fair price for {ticker}")
                 # If we have inventory, still try to place sell orders to exit position
                 if inventory > 0:
-                    self.logger.info(f"Attempting to exit {inventory} units of inventory for {ticker} despite no fair price")
+                    self.logger.info("Attempting to exit %s units of inventory for %s despite no fair price", inventory, ticker)
                     # Use market prices as fallback for selling inventory
                     bid, ask = mkt_bid, mkt_ask
                     allow_bid = False  # Don't place new buy orders without fair price
@@ -3500,8 +4339,8 @@ class LIPBot:
                 return
 
             # Apply adaptive bumps based on markout EMA
-            edge_min = 0.01 + float(self._edge_bonus.get(ticker, 0.0) or 0.0)
-            min_width_local = max(self.min_quote_width, float(self._width_bonus.get(ticker, 0.0) or 0.0))
+            edge_min = 0.01 + float(edge_bonus or 0.0)
+            min_width_local = max(self.min_quote_width, float(width_bonus or 0.0))
 
             # Use LIP risk-adjusted quoting if enabled and target exists
             if self.lip_enabled and target and target > 0 and orderbook:
@@ -3518,13 +4357,10 @@ class LIPBot:
 
                     
                     if lip_result['skip_reason']:
-                        self.logger.info(f"{ticker}: LIP skip - {lip_result['skip_reason']}")
+                        self.logger.info("%s: LIP skip - %s", ticker, lip_result['skip_reason'])
                         # Cancel orders and potentially untrack
-                        for o in self.api.get_orders(ticker) or []:
-                            try:
-                                self.api.cancel_order(o["order_id"])
-                            except Exception:
-                                pass
+                        self._cancel_all(_orders, context=f"{ticker}: LIP skip")
+                        _orders_changed()
                         if inventory == 0:
                             return {"ticker": ticker, "untrack": True}
                         else:
@@ -3545,11 +4381,12 @@ class LIPBot:
                                 ask = to_tick(mkt_ask - 0.01)
                         
                         # Log LIP metrics
-                        self.logger.info(
-                            f"{ticker}: LIP quotes - bid ${bid:.2f}, ask ${ask:.2f}, "
-                            f"risk_score={lip_result['risk_score']:.2f}, "
-                            f"intensity_bid={lip_result['lip_intensity_bid']:.2f}"
-                        )
+                        if self.logger.isEnabledFor(logging.INFO):
+                            self.logger.info(
+                                f"{ticker}: LIP quotes - bid ${bid:.2f}, ask ${ask:.2f}, "
+                                f"risk_score={lip_result['risk_score']:.2f}, "
+                                f"intensity_bid={lip_result['lip_intensity_bid']:.2f}"
+                            )
                         
                         # LIP already determined optimal prices, use edge check
                         allow_bid = (fair - bid) >= edge_min and lip_result['bid_price'] is not None
@@ -3581,12 +4418,8 @@ class LIPBot:
 
             if expiry_mode == "hard" and inventory == 0:
                 # fully flat near expiry: no reason to be in this name
-                try:
-                    for o in self.api.get_orders(ticker) or []:
-                        self.api.cancel_order(o["order_id"])
-                except Exception:
-                    pass
-                self.logger.info(f"{ticker}: hard-expiry window & flat → untracking.")
+                self._cancel_all(_orders, context=f"{ticker}: hard expiry")
+                self.logger.info("%s: hard-expiry window & flat → untracking.", ticker)
                 return {"ticker": ticker, "untrack": True}
 
 
@@ -3596,16 +4429,11 @@ class LIPBot:
             # If target met on ask and we're flat, don't place asks (no scoring benefit).
             # If we have inventory, keep allow_ask True so we can exit risk.
             if inventory == 0 and (not allow_bid) and (not allow_ask):
-                try:
-                    for o in self.api.get_orders(ticker) or []:
-                        self.api.cancel_order(o["order_id"])
-                        if self.metrics:
-                            self.metrics.record_order_canceled(
-                                o["order_id"], ticker, o.get('side', 'yes'), 0, o.get('remaining_count', 0)
-                            )
-                except Exception as e:
-                    self.logger.warning(f"{ticker}: cancel-before-untrack failed: {e}")
-                self.logger.info(f"{ticker}: LIP target met, flat; untracking market.")
+                record = (lambda o: self.metrics.record_order_canceled(
+                    o["order_id"], ticker, o.get('side', 'yes'), 0, o.get('remaining_count', 0)
+                )) if self.metrics else None
+                self._cancel_all(_orders, record, context=f"{ticker}: cancel-before-untrack")
+                self.logger.info("%s: LIP target met, flat; untracking market.", ticker)
                 return {"ticker": ticker, "untrack": True}
 
 
@@ -3613,21 +4441,20 @@ class LIPBot:
             if self.metrics:
                 self.metrics.log_structured("toxicity_state", {
                     "ticker": ticker,
-                    "ema": round(self._markout_ema.get(ticker, 0.0), 4),
-                    "edge_bonus": round(self._edge_bonus.get(ticker, 0.0), 4),
-                    "width_bonus": round(self._width_bonus.get(ticker, 0.0), 4)
+                    "ema": round(ema, 4),
+                    "edge_bonus": round(edge_bonus, 4),
+                    "width_bonus": round(width_bonus, 4)
                 })
 
             self.manage_orders(bid, ask, spread, ticker, inventory, side, allow_bid=allow_bid, allow_ask=allow_ask)
+            _orders_changed()
             
-            # Update gating state (thread-safe)
-            with self._state_lock:
-                self._last_external_touch[key] = (ext_bid, ext_ask)
-                if allow_improvement and inventory == 0 and spread >= 0.02:
-                    self._improved_on_touch[key] = True
-                    self._last_improve_ts[key] = now_ts
+            # Update gating state
+            self._last_external_touch[key] = (ext_bid, ext_ask)
+            if allow_improvement and inventory == 0 and spread >= 0.02:
+                self._improved_on_touch[key] = True
+                self._last_improve_ts[key] = now
             
-            ema = self._markout_ema.get(ticker, 0.0)
             very_bad = self.mo_bad_threshold * 5.0
 
             if ema <= very_bad:
@@ -3635,14 +4462,10 @@ class LIPBot:
                     f"{ticker}: markout EMA {ema:.4f} extremely bad ≤ {very_bad:.4f} → toxicity cooldown"
                 )
                 # cancel orders
-                try:
-                    for o in self.api.get_orders(ticker) or []:
-                        self.api.cancel_order(o["order_id"])
-                except Exception as e:
-                    self.logger.warning(f"{ticker}: failed to cancel orders on toxicity stop: {e}")
+                self._cancel_all(_orders, context=f"{ticker}: toxicity stop")
 
                 # set cooldown
-                self._toxic_until[ticker] = time.time() + self.toxicity_cooldown_secs
+                self._toxic_until[ticker] = now + self.toxicity_cooldown_secs
                 return {"ticker": ticker, "untrack": True}
 
             
@@ -3651,6 +4474,27 @@ class LIPBot:
         except Exception as e:
             self.logger.error(f"Error processing market {ticker}: {e}")
             self.logger.error(f"Traceback: {traceback.format_exc()}")
+    def _lip_target_met(self, ticker: str, orderbook: Dict, target, get_orders: Callable[[], List[Dict]]) -> bool:
+        """
+        True when the YES best bid already queues >= target contracts, i.e. the LIP
+        target is met at best without us. Our resting YES bids are canceled in that case;
+        get_orders is only called when there is something to cancel.
+        """
+        if not target or target <= 0:
+            return False
+        # In your normalization: YES bids = var_true, YES asks = 1 - var_false
+        # Only the bid side gates LIP blocking, so the ask side isn't built here
+        yes_bids = [(to_tick(p), sz) for (p, sz) in (orderbook.get("var_true") or [])]
+        best_bid_size = self._best_level_size(yes_bids, bid_side=True)
+        if best_bid_size < target:
+            return False
+        self.logger.info("Best bid size %s >= target %s for %s", best_bid_size, target, ticker)
+        self._cancel_all(
+            lambda: [o for o in get_orders() if o.get("side") == "yes" and o.get("action") == "buy"],
+            context=f"{ticker}: LIP target met",
+        )
+        return True
+
     def _best_level_size(self, levels: List[Tuple[float, int]], bid_side: bool) -> int:
         """
         levels: [(price, count), ...]
@@ -3660,12 +4504,36 @@ class LIPBot:
         if not levels:
             return 0
         try:
-            best_px = max(p for p, c in levels) if bid_side else min(p for p, c in levels)
-            return sum(int(c) for p, c in levels if p == best_px)
+            # One pass: reset the running total whenever a strictly better price shows up
+            best_px, total = None, 0
+            for p, c in levels:
+                if best_px is None or (p > best_px if bid_side else p < best_px):
+                    best_px, total = p, int(c)
+                elif p == best_px:
+                    total += int(c)
+            return total
         except Exception:
             return 0
 
+    def _get_market_pool(self) -> ThreadPoolExecutor:
+        if self._market_pool is None:
+            self._market_pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="mm")
+        return self._market_pool
+
+    def _shutdown_market_pool(self) -> None:
+        if self._market_pool is not None:
+            # Drop queued market tasks; the ones already running finish first
+            self._market_pool.shutdown(wait=True, cancel_futures=True)
+            self._market_pool = None
+
     def run(self, dt: float):
+        # The market pool must not outlive the loop, including on KeyboardInterrupt/errors
+        try:
+            self._run(dt)
+        finally:
+            self._shutdown_market_pool()
+
+    def _run(self, dt: float):
         start_time = time.time()
         print(f"Starting LIPBot")
         if self.metrics is None:
@@ -3786,24 +4654,23 @@ class LIPBot:
                 tickers_to_process = list(tracked_markets.keys())
                 
                 if tickers_to_process:
-                    # Use ThreadPoolExecutor to process markets in parallel
-                    with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                        # Submit all market processing tasks
-                        futures = {
-                            executor.submit(self._process_single_market, ticker, orders_by_ticker): ticker
-                            for ticker in tickers_to_process
-                        }
-                        
-                        # Wait for all tasks to complete
-                        for future in as_completed(futures):
-                            ticker = futures[future]
-                            try:
-                                status = future.result()
-                                if isinstance(status, dict) and status.get("untrack"):
-                                    tracked_markets.pop(ticker, None)
-                                    self.logger.info(f"Stopped tracking {ticker} (LIP-gated and flat).")
-                            except Exception as e:
-                                self.logger.error(f"Error in parallel processing for {ticker}: {e}")
+                    # Process markets in parallel on the bot's long-lived pool
+                    executor = self._get_market_pool()
+                    futures = {
+                        executor.submit(self._process_single_market, ticker, orders_by_ticker): ticker
+                        for ticker in tickers_to_process
+                    }
+
+                    # Wait for all tasks to complete
+                    for future in as_completed(futures):
+                        ticker = futures[future]
+                        try:
+                            status = future.result()
+                            if isinstance(status, dict) and status.get("untrack"):
+                                tracked_markets.pop(ticker, None)
+                                self.logger.info(f"Stopped tracking {ticker} (LIP-gated and flat).")
+                        except Exception as e:
+                            self.logger.error(f"Error in parallel processing for {ticker}: {e}")
 
                     
                     self.logger.info(f"Processed {len(tickers_to_process)} markets in parallel with {self.max_workers} workers")
@@ -3882,22 +4749,9 @@ class LIPBot:
                         self.logger.info(f"Target size for {tkr}: {target}")
                         block_bid_for_lip = False
 
-                        if target and target > 0:
-                            # In your normalization: YES bids = var_true, YES asks = 1 - var_false
-                            yes_bids = [(to_tick(p), sz) for (p, sz) in (orderbook.get("var_true") or [])]
-                            yes_asks = [(to_tick(1.0 - p), sz) for (p, sz) in (orderbook.get("var_false") or [])]
-
-                            best_bid_size = self._best_level_size(yes_bids, bid_side=True)
-                            best_ask_size = self._best_level_size(yes_asks, bid_side=False)
-
-                            if best_bid_size >= target:
-                                self.logger.info(f"Best bid size {best_bid_size} >= target {target} for {tkr}")
-                                block_bid_for_lip = True
-                                for o in self.api.get_orders(tkr) or []:
-                                    if o.get("side") == "yes" and o.get("action") == "buy":
-                                        self.api.cancel_order(o["order_id"])
-                                self.logger.info(f"[DISCOVERY] Skipping {tkr}: LIP target met at best")
-                                continue 
+                        if self._lip_target_met(tkr, orderbook, target, lambda: self.api.get_orders(tkr) or []):
+                            self.logger.info(f"[DISCOVERY] Skipping {tkr}: LIP target met at best")
+                            continue
 
                         #todo change to bias towards markets ending later
                         fair = self.compute_fair(orderbook)
@@ -4289,9 +5143,9 @@ class LIPBot:
         )
         result['risk_score'] = risk_score
         
-        # Get tunable risk thresholds from environment
-        medium_risk_threshold = float(os.getenv("LIP_MEDIUM_RISK_THRESHOLD", "1.5"))
-        high_risk_threshold = float(os.getenv("LIP_HIGH_RISK_THRESHOLD", "2.5"))
+        # Tunable risk thresholds
+        medium_risk_threshold = self.lip_config.medium_risk_threshold
+        high_risk_threshold = self.lip_config.high_risk_threshold
         
         # Categorize risk and log
         if risk_score < medium_risk_threshold:
@@ -4318,32 +5172,31 @@ class LIPBot:
         tick_size = 0.01
         max_levels = 10  # Generate up to 10 levels away from BBO
         
-        bid_levels = []
+        mult_table = self._mult_table(discount_factor)
+        
+        bid_prices, bid_ticks = [], []
         # For bids: ticks_from_best=0 is join (BBO), 1+ is passive (BBO-1¢, BBO-2¢, ...)
         for ticks in range(0, max_levels):
             price = to_tick(bbo_bid - ticks * tick_size)
             if 0.01 <= price <= 0.99:  # Must be valid price
-                bid_levels.append({
-                    'price': price,
-                    'size': target_size,  # Default to target size
-                    'ticks_from_best': ticks,
-                    'multiplier': discount_factor ** ticks
-                })
+                bid_prices.append(price)
+                bid_ticks.append(ticks)
         
-        ask_levels = []
+        ask_prices, ask_ticks = [], []
         # For asks: ticks_from_best=0 is join (BBO), 1+ is passive (BBO+1¢, BBO+2¢, ...)
         for ticks in range(0, max_levels):
             price = to_tick(bbo_ask + ticks * tick_size)
             if 0.01 <= price <= 0.99:  # Must be valid price
-                ask_levels.append({
-                    'price': price,
-                    'size': target_size,  # Default to target size
-                    'ticks_from_best': ticks,
-                    'multiplier': discount_factor ** ticks
-                })
+                ask_prices.append(price)
+                ask_ticks.append(ticks)
         
-        bid_band = bid_levels if bid_levels else None
-        ask_band = ask_levels if ask_levels else None
+        # Each level defaults to target size
+        bid_band = QualifyingBand(
+            bid_prices, [target_size] * len(bid_ticks), bid_ticks, [mult_table[t] for t in bid_ticks]
+        ) if bid_ticks else None
+        ask_band = QualifyingBand(
+            ask_prices, [target_size] * len(ask_ticks), ask_ticks, [mult_table[t] for t in ask_ticks]
+        ) if ask_ticks else None
         
         # Compute LIP intensity for each side
         if bid_band:
@@ -4432,9 +5285,9 @@ class LIPBot:
         base_size = int(self.max_position * 0.2 * inv_factor * spread_factor * time_factor)
 
         balance_cap = self.max_affordable_size(side, action, price,
-                                           balance_reserve_frac=float(os.getenv("LIP_RESERVE_FRAC", "0.9")),
-                                           per_market_budget_frac=float(os.getenv("LIP_MARKET_FRAC", "0.25")),
-                                           fee_per_contract=float(os.getenv("LIP_FEE_PER_CONTRACT", "0.00")))
+                                           balance_reserve_frac=self.lip_config.reserve_frac,
+                                           per_market_budget_frac=self.lip_config.market_frac,
+                                           fee_per_contract=self.lip_config.fee_per_contract)
 
         desired = min(remaining_capacity, balance_cap, max(min_order_size, base_size))
         return desired
@@ -4514,8 +5367,9 @@ class LIPBot:
         return (abs(nb - pb) > 0.01) or (abs(na - pa) > 0.01)
     
     def thin_book(self, orderbook: Dict, min_lvl_size=200, levels=2) -> bool:
-        yt = sorted(orderbook.get("var_true", []))  # asks low→high
-        nf = sorted(orderbook.get("var_false", []), reverse=True)  # bids high→low
+        # Only the top `levels` matter: partial selection instead of sorting the whole side
+        yt = heapq.nsmallest(levels, orderbook.get("var_true", []))  # asks low→high
+        nf = heapq.nlargest(levels, orderbook.get("var_false", []))  # bids high→low
         def has_depth(side):
             return sum(sz for _,sz in side[:levels]) >= min_lvl_size
         return (not has_depth(yt)) or (not has_depth(nf))
@@ -4618,6 +5472,9 @@ class LIPBot:
         Reactively adjusts sell orders when inventory > 0.
         """
         try:
+            # Every mid-price tick feeds the incremental volatility estimate
+            self.update_volatility(ticker, (best_bid + best_ask) / 2.0)
+            
             # Only process if we have inventory
             inventory = self.api.get_position(ticker)
             if inventory <= 0:
@@ -9,7 +9,7 @@ import pytest
 # Ensure project root is on path so 'mm' can be imported when running in sandboxes/CI
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from mm import LIPBot, MetricsTracker
+from mm import KalshiTradingAPI, LIPBot, MetricsTracker
 
 
 class FakeAPI:
@@ -72,6 +72,10 @@ def test_logger(tmp_path):
 def bot_factory(test_logger):
     def _make_bot(balance: float = 100.0, max_position: int = 100, orders=None):
         api = FakeAPI(balance=balance, orders=orders)
+        # Ensure env does not interfere in deterministic tests (read once by LIPConfig.from_env)
+        os.environ.setdefault("LIP_RESERVE_FRAC", "0.15")
+        os.environ.setdefault("LIP_MARKET_FRAC", "0.25")
+        os.environ.setdefault("LIP_FEE_PER_CONTRACT", "0.00")
         bot = LIPBot(
             logger=test_logger,
             api=api,
@@ -82,11 +86,26 @@ def bot_factory(test_logger):
         )
         # Attach metrics so tests can introspect actions
         bot.metrics = MetricsTracker(strategy_name="TEST", market_ticker=None)
-        # Ensure env does not interfere in deterministic tests
-        os.environ.setdefault("LIP_RESERVE_FRAC", "0.15")
-        os.environ.setdefault("LIP_MARKET_FRAC", "0.25")
-        os.environ.setdefault("LIP_FEE_PER_CONTRACT", "0.00")
         return bot, api
     return _make_bot
 
 
+@pytest.fixture
+def api_factory(test_logger, monkeypatch):
+    # Real KalshiTradingAPI state without logging in; tests stub the network methods they use
+    monkeypatch.setattr(KalshiTradingAPI, "login", lambda self: None)
+    made = []
+
+    def _make_api(**attrs):
+        api = KalshiTradingAPI(email=None, password=None, base_url="", logger=test_logger)
+        api.client = None
+        for name, value in attrs.items():
+            setattr(api, name, value)
+        made.append(api)
+        return api
+
+    yield _make_api
+    for api in made:
+        if api._rest_pool is not None:
+            api._rest_pool.shutdown(wait=False)
+        api._http.close()
@@ -0,0 +1,115 @@
+import math
+import time
+
+from mm import LIPBot, OrderbookLevels
+
+
+def test_build_qualifying_band_skips_empty_levels_and_stops_at_target(bot_factory):
+    bot, _ = bot_factory()
+    levels = [(0.45, 100), (0.44, 0), (0.43, 200), (0.42, 500)]
+    band = bot.build_qualifying_band(levels, target_size=250, is_bid_side=True, discount_factor=0.9)
+    assert [lvl['price'] for lvl in band] == [0.45, 0.43]
+    assert [lvl['ticks_from_best'] for lvl in band] == [0, 2]
+    assert abs(band[1]['multiplier'] - 0.81) < 1e-12
+    assert bot.compute_lip_intensity(band, 250) == 100 / 250
+
+
+def test_build_qualifying_band_thin_book_returns_none(bot_factory):
+    bot, _ = bot_factory()
+    assert bot.build_qualifying_band([(0.45, 10)], target_size=250, is_bid_side=True) is None
+
+
+def test_risk_score_is_cached_until_invalidated(bot_factory):
+    bot, api = bot_factory()
+    calls = []
+
+    def get_candlesticks(**kwargs):
+        calls.append(kwargs)
+        return []
+
+    api.get_candlesticks = get_candlesticks
+    first = bot.compute_risk_score("MKT")
+    assert bot.compute_risk_score("MKT") == first
+    assert len(calls) == 1
+
+    bot.invalidate_risk_cache("MKT")
+    bot.compute_risk_score("MKT")
+    assert len(calls) == 2
+
+
+def test_determine_quote_level_picks_closest_tick(bot_factory):
+    bot, _ = bot_factory(max_position=100)
+    band = bot.build_qualifying_band(
+        [(0.45, 10), (0.44, 0), (0.43, 10), (0.42, 500)], target_size=100, is_bid_side=True
+    )
+    # Low risk joins the touch
+    assert bot.determine_quote_level(band, risk_score=0.5)['ticks_from_best'] == 0
+    # Medium risk wants 1 tick back; ticks 0 and 2 are equidistant, prefer the touch
+    assert bot.determine_quote_level(band, risk_score=2.0)['ticks_from_best'] == 0
+    # Long inventory pushes bids further back
+    level = bot.determine_quote_level(band, risk_score=2.0, inventory=100, max_position=100, is_bid=True)
+    assert level['ticks_from_best'] == 3
+    assert level['price'] == 0.42
+
+
+def test_update_volatility_matches_batch_ewma(bot_factory):
+    bot, _ = bot_factory()
+    prices = [0.40, 0.45, 0.42, 0.50]
+    t0 = time.time() - 60.0 * len(prices)
+    for i, p in enumerate(prices):
+        bot.update_volatility("MKT", p, now=t0 + 60.0 * i)
+    logits = [math.log(p / (1 - p)) for p in prices]
+    returns = [abs(b - a) for a, b in zip(logits, logits[1:])]
+    expected = returns[0]
+    for r in returns[1:]:
+        expected = 0.3 * r + 0.7 * expected
+    assert abs(bot.compute_volatility_risk("MKT") - expected) < 1e-12
+
+
+def test_volatility_state_goes_stale_and_reseeds_from_candles(bot_factory):
+    bot, api = bot_factory()
+    calls = []
+    api.get_candlesticks = lambda **kw: calls.append(kw) or [{"price": p} for p in (0.40, 0.50, 0.40)]
+    t0 = time.time() - 3600
+    for i, p in enumerate([0.40, 0.45, 0.42, 0.50]):
+        bot.update_volatility("MKT", p, now=t0 + 60.0 * i)
+
+    # No mids for almost an hour: the frozen value is not served
+    bot.compute_volatility_risk("MKT")
+    assert len(calls) == 1
+    # The candle seed is fresh, so the next call is O(1)
+    bot.compute_volatility_risk("MKT")
+    assert len(calls) == 1
+
+    # A mid arriving after a long gap restarts the state instead of folding in one jump
+    seeded = bot._vol_state["MKT"]
+    bot.update_volatility("MKT", 0.90, now=seeded[3] + 3600)
+    assert bot._vol_state["MKT"][2] == 1
+
+
+def test_build_qualifying_band_accepts_columnar_levels(bot_factory):
+    bot, _ = bot_factory()
+    pairs = [(0.45, 100), (0.44, 0), (0.43, 200)]
+    columnar = OrderbookLevels.from_pairs(pairs)
+    assert list(columnar) == pairs
+    band = bot.build_qualifying_band(columnar, target_size=250, is_bid_side=True)
+    assert list(band) == list(bot.build_qualifying_band(pairs, target_size=250, is_bid_side=True))
+
+
+def test_markout_checks_pop_in_due_order(bot_factory, monkeypatch):
+    bot, _ = bot_factory()
+    mids = {"A": 0.52, "B": None}
+    monkeypatch.setattr(bot, "_current_yes_mid", lambda t: mids[t])
+    realized = []
+    monkeypatch.setattr(bot, "_update_markout_ema", lambda t, m: realized.append((t, round(m, 4))))
+
+    t0 = time.time() - bot.mo_short - 1
+    bot._enqueue_markout_checks("A", "yes", "buy", 0.50, 1, t0)
+    bot._enqueue_markout_checks("B", "yes", "buy", 0.50, 1, t0)
+    bot._drain_markout_checks()
+
+    # Only A's short horizon was due and priced; B is retried, long horizons stay queued
+    assert realized == [("A", 0.02)]
+    assert sorted((item[3]["ticker"], item[2]) for item in bot._markout_heap) == [
+        ("A", 1), ("B", 0), ("B", 1)
+    ]
@@ -80,3 +80,18 @@ def test_manage_orders_allows_exit_when_inventory_and_lip_target_met(bot_factory
     assert sell_orders[0]['quantity'] == inventory, "Sell order quantity should match inventory"
 
 
+
+
+def test_cancel_all_treats_fetch_and_cancel_failures_as_zero(bot_factory):
+    bot, api = bot_factory()
+
+    def boom(*args):
+        raise RuntimeError("exchange down")
+
+    assert bot._cancel_all(boom) == 0
+
+    api.cancel_order = boom
+    canceled = []
+    orders = [{"order_id": "o1"}, {"order_id": "o2"}]
+    assert bot._cancel_all(lambda: orders, canceled.append) == 0
+    assert canceled == []
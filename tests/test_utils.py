@@ -1,4 +1,9 @@
-from mm import to_tick, to_cents
+import json
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from mm import MetricsTracker, _JsonlStream, _normalize_order, _normalize_orderbook_side, to_cents, to_tick
 
 
 def test_to_tick_rounds_and_clamps():
@@ -15,3 +20,193 @@ def test_to_cents_uses_to_tick():
     assert to_cents(0.0001) == 1
 
 
+
+
+def test_to_tick_half_up_survives_float_drift():
+    # Values whose binary representation sits just below the half cent
+    assert to_tick(0.245) == 0.25
+    assert to_tick(1.0 - 0.55) == 0.45
+    assert to_cents(0.575) == 58
+    assert to_tick(0.57) == 0.57
+
+
+def test_jsonl_streams_share_sink_and_flush(tmp_path):
+    a = _JsonlStream("a", str(tmp_path / "a.jsonl"))
+    b = _JsonlStream("b", str(tmp_path / "b.jsonl"))
+    for i in range(2500):
+        (a if i % 2 else b).put(json.dumps({"i": i}).encode())
+    a.flush()
+    read = lambda name: [json.loads(l)["i"] for l in (tmp_path / name).read_text().splitlines()]
+    assert read("a.jsonl") == list(range(1, 2500, 2))
+    assert read("b.jsonl") == list(range(0, 2500, 2))
+
+
+def test_summarize_reads_running_aggregates(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    m = MetricsTracker(strategy_name="SUMMARY")
+    for kind in ["place_order", "place_order", "cancel_order", "keep_order", "skip_place"]:
+        m.record_action(kind, {})
+    m.record_latency("quote_update_ABC", 0.010)
+    m.record_latency("quote_update_ABC", 0.020)
+    m.record_latency("other", 1.0)
+    m.record_pnl_snapshot("ABC", 1.5, 0.25, 0, 0.0)
+    m.record_pnl_snapshot("ABC", 2.0, -0.5, 0, 0.0)
+
+    s = m.summarize()
+    assert (s["orders_placed"], s["orders_canceled"], s["orders_kept"], s["orders_skipped"]) == (2, 1, 1, 1)
+    assert s["avg_quote_latency_ms"] == 15.0
+    assert s["total_realized_pnl"] == 3.5
+    assert s["latest_unrealized_pnl"] == -0.5
+
+
+def test_summarize_counts_loops_past_snapshot_cap(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    m = MetricsTracker(strategy_name="LOOPS")
+    n = m.loop_snapshots.maxlen + 5
+    for i in range(n):
+        m.record_loop(float(i), 0.5, 0, 0.5, 0.49, 0.51, 1, 1)
+    assert len(m.loop_snapshots) == m.loop_snapshots.maxlen
+    assert m.summarize()["num_iterations"] == n
+
+
+def test_log_structured_skips_unchanged_snapshots(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    m = MetricsTracker(strategy_name="DEDUP")
+    for _ in range(3):
+        m.record_pnl_snapshot("ABC", 1.0, 0.5, 2, 1.0)
+    m.record_pnl_snapshot("ABC", 1.0, 0.75, 2, 1.0)
+    m.record_pnl_snapshot("XYZ", 1.0, 0.5, 2, 1.0)
+    m.record_fill("o1", "ABC", "yes", "buy", 0.5, 1)
+    m.record_fill("o1", "ABC", "yes", "buy", 0.5, 1)
+    m._json_writer.flush()
+
+    events = [json.loads(l)["event_type"] for l in (tmp_path / m.json_log_file).read_text().splitlines()]
+    assert events == ["pnl_snapshot"] * 3 + ["fill"] * 2
+    assert len(m.pnl_snapshots) == 5
+
+
+def test_log_structured_dedup_compares_values_not_hashes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    m = MetricsTracker(strategy_name="COLLIDE")
+    assert hash((1.0, -1)) == hash((1.0, -2))  # CPython: hash(-1) == hash(-2)
+    m.record_pnl_snapshot("ABC", 1.0, 0.5, -1, 1.0)
+    m.record_pnl_snapshot("ABC", 1.0, 0.5, -2, 1.0)
+    m.record_quote_latency("ABC", 100.0, 100.010)
+    m.record_quote_latency("ABC", 200.0, 200.010)
+    m._json_writer.flush()
+
+    events = [json.loads(l)["event_type"] for l in (tmp_path / m.json_log_file).read_text().splitlines()]
+    assert events.count("pnl_snapshot") == 2
+    assert events.count("quote_latency") == 2
+
+
+def test_positions_snapshot_serves_tickers_until_invalidated(api_factory):
+    api = api_factory(_positions_ttl=60.0)
+    calls = []
+    api._fetch_all_positions = lambda: calls.append(1) or {"A": 3, "B": -2}
+
+    assert (api.get_position("A"), api.get_position("B"), api.get_position("C")) == (3, -2, 0)
+    assert len(calls) == 1
+    api.invalidate_positions()
+    api.get_position("A")
+    assert len(calls) == 2
+
+
+def test_positions_snapshot_not_cached_when_invalidated_mid_fetch(api_factory):
+    api = api_factory(_positions_ttl=60.0)
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        if len(calls) == 1:
+            api.invalidate_positions()  # a fill lands while the first fetch is in flight
+        return {"A": len(calls)}
+
+    api._fetch_all_positions = fetch
+    assert api.get_position("A") == 1
+    assert api.get_position("A") == 2
+    assert api.get_position("A") == 2 and len(calls) == 2
+
+
+def test_fetch_all_positions_follows_cursor(api_factory):
+    pages = {
+        None: {"market_positions": [{"ticker": "A", "position": 1}], "cursor": "c1"},
+        "c1": {"market_positions": [{"ticker": "B", "position": -4}], "cursor": ""},
+    }
+    seen = []
+
+    def signed_get(path, params=None):
+        seen.append(dict(params))
+        return SimpleNamespace(content=json.dumps(pages[params.get("cursor")]).encode())
+
+    api = api_factory(_signed_get=signed_get)
+    assert api._fetch_all_positions() == {"A": 1, "B": -4}
+    assert [p.get("cursor") for p in seen] == [None, "c1"] and seen[0]["limit"] == 1000
+
+
+def test_orderbook_side_skips_malformed_levels():
+    assert _normalize_orderbook_side([[45, 3], ["44", "2"], [None, 1], ["x", 1]]) == [(0.45, 3), (0.44, 2)]
+    assert _normalize_orderbook_side(
+        [{"price": 0.45, "count": 2.0}, {"price": 55, "count": None}, {"price": "bad", "count": 1}]
+    ) == [(0.45, 2)]
+
+
+def test_normalize_order_fills_defaults_and_converts_cents():
+    o = _normalize_order({"order_id": "x", "yes_price": 45, "count": "10", "remaining_count": 4}, "T-1")
+    assert (o["ticker"], o["yes_price"], o["no_price"]) == ("T-1", 0.45, None)
+    assert (o["count"], o["initial_count"], o["fill_count"], o["maker_fees"]) == (10, 10, 6, 0)
+
+
+def test_valid_markets_price_from_books_in_hand(api_factory):
+    iso = lambda ts: datetime.fromtimestamp(ts, timezone.utc).isoformat().replace("+00:00", "Z")
+    now = time.time()
+    api = api_factory(_rest_fanout_workers=8)
+    dates = {"start_date": iso(now - 86400), "end_date": iso(now + 30 * 86400)}
+    api.get_liq_markets = lambda: [
+        {"market_ticker": "A", "target_size": 300, **dates},
+        {"market_ticker": "B", "target_size": 300, **dates},
+        {"market_ticker": "D", "target_size": 300, **dates},
+        {"market_ticker": "E", "target_size": 300, "yes_bid": 95, "yes_ask": 97, **dates},
+        {"market_ticker": "C", "target_size": 300, "start_date": dates["start_date"], "end_date": iso(now + 3600)},
+    ]
+    books = {
+        "A": {"var_true": [(0.40, 100)], "var_false": [(0.55, 50)]},
+        "B": {"var_true": [(0.40, 10)], "var_false": []},
+        "D": {"var_true": [(0.95, 10)], "var_false": [(0.03, 10)]},
+    }
+    fetched = []
+    api.get_orderbook = lambda t: fetched.append(t) or books[t]
+    priced = []
+    api.get_price = lambda t: priced.append(t) or {"yes": 0.5, "no": 0.5}
+
+    entries = api.get_valid_markets()
+    api._rest_pool.shutdown()
+    assert priced == [] and sorted(fetched) == ["A", "B", "D"]
+    assert sorted(e["side"] for e in entries) == ["no", "yes"]
+    assert {e["ticker"] for e in entries} == {"A"}
+
+
+def test_cancel_orders_batches_and_maps_per_order_errors(api_factory):
+    calls = []
+
+    def batch_cancel_orders(order_ids):
+        calls.append(list(order_ids))
+        return SimpleNamespace(responses=[SimpleNamespace(order_id="b", error="not_found")])
+
+    api = api_factory(_batch_cancel_max=2, client=SimpleNamespace(batch_cancel_orders=batch_cancel_orders))
+
+    assert api.cancel_orders(["a", "b", "c", "a"]) == {"a": True, "b": False, "c": True}
+    assert calls == [["a", "b"], ["c"]]
+
+
+def test_drain_markout_checks_fetches_touch_once_per_ticker(bot_factory):
+    bot, api = bot_factory()
+    bot.metrics = None
+    calls = []
+    api.get_touch = lambda t: calls.append(t) or {"yes": (0.40, 0.42)}
+    past = time.time() - 3600
+    bot._enqueue_markout_checks("A", "yes", "buy", 0.40, 1, past)
+    bot._enqueue_markout_checks("A", "yes", "buy", 0.41, 1, past)
+
+    bot._drain_markout_checks()
+    assert calls == ["A"] and bot._markout_heap == []